@@ -0,0 +1,205 @@
+"""
+Đo thời gian và bộ nhớ đỉnh của từng thao tác trên dữ liệu giả lập (xem generate_data.py)
+Các thao tác, chạy lần lượt như khi dùng ứng dụng:
+    load_file -> validate -> clean_data -> save_file -> populate_tree -> aggregate:<biểu đồ>
+Mỗi bộ dữ liệu được chạy hai lượt: lượt đo thời gian (không bật tracemalloc vì làm chậm),
+rồi lượt đo bộ nhớ đỉnh với tracemalloc (bộ nhớ cấp phát thêm trong lúc chạy thao tác).
+Kết quả được ghi ra benchmarks/results/<thời điểm>_<commit>.json để so sánh giữa các commit
+(xem compare_results.py).
+
+Cách dùng:
+    python benchmarks/bench_ops.py                           # 1k, 10k, 100k dòng, CSV
+    python benchmarks/bench_ops.py --sizes 1M,10M --formats csv
+    python benchmarks/bench_ops.py --sizes 10k --formats csv,xlsx --repeat 3
+
+populate_tree cần màn hình: không có DISPLAY thì thử chạy Xvfb, không có Xvfb thì bỏ qua thao tác này.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+import generate_data
+from display import VirtualDisplay
+
+ROOT = generate_data.ROOT
+sys.path.insert(0, ROOT)
+
+from src.data_handler import DataHandler  # noqa: E402
+from src.aggregates import COMPUTE_FUNCTIONS  # noqa: E402
+
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+DEFAULT_SIZES = "1k,10k,100k"
+
+
+class Recorder:
+    """Chạy từng thao tác, ghi thời gian (hoặc bộ nhớ đỉnh khi trace_memory=True)"""
+
+    def __init__(self, trace_memory):
+        self.trace_memory = trace_memory
+        self.values = {}
+
+    def run(self, op, func):
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            result = func()
+            self.values[op] = tracemalloc.get_traced_memory()[1] - before
+        else:
+            start = time.perf_counter()
+            result = func()
+            self.values[op] = time.perf_counter() - start
+        return result
+
+
+def populate_tree(df):
+    """Đổ DataFrame vào bảng ảo như khi mở file (tạo cửa sổ Tk ẩn)"""
+    import tkinter as tk
+    from src.ui_components import UIComponents
+
+    root = tk.Tk()
+    root.withdraw()
+    try:
+        ui = UIComponents(root)
+        ui.create_tree_view(lambda event: None)
+        ui.refresh_tree_columns(list(df.columns))
+        ui.populate_tree(df)
+        root.update()
+    finally:
+        root.destroy()
+
+
+def run_pipeline(path, trace_memory, with_tree):
+    """Một lượt chạy các thao tác trên file path. Trả về: {thao tác: giây hoặc byte}"""
+    recorder = Recorder(trace_memory)
+    with tempfile.TemporaryDirectory(prefix="bench_") as data_dir:
+        if trace_memory:
+            tracemalloc.start()
+        try:
+            data_handler = DataHandler(data_dir=data_dir, use_cache=False)
+            recorder.run("load_file", lambda: data_handler.load_file(path))
+            recorder.run("validate", data_handler.validate_frame)
+            recorder.run("clean_data", lambda: data_handler.clean_data(persist=False))
+            recorder.run("save_file", data_handler.save_file)
+            if with_tree:
+                recorder.run("populate_tree", lambda: populate_tree(data_handler.df))
+            df = data_handler.df
+            for chart_type, compute in COMPUTE_FUNCTIONS.items():
+                recorder.run(f"aggregate:{chart_type}", lambda: compute(df))
+            data_handler.close()
+        finally:
+            if trace_memory:
+                tracemalloc.stop()
+    return recorder.values
+
+
+def git_commit():
+    """Mã commit hiện tại (thêm '+dirty' nếu có thay đổi chưa commit), None nếu không có git"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit + ("+dirty" if dirty else "")
+
+
+def benchmark(sizes, formats, seed=0, repeat=1, trace_memory=True, on_result=None):
+    """
+    Chạy đo trên mọi cặp (số dòng, định dạng).
+    repeat: số lượt đo thời gian, lấy lượt nhanh nhất của từng thao tác.
+    Trả về: danh sách kết quả {rows, format, op, seconds, peak_bytes, status}
+    """
+    display = VirtualDisplay().start()
+    results = []
+    try:
+        for n_rows in sizes:
+            for fmt in formats:
+                if fmt == "xlsx" and n_rows > generate_data.XLSX_MAX_ROWS:
+                    continue
+                path = generate_data.write_dataset(n_rows, fmt, seed)
+                timings = [run_pipeline(path, False, display.available) for _ in range(repeat)]
+                memory = run_pipeline(path, True, display.available) if trace_memory else {}
+                ops = list(timings[0])
+                if not display.available:
+                    ops.insert(4, "populate_tree")
+                for op in ops:
+                    if op == "populate_tree" and not display.available:
+                        result = {"rows": n_rows, "format": fmt, "op": op, "seconds": None,
+                                  "peak_bytes": None, "status": f"skipped: {display.reason}"}
+                    else:
+                        result = {"rows": n_rows, "format": fmt, "op": op,
+                                  "seconds": round(min(t[op] for t in timings), 6),
+                                  "peak_bytes": memory.get(op), "status": "ok"}
+                    results.append(result)
+                    if on_result is not None:
+                        on_result(result)
+    finally:
+        display.stop()
+    return results
+
+
+def write_results(results, meta, output=None):
+    """Ghi kết quả ra file JSON, trả về đường dẫn"""
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        output = os.path.join(RESULTS_DIR, f"{stamp}_{meta['commit'] or 'nogit'}.json")
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({"meta": meta, "results": results}, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+    return output
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Đo hiệu năng các thao tác trên dữ liệu giả lập")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"Số dòng (mặc định: {DEFAULT_SIZES})")
+    parser.add_argument("--formats", default="csv", help="csv, xlsx hoặc csv,xlsx (mặc định: csv)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=1, help="Số lượt đo thời gian (lấy lượt nhanh nhất)")
+    parser.add_argument("--no-memory", action="store_true", help="Không chạy lượt đo bộ nhớ đỉnh")
+    parser.add_argument("-o", "--output", default=None, help="File JSON kết quả")
+    args = parser.parse_args(argv)
+
+    sizes = [generate_data.parse_size(size) for size in args.sizes.split(",")]
+    formats = args.formats.split(",")
+    meta = {
+        "commit": git_commit(),
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "memory_traced": not args.no_memory,
+    }
+
+    def report(result):
+        label = f"{generate_data.format_size(result['rows']):>5} {result['format']:<4} {result['op']:<26}"
+        if result["status"] != "ok":
+            print(f"{label} {result['status']}")
+            return
+        peak = result["peak_bytes"]
+        peak_text = f"{peak / 1024 / 1024:9.1f} MB" if peak is not None else ""
+        print(f"{label} {result['seconds'] * 1000:10.1f} ms {peak_text}")
+
+    results = benchmark(sizes, formats, args.seed, args.repeat, not args.no_memory, report)
+    print(f"Kết quả: {write_results(results, meta, args.output)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
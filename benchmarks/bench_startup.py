@@ -0,0 +1,145 @@
+"""
+Đo thời gian khởi động ứng dụng (tới khi cửa sổ vẽ xong khung hình đầu tiên)
+Mỗi lần đo chạy một tiến trình Python mới (không có module nào được nạp sẵn) và lấy trung vị.
+So với mốc trong startup_baseline.json: chậm hơn mốc quá ngưỡng cho phép, thiếu mốc (hoặc không đo
+được) một mốc thời gian, hoặc đường khởi động import module nặng (pandas, matplotlib, openpyxl)
+-> thoát với mã 1.
+
+Cách dùng:
+    python benchmarks/bench_startup.py                    # đo và so với mốc
+    python benchmarks/bench_startup.py --update-baseline  # đo và ghi lại mốc (sau khi đổi máy)
+
+Không có màn hình (DISPLAY) thì chạy Xvfb (xem display.py); không có cả Xvfb thì chỉ đo được phần
+import của src.app, và mốc first_frame_ms (nếu có) không kiểm tra được -> không đạt.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from display import VirtualDisplay
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "startup_baseline.json")
+
+# Module không được import trước khi cửa sổ hiện
+HEAVY_MODULES = ("pandas", "numpy", "matplotlib", "openpyxl", "pyarrow")
+
+# Chậm hơn mốc quá tỉ lệ này thì coi là chậm đi
+DEFAULT_TOLERANCE = 0.25
+
+# Độ lệch tối thiểu luôn cho phép (ms): mốc nhỏ (vài chục ms) dao động nhiều giữa các lần chạy
+MIN_SLACK_MS = 20
+
+# Chạy trong tiến trình con: in ra JSON các mốc thời gian (ms, tính từ đầu script)
+CHILD_SCRIPT = r"""
+import json, sys, time
+start = time.perf_counter()
+from src.app import DynamicDataApp
+result = {"import_ms": (time.perf_counter() - start) * 1000}
+try:
+    import tkinter as tk
+    root = tk.Tk()
+except Exception:
+    root = None
+if root is not None:
+    app = DynamicDataApp(root, prewarm=False)
+    root.update()
+    result["first_frame_ms"] = (time.perf_counter() - start) * 1000
+    root.destroy()
+result["heavy_modules"] = [name for name in HEAVY if name in sys.modules]
+print(json.dumps(result))
+"""
+
+
+def measure_once():
+    """Một lần đo trong tiến trình mới. Trả về: dict mốc thời gian (kèm tổng thời gian tiến trình)"""
+    script = f"HEAVY = {HEAVY_MODULES!r}\n" + CHILD_SCRIPT
+    start = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    result["process_ms"] = (time.perf_counter() - start) * 1000
+    return result
+
+
+def measure(runs):
+    """Đo nhiều lần, lấy trung vị từng mốc"""
+    samples = [measure_once() for _ in range(runs)]
+    result = {"runs": runs, "heavy_modules": sorted({m for s in samples for m in s["heavy_modules"]})}
+    for key in ("import_ms", "first_frame_ms", "process_ms"):
+        values = [s[key] for s in samples if key in s]
+        if values:
+            result[key] = round(statistics.median(values), 1)
+    return result
+
+
+def compare(result, baseline, tolerance):
+    """Danh sách lỗi (rỗng nếu đạt)"""
+    errors = []
+    if result["heavy_modules"]:
+        errors.append(f"đường khởi động import module nặng: {', '.join(result['heavy_modules'])}")
+    for key in ("import_ms", "first_frame_ms"):
+        if key not in result and key not in baseline:
+            continue
+        if key not in baseline:
+            errors.append(f"{key} chưa có mốc (chạy với --update-baseline, có màn hình hoặc Xvfb)")
+            continue
+        if key not in result:
+            errors.append(f"không đo được {key} (cần DISPLAY hoặc Xvfb)")
+            continue
+        limit = baseline[key] + max(baseline[key] * tolerance, MIN_SLACK_MS)
+        if result[key] > limit:
+            errors.append(f"{key} = {result[key]:.1f} ms > {limit:.1f} ms (mốc {baseline[key]:.1f} ms)")
+    return errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Đo thời gian khởi động ứng dụng")
+    parser.add_argument("--runs", type=int, default=5, help="Số lần đo (lấy trung vị, mặc định 5)")
+    parser.add_argument("--tolerance", type=float, default=None,
+                        help=f"Tỉ lệ chậm hơn mốc cho phép (mặc định theo file mốc hoặc {DEFAULT_TOLERANCE})")
+    parser.add_argument("--update-baseline", action="store_true", help="Ghi kết quả đo làm mốc mới")
+    args = parser.parse_args(argv)
+
+    display = VirtualDisplay().start()
+    try:
+        result = measure(args.runs)
+    finally:
+        display.stop()
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+    if args.update_baseline:
+        baseline = {key: result[key] for key in ("import_ms", "first_frame_ms") if key in result}
+        baseline["tolerance"] = args.tolerance if args.tolerance is not None else DEFAULT_TOLERANCE
+        if "first_frame_ms" not in baseline:
+            print(f"Không đo được first_frame_ms ({display.reason}): mốc chỉ có import_ms", file=sys.stderr)
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2)
+            f.write("\n")
+        print(f"Đã ghi mốc: {BASELINE_PATH}")
+        return 0
+
+    if not os.path.exists(BASELINE_PATH):
+        print("Chưa có mốc, chạy với --update-baseline để tạo", file=sys.stderr)
+        return 0 if not result["heavy_modules"] else 1
+    with open(BASELINE_PATH, encoding="utf-8") as f:
+        baseline = json.load(f)
+    tolerance = args.tolerance if args.tolerance is not None else baseline.get("tolerance", DEFAULT_TOLERANCE)
+
+    errors = compare(result, baseline, tolerance)
+    for error in errors:
+        print(f"CHẬM ĐI: {error}", file=sys.stderr)
+    if not errors:
+        print("Đạt: thời gian khởi động không chậm hơn mốc")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""
+So sánh hai file kết quả của bench_ops.py (VD: trước và sau một commit)
+Thao tác chậm hơn / tốn bộ nhớ hơn quá ngưỡng -> in ra và thoát với mã 1.
+
+Cách dùng:
+    python benchmarks/compare_results.py results/cu.json results/moi.json
+    python benchmarks/compare_results.py cu.json moi.json --threshold 0.1
+"""
+
+import argparse
+import json
+import sys
+
+
+# Chậm hơn / tốn bộ nhớ hơn quá tỉ lệ này thì coi là xấu đi
+DEFAULT_THRESHOLD = 0.2
+
+# Bỏ qua chênh lệch tuyệt đối nhỏ hơn mức này (dao động đo của thao tác rất nhanh / rất ít bộ nhớ)
+MIN_SECONDS = 0.005
+MIN_BYTES = 1024 * 1024
+
+
+def load(path):
+    """{(số dòng, định dạng, thao tác): kết quả}, meta"""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return {(r["rows"], r["format"], r["op"]): r for r in data["results"]}, data["meta"]
+
+
+def _change(old, new, minimum, threshold):
+    """(tỉ lệ mới/cũ, có xấu đi không); None nếu thiếu số liệu"""
+    if old is None or new is None:
+        return None
+    ratio = new / old if old else float("inf") if new else 1.0
+    return ratio, new - old > minimum and ratio > 1 + threshold
+
+
+def compare(old_results, new_results, threshold=DEFAULT_THRESHOLD):
+    """
+    Danh sách dòng so sánh theo thứ tự của kết quả mới:
+    (khóa, kết quả cũ, kết quả mới, thay đổi thời gian, thay đổi bộ nhớ)
+    """
+    rows = []
+    for key, new in new_results.items():
+        old = old_results.get(key)
+        if old is None:
+            continue
+        rows.append((key, old, new,
+                     _change(old["seconds"], new["seconds"], MIN_SECONDS, threshold),
+                     _change(old["peak_bytes"], new["peak_bytes"], MIN_BYTES, threshold)))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="So sánh hai file kết quả đo hiệu năng")
+    parser.add_argument("old", help="File kết quả cũ (mốc)")
+    parser.add_argument("new", help="File kết quả mới")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Tỉ lệ xấu đi cho phép (mặc định {DEFAULT_THRESHOLD})")
+    args = parser.parse_args(argv)
+
+    old_results, old_meta = load(args.old)
+    new_results, new_meta = load(args.new)
+    print(f"Cũ: {old_meta.get('commit')} ({old_meta.get('date')})  ->  "
+          f"Mới: {new_meta.get('commit')} ({new_meta.get('date')})")
+    if old_meta.get("memory_traced") != new_meta.get("memory_traced"):
+        print("Chú ý: hai lần đo khác chế độ đo bộ nhớ", file=sys.stderr)
+
+    regressions = 0
+    for (n_rows, fmt, op), old, new, time_change, memory_change in compare(old_results, new_results, args.threshold):
+        parts = [f"{n_rows:>10,} {fmt:<4} {op:<26}"]
+        for change, value_old, value_new, unit, scale in (
+            (time_change, old["seconds"], new["seconds"], "ms", 1000),
+            (memory_change, old["peak_bytes"], new["peak_bytes"], "MB", 1 / 1024 / 1024),
+        ):
+            if change is None:
+                parts.append(f"{'-':>30}")
+                continue
+            ratio, worse = change
+            regressions += worse
+            mark = " !" if worse else "  "
+            parts.append(f"{value_old * scale:9.1f} -> {value_new * scale:9.1f} {unit} x{ratio:4.2f}{mark}")
+        print(" ".join(parts))
+
+    missing = set(old_results) - set(new_results)
+    if missing:
+        print(f"{len(missing)} thao tác chỉ có trong kết quả cũ", file=sys.stderr)
+    if regressions:
+        print(f"{regressions} chỉ số xấu đi quá {args.threshold:.0%}", file=sys.stderr)
+        return 1
+    print("Không có chỉ số nào xấu đi quá ngưỡng")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+"""
+Màn hình cho các phép đo cần Tk (bench_ops, bench_startup)
+Dùng DISPLAY có sẵn, không có thì chạy Xvfb (màn hình ảo) nếu máy có.
+"""
+
+import os
+import shutil
+import subprocess
+import time
+
+
+class VirtualDisplay:
+    """Màn hình cho Tk: dùng DISPLAY có sẵn, hoặc chạy Xvfb nếu máy có, hoặc không có gì"""
+
+    def __init__(self):
+        self.process = None
+        self.available = bool(os.environ.get("DISPLAY"))
+        self.reason = None
+
+    def start(self):
+        if self.available:
+            return self
+        if shutil.which("Xvfb") is None:
+            self.reason = "không có DISPLAY và không tìm thấy Xvfb"
+            return self
+        display = ":99"
+        self.process = subprocess.Popen(
+            ["Xvfb", display, "-screen", "0", "1280x800x24", "-nolisten", "tcp"],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        time.sleep(0.5)
+        if self.process.poll() is not None:
+            self.reason = "Xvfb không khởi động được"
+            self.process = None
+            return self
+        os.environ["DISPLAY"] = display
+        self.available = True
+        return self
+
+    def stop(self):
+        if self.process is not None:
+            self.process.terminate()
+            self.process.wait()
+            self.process = None
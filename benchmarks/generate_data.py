@@ -0,0 +1,191 @@
+"""
+Sinh dữ liệu giả lập theo cấu trúc Titanic cho việc đo hiệu năng
+Mỗi dòng được lấy mẫu lại từ original_data/titanic.csv (giữ tương quan giữa các cột) rồi làm nhiễu,
+kèm các lỗi thường gặp mà bước kiểm tra/làm sạch phải xử lý:
+    - ô trống (Age, Cabin, Embarked như dữ liệu gốc, thêm một ít ở Fare và Survived)
+    - dòng trùng PassengerId
+    - Sex/Embarked viết hoa/thường lẫn lộn, thừa khoảng trắng
+    - Fare âm
+Cùng seed và số dòng luôn cho ra cùng một file (sinh theo khối cố định, mỗi khối một seed con).
+
+Cách dùng:
+    python benchmarks/generate_data.py 100k
+    python benchmarks/generate_data.py 10M --format csv --seed 1
+"""
+
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEMPLATE_PATH = os.path.join(ROOT, "original_data", "titanic.csv")
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".data")
+
+# Số dòng mỗi khối khi sinh và ghi file (cố định để kết quả không phụ thuộc cách chia)
+CHUNK_ROWS = 500_000
+
+# Số dòng tối đa của một sheet Excel (trừ dòng tiêu đề)
+XLSX_MAX_ROWS = 1_048_575
+
+# Tỉ lệ các lỗi được cài vào dữ liệu
+DUPLICATE_RATE = 0.01       # Dòng trùng PassengerId với một dòng trước đó
+MIXED_CASE_RATE = 0.05      # Sex/Embarked bị đổi hoa/thường hoặc thừa khoảng trắng
+NEGATIVE_FARE_RATE = 0.01   # Fare âm
+MISSING_FARE_RATE = 0.002   # Fare trống
+MISSING_KEY_RATE = 0.001    # Survived trống (dòng sẽ bị xóa khi làm sạch)
+
+_template = None
+
+
+def parse_size(text):
+    """'1k' -> 1000, '2.5M' -> 2500000, '891' -> 891"""
+    text = text.strip().lower()
+    scale = {"k": 1_000, "m": 1_000_000}.get(text[-1:], 1)
+    number = text[:-1] if scale > 1 else text
+    return int(float(number) * scale)
+
+
+def format_size(n_rows):
+    """1000 -> '1k', 10000000 -> '10M'"""
+    for scale, suffix in ((1_000_000, "M"), (1_000, "k")):
+        if n_rows >= scale and n_rows % scale == 0:
+            return f"{n_rows // scale}{suffix}"
+    return str(n_rows)
+
+
+def load_template():
+    """Dữ liệu gốc dùng làm mẫu (đọc một lần)"""
+    global _template
+    if _template is None:
+        _template = pd.read_csv(TEMPLATE_PATH)
+    return _template
+
+
+def _mixed_case(rng, values, rate):
+    """Đổi ngẫu nhiên một phần giá trị chuỗi: đảo hoa/thường, viết hoa chữ đầu, thừa khoảng trắng"""
+    values = values.copy()
+    positions = np.flatnonzero((rng.random(len(values)) < rate) & pd.notna(values))
+    variants = rng.integers(0, 3, len(positions))
+    for position, variant in zip(positions, variants):
+        value = values[position]
+        if variant == 0:
+            values[position] = value.swapcase()
+        elif variant == 1:
+            values[position] = value.capitalize()
+        else:
+            values[position] = f" {value} "
+    return values
+
+
+def generate_chunk(start, n_rows, seed=0):
+    """
+    Sinh n_rows dòng bắt đầu từ PassengerId = start + 1.
+    Seed con theo (seed, vị trí khối) để mỗi khối sinh độc lập nhưng cố định.
+    """
+    rng = np.random.default_rng([seed, start // CHUNK_ROWS])
+    template = load_template()
+    picks = rng.integers(0, len(template), n_rows)
+    df = template.iloc[picks].reset_index(drop=True)
+
+    df["PassengerId"] = np.arange(start + 1, start + n_rows + 1)
+
+    # Tuổi: nhiễu nhỏ quanh giá trị gốc, làm tròn 0.5 (ô trống giữ nguyên như dữ liệu gốc)
+    ages = df["Age"].to_numpy(dtype="float64")
+    ages = np.clip(np.round((ages + rng.normal(0, 2, n_rows)) * 2) / 2, 0.5, 80)
+    df["Age"] = ages
+
+    # Giá vé: nhiễu theo tỉ lệ, một phần bị âm hoặc trống
+    fares = df["Fare"].to_numpy(dtype="float64") * rng.uniform(0.9, 1.1, n_rows)
+    fares = np.round(fares, 4)
+    fares[rng.random(n_rows) < NEGATIVE_FARE_RATE] *= -1
+    fares[rng.random(n_rows) < MISSING_FARE_RATE] = np.nan
+    df["Fare"] = fares
+
+    survived = np.array(df["Survived"], dtype="float64")
+    survived[rng.random(n_rows) < MISSING_KEY_RATE] = np.nan
+    df["Survived"] = pd.array(survived, dtype="Int64")
+
+    df["Sex"] = _mixed_case(rng, df["Sex"].to_numpy(dtype=object), MIXED_CASE_RATE)
+    df["Embarked"] = _mixed_case(rng, df["Embarked"].to_numpy(dtype=object), MIXED_CASE_RATE)
+
+    # Dòng trùng: chép nguyên một dòng trước đó trong khối (cùng PassengerId)
+    duplicates = np.flatnonzero(rng.random(n_rows) < DUPLICATE_RATE)
+    duplicates = duplicates[duplicates > 0]
+    if len(duplicates):
+        rows = np.arange(n_rows)
+        rows[duplicates] = (rng.random(len(duplicates)) * duplicates).astype(np.int64)
+        df = df.take(rows).reset_index(drop=True)
+
+    return df
+
+
+def generate(n_rows, seed=0):
+    """Sinh toàn bộ n_rows dòng thành một DataFrame (chỉ nên dùng với số dòng vừa bộ nhớ)"""
+    chunks = [generate_chunk(start, min(CHUNK_ROWS, n_rows - start), seed)
+              for start in range(0, n_rows, CHUNK_ROWS)]
+    return pd.concat(chunks, ignore_index=True) if chunks else load_template().iloc[:0]
+
+
+def dataset_path(n_rows, fmt="csv", seed=0, out_dir=DATA_DIR):
+    return os.path.join(out_dir, f"titanic_{format_size(n_rows)}_s{seed}.{fmt}")
+
+
+def write_dataset(n_rows, fmt="csv", seed=0, out_dir=DATA_DIR, overwrite=False):
+    """
+    Ghi bộ dữ liệu ra file (CSV ghi nối từng khối nên không cần giữ cả bảng trong bộ nhớ).
+    File đã có thì dùng lại (dữ liệu cố định theo seed). Trả về: đường dẫn file
+    """
+    if fmt not in ("csv", "xlsx"):
+        raise ValueError(f"Định dạng không hỗ trợ: {fmt}")
+    if fmt == "xlsx" and n_rows > XLSX_MAX_ROWS:
+        raise ValueError(f"Excel chỉ chứa tối đa {XLSX_MAX_ROWS:,} dòng mỗi sheet")
+
+    path = dataset_path(n_rows, fmt, seed, out_dir)
+    if os.path.exists(path) and not overwrite:
+        return path
+    os.makedirs(out_dir, exist_ok=True)
+
+    # Ghi ra file tạm rồi đổi tên: file dở dang (bị ngắt giữa chừng) không bị dùng lại
+    base, ext = os.path.splitext(path)
+    tmp_path = f"{base}.tmp{ext}"
+    try:
+        if fmt == "csv":
+            for start in range(0, n_rows, CHUNK_ROWS):
+                chunk = generate_chunk(start, min(CHUNK_ROWS, n_rows - start), seed)
+                chunk.to_csv(tmp_path, mode="w" if start == 0 else "a", header=start == 0, index=False)
+        else:
+            generate(n_rows, seed).to_excel(tmp_path, index=False, engine="openpyxl")
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sinh dữ liệu giả lập cấu trúc Titanic")
+    parser.add_argument("sizes", nargs="+", help="Số dòng, ví dụ 1k 100k 10M")
+    parser.add_argument("--format", default="csv", help="csv, xlsx hoặc csv,xlsx (mặc định: csv)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--out-dir", default=DATA_DIR)
+    parser.add_argument("--overwrite", action="store_true", help="Sinh lại kể cả khi file đã có")
+    args = parser.parse_args(argv)
+
+    for size in args.sizes:
+        for fmt in args.format.split(","):
+            n_rows = parse_size(size)
+            if fmt == "xlsx" and n_rows > XLSX_MAX_ROWS:
+                print(f"Bỏ qua {size} (xlsx): Excel chỉ chứa tối đa {XLSX_MAX_ROWS:,} dòng mỗi sheet",
+                      file=sys.stderr)
+                continue
+            path = write_dataset(n_rows, fmt, args.seed, args.out_dir, args.overwrite)
+            print(f"{path} ({os.path.getsize(path) / 1024 / 1024:.1f} MB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
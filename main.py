@@ -1,14 +1,19 @@
 """
 File chính để chạy ứng dụng
 Đặt file này trong thư mục data-analysis (cùng cấp với thư mục src)
+
+Chạy giao diện:        python main.py
+Chạy không giao diện:  python main.py --headless <file CSV/Excel> [tùy chọn]
+Làm sạch hàng loạt:    python main.py --batch <thư mục hoặc glob> [tùy chọn]
 """
 
-import tkinter as tk
-from src.app import DynamicDataApp
-import openpyxl
+import sys
 
 def main():
     """Hàm main để khởi chạy ứng dụng"""
+    import tkinter as tk
+    from src.app import DynamicDataApp
+    
     # Khởi tạo cửa sổ giao diện GUI
     root = tk.Tk()
     
@@ -18,5 +23,19 @@ def main():
     # Chạy vòng lặp sự kiện
     root.mainloop()
 
+def main_headless(argv):
+    """Chạy quy trình xử lý không cần giao diện (không import tkinter)"""
+    from src.cli import main as cli_main
+    return cli_main(argv)
+
+def main_batch(argv):
+    """Làm sạch hàng loạt file bằng nhiều tiến trình (không import tkinter)"""
+    from src.batch import main as batch_main
+    return batch_main(argv)
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if len(sys.argv) > 1 and sys.argv[1] == "--headless":
+        sys.exit(main_headless(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == "--batch":
+        sys.exit(main_batch(sys.argv[2:]))
+    main()
@@ -0,0 +1,209 @@
+"""
+Module Aggregates - Số liệu tổng hợp cho các biểu đồ
+Tách phần tính toán (đếm, phân phối, tương quan...) khỏi phần vẽ,
+kết quả được lưu lại theo loại biểu đồ và phiên bản dữ liệu của các cột liên quan
+"""
+
+import numpy as np
+import pandas as pd
+
+from .density import binned_kde
+from .profiler import span
+
+
+# Các cột mà mỗi loại biểu đồ phụ thuộc (None = mọi cột số)
+CHART_COLUMNS = {
+    "survived": ["Survived"],
+    "sex": ["Sex"],
+    "age": ["Age"],
+    "fare": ["Fare"],
+    "sex_survived": ["Sex", "Survived"],
+    "survived_pclass": ["Pclass", "Survived"],
+    "age_kde": ["Age", "Survived"],
+    "corr": None,
+}
+
+# Số điểm lưới khi vẽ đường mật độ
+KDE_GRID_SIZE = 200
+
+# Số giá trị dữ liệu xử lý mỗi lần khi tính KDE chính xác (giới hạn bộ nhớ ma trận tạm)
+KDE_BLOCK = 20000
+
+# Từ số dòng này trở lên, KDE được tính xấp xỉ bằng gom lưới + FFT (xem module density)
+FAST_KDE_MIN_ROWS = 50000
+
+
+def _numeric(series):
+    """Giá trị số (bỏ NaN) của một cột dưới dạng mảng float"""
+    return pd.to_numeric(series, errors="coerce").dropna().to_numpy(dtype="float64")
+
+
+def scott_bandwidth(values):
+    """Độ rộng băng thông theo quy tắc Scott (giống scipy.stats.gaussian_kde)"""
+    n = len(values)
+    if n < 2:
+        return 1.0
+    std = np.std(values, ddof=1)
+    return (std if std > 0 else 1.0) * n ** (-1 / 5)
+
+
+def kde_grid(values, bandwidth, cut=3, gridsize=KDE_GRID_SIZE):
+    """Lưới điểm phủ dữ liệu, mở rộng thêm cut * bandwidth ở hai đầu"""
+    return np.linspace(values.min() - cut * bandwidth, values.max() + cut * bandwidth, gridsize)
+
+
+def exact_kde(values, grid, bandwidth):
+    """Mật độ Gaussian chính xác tại các điểm lưới (O(số dòng x số điểm lưới))"""
+    density = np.zeros(len(grid))
+    for start in range(0, len(values), KDE_BLOCK):
+        block = values[start:start + KDE_BLOCK]
+        z = (grid[None, :] - block[:, None]) / bandwidth
+        density += np.exp(-0.5 * z * z).sum(axis=0)
+    return density / (len(values) * bandwidth * np.sqrt(2 * np.pi))
+
+
+def box_stats(values, whis=1.5):
+    """Số liệu biểu đồ hộp (tứ phân vị, râu, điểm ngoại lai) theo định dạng của Axes.bxp"""
+    if len(values) == 0:
+        return None
+    q1, med, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+    inside = values[(values >= q1 - whis * iqr) & (values <= q3 + whis * iqr)]
+    whislo = inside.min() if len(inside) else q1
+    whishi = inside.max() if len(inside) else q3
+    fliers = values[(values < whislo) | (values > whishi)]
+    return {"med": med, "q1": q1, "q3": q3, "whislo": whislo, "whishi": whishi,
+            "fliers": fliers, "mean": values.mean()}
+
+
+def compute_survived(df):
+    """1. Số lượng Sống sót vs Thiệt mạng"""
+    return df['Survived'].value_counts().sort_index()
+
+
+def compute_sex(df):
+    """2. Số lượng Nam/Nữ"""
+    return df['Sex'].value_counts()
+
+
+def compute_age(df, bins=20):
+    """3. Histogram độ tuổi kèm đường mật độ (quy đổi về số lượng như seaborn histplot)"""
+    ages = _numeric(df['Age'])
+    if len(ages) == 0:
+        return None
+    counts, edges = np.histogram(ages, bins=bins)
+    bandwidth = scott_bandwidth(ages)
+    grid = kde_grid(ages, bandwidth, cut=0)
+    if len(ages) >= FAST_KDE_MIN_ROWS:
+        density = binned_kde(ages, grid, bandwidth)
+    else:
+        density = exact_kde(ages, grid, bandwidth)
+    return {"counts": counts, "edges": edges, "kde_x": grid,
+            "kde_y": density * len(ages) * (edges[1] - edges[0])}
+
+
+def compute_fare(df):
+    """4. Số liệu biểu đồ hộp giá vé"""
+    return box_stats(_numeric(df['Fare']))
+
+
+def compute_sex_survived(df):
+    """5. Bảng đếm Giới tính x Sống sót"""
+    return pd.crosstab(df['Sex'], df['Survived'])
+
+
+def compute_pclass_survived(df):
+    """6. Bảng đếm Hạng vé x Sống sót, chỉ lấy Hạng 1 và Hạng 3"""
+    df_filtered = df[df['Pclass'].isin([1, 3])]
+    return pd.crosstab(df_filtered['Pclass'], df_filtered['Survived'])
+
+
+def compute_age_kde(df):
+    """
+    7. Mật độ tuổi theo nhóm Sống sót trên lưới chung.
+    Mỗi nhóm được nhân với tỉ lệ số dòng của nhóm (giống common_norm của seaborn).
+    """
+    ages = pd.to_numeric(df['Age'], errors="coerce").to_numpy(dtype="float64")
+    codes, keys = pd.factorize(df['Survived'], sort=True)
+    valid = ~np.isnan(ages) & (codes >= 0)
+    ages, codes = ages[valid], codes[valid]
+    if len(ages) == 0:
+        return None
+
+    # Số phần tử, tổng, tổng bình phương của từng nhóm trong một lần duyệt -> băng thông Scott
+    n_groups = len(keys)
+    sizes = np.bincount(codes, minlength=n_groups).astype("float64")
+    sums = np.bincount(codes, weights=ages, minlength=n_groups)
+    squares = np.bincount(codes, weights=ages * ages, minlength=n_groups)
+    present = sizes > 0
+    with np.errstate(invalid="ignore", divide="ignore"):
+        variances = (squares - sums * sums / sizes) / (sizes - 1)
+    stds = np.sqrt(np.where((sizes > 1) & (variances > 0), variances, 1.0))
+    bandwidths = stds * np.where(sizes > 1, sizes, 1) ** (-1 / 5)
+    grid = kde_grid(ages, bandwidths[present].max())
+
+    if len(ages) >= FAST_KDE_MIN_ROWS:
+        densities = binned_kde(ages, grid, bandwidths, groups=codes, n_groups=n_groups)
+    else:
+        densities = np.vstack([
+            exact_kde(ages[codes == i], grid, bandwidths[i]) if present[i] else np.zeros(len(grid))
+            for i in range(n_groups)
+        ])
+
+    curves = {}
+    for i, key in enumerate(keys):
+        if present[i]:
+            curves[key] = densities[i] * sizes[i] / len(ages)
+    return {"x": grid, "curves": curves}
+
+
+def compute_correlation(df, moments=None):
+    """
+    8. Ma trận tương quan giữa các cột số
+    moments: RunningMoments của dữ liệu (cập nhật theo từng thao tác) -> chỉ tốn O(số cột²)
+    """
+    if moments is not None:
+        return moments.correlation(df)
+    numeric_df = df.select_dtypes(include="number")
+    return numeric_df.corr()
+
+
+COMPUTE_FUNCTIONS = {
+    "survived": compute_survived,
+    "sex": compute_sex,
+    "age": compute_age,
+    "fare": compute_fare,
+    "sex_survived": compute_sex_survived,
+    "survived_pclass": compute_pclass_survived,
+    "age_kde": compute_age_kde,
+    "corr": compute_correlation,
+}
+
+
+class AggregateCache:
+    """
+    Lưu số liệu tổng hợp theo loại biểu đồ.
+    Khóa là phiên bản của các cột mà biểu đồ phụ thuộc: sửa một cột chỉ làm mất
+    số liệu của các biểu đồ dùng cột đó.
+    """
+
+    def __init__(self):
+        self._entries = {}  # {loại biểu đồ: (khóa phiên bản, số liệu)}
+
+    def get(self, chart_type, data_handler):
+        """Lấy số liệu của biểu đồ, chỉ tính lại khi dữ liệu liên quan đã thay đổi"""
+        key = data_handler.columns_version(CHART_COLUMNS[chart_type])
+        entry = self._entries.get(chart_type)
+        if entry is not None and entry[0] == key:
+            return entry[1]
+        df = data_handler.df
+        with span(f"aggregate:{chart_type}", rows=len(df)):
+            if chart_type == "corr":
+                result = compute_correlation(df, data_handler.moments)
+            else:
+                result = COMPUTE_FUNCTIONS[chart_type](df)
+        self._entries[chart_type] = (key, result)
+        return result
+
+    def clear(self):
+        self._entries.clear()
@@ -5,35 +5,203 @@ Kết nối tất cả các module lại với nhau
 
 import tkinter as tk
 from tkinter import filedialog, messagebox
-import pandas as pd
 
-from .data_handler import DataHandler
+# Chỉ import những gì cần để hiện cửa sổ. pandas (DataHandler, ChunkedLoader) và
+# matplotlib (Visualizer) được import khi dùng lần đầu, hoặc nạp trước ở luồng nền (xem _prewarm)
 from .ui_components import UIComponents
-from .visualizer import Visualizer
+from .autosave import AutoSaver
+from .profiler import profiler
 
+import importlib
 import os
+import threading
+import time
+
+
+# Các module nặng được nạp trước ở luồng nền sau khi cửa sổ đã hiện
+PREWARM_MODULES = (
+    ".data_handler",      # pandas, numpy
+    ".loader",
+    "matplotlib.figure",  # matplotlib (phần lớn thời gian import của Visualizer)
+    ".aggregates",
+    ".charts",
+)
+
+# Thời gian chờ sau khi cửa sổ hiện rồi mới bắt đầu nạp trước (ms)
+PREWARM_DELAY_MS = 200
+
+# Khi bật đo hiệu năng: chu kỳ cập nhật nhãn thời gian (ms) và số thao tác hiển thị
+PERF_POLL_MS = 500
+PERF_LABEL_SPANS = 3
 
 
 class DynamicDataApp:
     """Lớp chính của ứng dụng quản lý dữ liệu động"""
     
-    def __init__(self, root):
+    def __init__(self, root, prewarm=True):
+        """prewarm: nạp trước pandas/matplotlib ở luồng nền sau khi cửa sổ đã hiện"""
         self.root = root
         self.root.title("Quản lý Dữ liệu Động (Import Excel/CSV)")
         self.root.geometry("1000x700")
         
-        # Khởi tạo các module con
-        self.data_handler = DataHandler()
+        # Khởi tạo các module con (DataHandler, Visualizer, AutoSaver được tạo khi dùng lần đầu)
+        self._data_handler = None
+        self._visualizer = None
+        self._summary_panel = None
+        self._autosaver = None
         self.ui = UIComponents(root)
-        self.visualizer = Visualizer(root)
+        
+        # Bộ đọc file ở luồng nền (None khi không đọc file nào)
+        self.loader = None
+        
+        # Bộ lọc đang áp dụng lên bảng: (cột, biểu thức) hoặc None
+        self.active_filter = None
+        
+        # Khóa sắp xếp đang áp dụng: [(cột, tăng dần?), ...]
+        self.active_sort = []
         
         # Tạo giao diện
         self._setup_ui()
+        
+        # Gộp nhật ký chỉnh sửa vào file dữ liệu khi đóng cửa sổ
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
+        if prewarm:
+            self.root.after(PREWARM_DELAY_MS, self._prewarm)
+        
+        # Số span đã hiển thị lên nhãn thời gian (chỉ dùng khi bật đo hiệu năng)
+        self._perf_seen = 0
+        if profiler.enabled:
+            self.root.after(PERF_POLL_MS, self._poll_perf)
+    
+    @property
+    def data_handler(self):
+        """DataHandler (import pandas ở lần dùng đầu tiên)"""
+        if self._data_handler is None:
+            from .data_handler import DataHandler
+            self._data_handler = DataHandler()
+        return self._data_handler
+    
+    @property
+    def visualizer(self):
+        """Visualizer (import matplotlib ở lần vẽ biểu đồ đầu tiên)"""
+        if self._visualizer is None:
+            from .visualizer import Visualizer
+            self._visualizer = Visualizer(self.root)
+        return self._visualizer
+    
+    @property
+    def summary_panel(self):
+        """Cửa sổ thống kê mô tả (tạo khi mở lần đầu)"""
+        if self._summary_panel is None:
+            from .summary_panel import SummaryPanel
+            self._summary_panel = SummaryPanel(self.root)
+        return self._summary_panel
+    
+    @property
+    def autosaver(self):
+        """Lưu nền: gom các chỉnh sửa liên tiếp thành một lần ghi file"""
+        if self._autosaver is None:
+            self._autosaver = AutoSaver(self.root, self.data_handler, self.on_autosave_done)
+        return self._autosaver
+    
+    def _prewarm(self):
+        """
+        Import trước các module nặng ở luồng nền để lần mở file / vẽ biểu đồ đầu tiên không phải chờ.
+        Chỉ import, không tạo widget: Tk chỉ được dùng trên luồng giao diện.
+        Luồng giao diện cần module đang được nạp dở sẽ tự chờ (khóa import của Python).
+        """
+        def run():
+            for name in PREWARM_MODULES:
+                try:
+                    importlib.import_module(name, __package__)
+                except Exception:
+                    # Lỗi (nếu có) sẽ hiện ra khi thật sự dùng tới module
+                    pass
+        
+        threading.Thread(target=run, daemon=True).start()
+    
+    def _refresh_charts(self):
+        """Vẽ lại biểu đồ / bảng thống kê nếu đã từng mở cửa sổ tương ứng"""
+        if self._visualizer is not None:
+            self._visualizer.refresh()
+        if self._summary_panel is not None:
+            self._summary_panel.refresh()
+    
+    def _poll_perf(self):
+        """Hiển thị thời gian các thao tác vừa chạy (span có thể được ghi từ luồng nền)"""
+        count = profiler.event_count()
+        if count != self._perf_seen:
+            self._perf_seen = count
+            self.ui.update_perf_label(
+                " | ".join(profiler.format_event(event) for event in profiler.latest(PERF_LABEL_SPANS))
+            )
+        self.root.after(PERF_POLL_MS, self._poll_perf)
+    
+    def export_trace(self):
+        """Ghi các span của phiên làm việc ra data/trace_<thời điểm>.json (mở bằng chrome://tracing)"""
+        path = os.path.join(self.data_handler.data_dir, f"trace_{time.strftime('%Y%m%d-%H%M%S')}.json")
+        try:
+            profiler.export_chrome_trace(path)
+        except OSError as e:
+            messagebox.showerror("Lỗi", f"Không thể xuất trace: {e}")
+            return
+        self.ui.update_status_label(f"Đã xuất trace: {path}", "green")
+    
+    def on_close(self):
+        """Đóng ứng dụng"""
+        self.cancel_load()
+        if not self._merge_paged_edits():
+            return
+        try:
+            if self._autosaver is not None:
+                self._autosaver.flush()
+        except Exception as e:
+            if not messagebox.askyesno("Lỗi", f"Không thể lưu dữ liệu: {e}\nVẫn thoát?"):
+                return
+        self.root.destroy()
+    
+    def _merge_paged_edits(self):
+        """
+        Chế độ phân trang: hỏi có gộp các chỉnh sửa vào file dữ liệu không (ghi lại cả file lớn).
+        Không gộp thì chỉnh sửa vẫn nằm trong kho và được khôi phục ở lần mở file sau.
+        Trả về: False nếu người dùng hủy việc đóng
+        """
+        data_handler = self._data_handler
+        if data_handler is None or data_handler.paged is None or not data_handler.paged.dirty:
+            return True
+        answer = messagebox.askyesnocancel(
+            "Lưu thay đổi",
+            f"Gộp các chỉnh sửa vào {data_handler.save_path()}?\n"
+            "(Ghi lại toàn bộ file lớn, có thể mất vài phút. Chọn Không: chỉnh sửa vẫn được giữ "
+            "và khôi phục ở lần mở file sau)"
+        )
+        if answer is None:
+            return False
+        if answer:
+            self.ui.update_status_label("Đang gộp chỉnh sửa vào file dữ liệu...", "blue")
+            self.root.update_idletasks()
+            try:
+                data_handler.save_file()
+            except Exception as e:
+                return messagebox.askyesno("Lỗi", f"Không thể lưu dữ liệu: {e}\nVẫn thoát?")
+        return True
+    
+    def _paged_unsupported(self, action):
+        """Báo thao tác không chạy được ở chế độ phân trang. Trả về: True nếu đang ở chế độ phân trang"""
+        if self._data_handler is None or self._data_handler.paged is None:
+            return False
+        self.ui.update_status_label(f"Chế độ phân trang (file lớn) không hỗ trợ {action}", "red")
+        return True
     
     def _setup_ui(self):
         """Thiết lập giao diện"""
         # 1. Khung điều khiển trên
-        self.ui.create_top_frame(self.load_file)
+        self.ui.create_top_frame(
+            self.load_file, self.cancel_load, self.toggle_optimize_memory,
+            trace_command=self.export_trace if profiler.enabled else None,
+            sheet_command=self.select_sheet
+        )
         
         # 2. Khung nhập liệu
         self.ui.create_input_frame()
@@ -44,14 +212,29 @@ class DynamicDataApp:
             update_cmd=self.update_data,
             delete_cmd=self.delete_data,
             clean_cmd=self.clean_data,
-            plot_cmd=self.show_visualization_popup
+            plot_cmd=self.show_visualization_popup,
+            undo_cmd=self.undo,
+            redo_cmd=self.redo,
+            stats_cmd=self.show_summary
         )
         
-        # 4. Bảng dữ liệu
-        self.ui.create_tree_view(self.on_item_select)
+        # 4. Thanh tìm kiếm / lọc
+        self.ui.create_filter_bar(self.apply_filter, self.clear_filter)
+        
+        # 5. Bảng dữ liệu
+        self.ui.create_tree_view(self.on_item_select, self.apply_sort)
+        
+        # 6. Phím tắt Hoàn tác / Làm lại
+        self.root.bind("<Control-z>", lambda e: self.undo())
+        self.root.bind("<Control-y>", lambda e: self.redo())
+        self.root.bind("<Control-Z>", lambda e: self.redo())  # Ctrl+Shift+Z
     
     def load_file(self):
-        """Mở hộp thoại chọn file và load dữ liệu"""
+        """Mở hộp thoại chọn file và load dữ liệu ở luồng nền"""
+        if self.loader is not None:
+            messagebox.showwarning("Chú ý", "Đang đọc file, hãy chờ hoặc bấm Hủy")
+            return
+        
         # Mở hộp thoại chọn file
         file_path = filedialog.askopenfilename(
             filetypes=[("Excel/CSV Files", "*.xlsx *.xls *.csv")]
@@ -60,14 +243,99 @@ class DynamicDataApp:
             return # Người dùng hủy
         
         try:
-            # Load file qua DataHandler
-            self.data_handler.load_file(file_path)
+            # Ghi nốt dữ liệu của file đang mở trước khi chuyển file
+            self.autosaver.flush()
+        except Exception as e:
+            messagebox.showerror("Lỗi", f"Không thể lưu dữ liệu hiện tại: {e}")
+            return
+        
+        # Đọc file theo khối ở luồng nền (file CSV rất lớn: chuyển sang kho phân trang trên đĩa)
+        from .loader import ChunkedLoader, PagedLoader
+        paged = self.data_handler.should_page(file_path)
+        loader_class = PagedLoader if paged else ChunkedLoader
+        self.loader = loader_class(
+            self.root,
+            self.data_handler,
+            file_path,
+            on_progress=self.on_load_progress,
+            on_first_chunk=self.on_load_first_chunk,
+            on_done=lambda df, memory_report, error, cancelled: self.on_load_done(
+                file_path, df, memory_report, error, cancelled, paged
+            )
+        )
+        self.ui.set_loading(True)
+        self.ui.update_status_label(f"Đang đọc: {os.path.basename(file_path)}...", "blue")
+        self.loader.start()
+    
+    def toggle_optimize_memory(self, enabled):
+        """Bật/tắt chế độ tối ưu bộ nhớ cho các lần mở file sau"""
+        self.data_handler.optimize_memory = enabled
+    
+    def cancel_load(self):
+        """Hủy việc đọc file đang chạy"""
+        if self.loader is not None:
+            self.loader.cancel()
+    
+    def on_load_progress(self, rows, bytes_read, total_bytes):
+        """Hiển thị tiến độ đọc file"""
+        mb = 1024 * 1024
+        self.ui.update_status_label(
+            f"Đang đọc: {rows:,} dòng ({bytes_read / mb:.1f}/{total_bytes / mb:.1f} MB)",
+            "blue"
+        )
+    
+    def on_load_first_chunk(self, df):
+        """Hiển thị trước khối dữ liệu đầu tiên trong lúc đọc phần còn lại"""
+        self.ui.refresh_tree_columns(list(df.columns))
+        self.ui.populate_tree(df)
+    
+    def on_load_done(self, file_path, df, memory_report, error, cancelled, paged=False):
+        """
+        Kết thúc đọc file: nhận dữ liệu, báo lỗi hoặc khôi phục bảng cũ khi bị hủy
+        paged: df là PagedDataset (file mở ở chế độ phân trang)
+        """
+        self.loader = None
+        self.ui.set_loading(False)
+        
+        if cancelled or error is not None:
+            # Trả bảng về dữ liệu trước đó
+            self.refresh_ui_structure()
+            self.refresh_table()
+            if cancelled:
+                self.ui.update_status_label("Đã hủy đọc file", "red")
+            else:
+                self.ui.update_status_label("Chưa có dữ liệu", "red")
+                messagebox.showerror("Lỗi", f"Không thể đọc file: {error}")
+            return
+        
+        try:
+            # Nhận dữ liệu qua DataHandler (phát lại nhật ký nếu có)
+            if paged:
+                self.data_handler.finish_paged_load(file_path, df)
+            else:
+                self.data_handler.finish_load(file_path, df, memory_report)
+            
+            # File mới -> bỏ bộ lọc và sắp xếp của file cũ
+            self._reset_view()
+            self.ui.set_sheets(self.data_handler.sheet_names, self.data_handler.sheet_name)
             
             # Cập nhật label trạng thái
+            status = self._open_status(file_path)
+            if paged:
+                status += " - chế độ phân trang"
+            if self.data_handler.replayed_count:
+                status += f" (khôi phục {self.data_handler.replayed_count} thao tác từ nhật ký)"
+            report = self.data_handler.validation_report
+            if report is not None and not report.is_valid:
+                status += f" - {report.summary()}"
+            memory = self.data_handler.memory_report
+            if memory is not None:
+                mb = 1024 * 1024
+                status += f" - bộ nhớ {memory['before'] / mb:.1f} -> {memory['after'] / mb:.1f} MB"
             self.ui.update_status_label(
                 #f"Đang mở: {file_path.split('/')[-1]}",
                 #Dùng basename để tránh trường hợp đường dẫn dùng dấu khác
-                f"Đang mở: {os.path.basename(file_path)}",
+                status,
                 "green"
             )
 
@@ -80,6 +348,50 @@ class DynamicDataApp:
         except Exception as e:
             messagebox.showerror("Lỗi", f"Không thể đọc file: {e}")
     
+    def select_sheet(self, name):
+        """Chuyển sang sheet khác của file Excel đang mở (chờ nếu sheet còn đang được đọc ở luồng nền)"""
+        if self.loader is not None or name == self.data_handler.sheet_name:
+            return
+        if not self.data_handler.sheet_ready(name):
+            self.ui.update_status_label(f"Đang đọc sheet: {name}...", "blue")
+            self.root.after(100, lambda: self.select_sheet(name))
+            return
+        
+        try:
+            # Ghi nốt dữ liệu của sheet đang mở trước khi chuyển sheet
+            self.autosaver.flush()
+            self.data_handler.select_sheet(name)
+        except Exception as e:
+            self.ui.set_sheets(self.data_handler.sheet_names, self.data_handler.sheet_name)
+            messagebox.showerror("Lỗi", f"Không thể mở sheet '{name}': {e}")
+            return
+        
+        self._reset_view()
+        self.ui.update_status_label(self._open_status(self.data_handler.file_name), "green")
+        self.refresh_ui_structure()
+        self.refresh_table()
+    
+    def _reset_view(self):
+        """Bỏ bộ lọc và sắp xếp (khi dữ liệu đổi sang file / sheet khác)"""
+        self.active_filter = None
+        self.ui.clear_filter_input()
+        self.active_sort = []
+        self.ui.clear_sort()
+    
+    def _open_status(self, file_path):
+        """Nội dung label trạng thái sau khi mở file / chuyển sheet"""
+        status = f"Đang mở: {os.path.basename(file_path)}"
+        if len(self.data_handler.sheet_names) > 1:
+            status += f" [{self.data_handler.sheet_name}]"
+        return status + f" ({self.data_handler.row_count():,} dòng)"
+    
+    def on_autosave_done(self, filepath, error):
+        """Nhận kết quả lưu nền (được gọi trên luồng giao diện)"""
+        if error is None:
+            self.ui.update_status_label(f"Đã tự động lưu: {filepath}", "green")
+        else:
+            self.ui.update_status_label(f"Lỗi tự động lưu: {error}", "red")
+    
     def refresh_ui_structure(self):
         """Tạo lại cột bảng và ô nhập liệu dựa trên số cột của file"""
         columns = list(self.data_handler.df.columns)
@@ -92,25 +404,92 @@ class DynamicDataApp:
     
     def refresh_table(self):
         """Đổ dữ liệu từ DataFrame vào TreeView"""
-        self.ui.populate_tree(self.data_handler.df)
+        self.ui.populate_tree(self.data_handler.row_source(), self._view_ids())
+        self._refresh_charts()
+    
+    def apply_changes(self):
+        """Chỉ cập nhật các dòng vừa thay đổi lên bảng thay vì đổ lại toàn bộ"""
+        self.ui.apply_row_changes(self.data_handler.row_source(), self.data_handler.pop_changes(), self._view_ids())
+        self._refresh_charts()
+    
+    def _filtered_ids(self):
+        """Mã dòng thỏa bộ lọc đang áp dụng (None nếu không lọc)"""
+        if self.active_filter is None or self.data_handler.df.empty:
+            return None
+        column, text = self.active_filter
+        if column not in self.data_handler.df.columns:
+            self.active_filter = None
+            return None
+        return self.data_handler.filter_rows(column, text)
+    
+    def _view_ids(self, row_ids=None):
+        """Mã dòng hiển thị theo bộ lọc và thứ tự sắp xếp (None: mọi dòng theo thứ tự gốc)"""
+        if row_ids is None:
+            row_ids = self._filtered_ids()
+        if self.active_sort and not self.data_handler.df.empty:
+            return self.data_handler.sort_order(self.active_sort, row_ids)
+        return row_ids
+    
+    def apply_sort(self, sort_keys):
+        """Sắp xếp bảng theo các cột (chỉ đổi thứ tự hiển thị, DataFrame giữ nguyên)"""
+        if self.data_handler.df.empty or self.loader is not None:
+            if self._paged_unsupported("sắp xếp"):
+                self.ui.clear_sort()
+            return
+        self.active_sort = sort_keys
+        self.ui.populate_tree(self.data_handler.df, self._view_ids(), keep_selection=True)
+    
+    def apply_filter(self, column, text):
+        """Lọc bảng theo biểu thức trên một cột (dùng chỉ mục nếu cột có chỉ mục)"""
+        if self._paged_unsupported("lọc dữ liệu"):
+            return
+        if self.data_handler.df.empty or self.loader is not None:
+            return
+        if not text.strip():
+            self.clear_filter()
+            return
+        
+        try:
+            start = time.perf_counter()
+            row_ids = self.data_handler.filter_rows(column, text)
+            elapsed = time.perf_counter() - start
+        except ValueError as e:
+            messagebox.showerror("Lỗi lọc", f"Biểu thức lọc không hợp lệ: {e}")
+            return
+        
+        self.active_filter = (column, text)
+        self.ui.populate_tree(self.data_handler.df, self._view_ids(row_ids))
+        self.ui.set_filter_result(
+            f"{len(row_ids):,} / {len(self.data_handler.df):,} dòng ({elapsed * 1000:.1f} ms)"
+        )
+    
+    def clear_filter(self):
+        """Bỏ lọc, hiển thị lại toàn bộ bảng"""
+        self.active_filter = None
+        self.ui.clear_filter_input()
+        self.ui.set_filter_result("")
+        self.ui.populate_tree(self.data_handler.row_source(), self._view_ids(), keep_selection=True)
     
     def on_item_select(self, event):
         """Khi chọn dòng, điền dữ liệu vào các ô input"""
+        # Bảng đang hiển thị bản xem trước của file đang đọc
+        if self.loader is not None:
+            return
 
         # Kiểm tra xem có chọn dòng chưa
         index = self.ui.get_selected_item()
         if index is None:
             return
         
-        # Lấy dữ liệu từ DataFrame tại dòng đang chọn
-        row_data = self.data_handler.df.iloc[index]
+        # Lấy dữ liệu tại dòng đang chọn (index là mã dòng ổn định)
+        row_data = self.data_handler.get_row(index)
         
         # Điền vào các ô input
         self.ui.fill_entry_values(row_data)
     
     def add_data(self):
         """Thêm dữ liệu từ các ô input vào DataFrame"""
-        if self.data_handler.df.empty:
+        if not self.data_handler.row_count() or self.loader is not None:
             return
         
         try:
@@ -132,11 +511,11 @@ class DynamicDataApp:
             # Thêm vào cuối DataFrame
             self.data_handler.add_row(new_row)
             
-            # Lưu file vào thư mục data/
-            filepath = self.data_handler.save_file()
+            # Thao tác đã được ghi vào nhật ký, file dữ liệu sẽ được lưu nền
+            filepath = self._schedule_save()
             
             # Cập nhật bảng
-            self.refresh_table()
+            self.apply_changes()
             messagebox.showinfo("Thành công", f"Đã thêm dòng mới và lưu vào {filepath}")
             
         except Exception as e:
@@ -144,6 +523,8 @@ class DynamicDataApp:
     
     def update_data(self):
         """Cập nhật dòng đang chọn"""
+        if self.loader is not None:
+            return
         index = self.ui.get_selected_item()
         
         # Kiểm tra xem đã chọn dòng chưa
@@ -169,11 +550,11 @@ class DynamicDataApp:
             # Cập nhật vào DataFrame
             self.data_handler.update_row(index, temp_row)
             
-            # Lưu file vào thư mục data/
-            filepath = self.data_handler.save_file()
+            # Thao tác đã được ghi vào nhật ký, file dữ liệu sẽ được lưu nền
+            filepath = self._schedule_save()
             
             # Cập nhật bảng
-            self.refresh_table()
+            self.apply_changes()
             messagebox.showinfo("Thành công", f"Đã cập nhật và lưu vào {filepath}")
             
         except Exception as e:
@@ -181,6 +562,8 @@ class DynamicDataApp:
     
     def delete_data(self):
         """Xóa dòng đang chọn"""
+        if self.loader is not None:
+            return
         index = self.ui.get_selected_item()
         
         # Kiểm tra xem đã chọn dòng chưa
@@ -197,31 +580,88 @@ class DynamicDataApp:
             # Xóa khỏi DataFrame
             self.data_handler.delete_row(index)
             
-            # Lưu file vào thư mục data/
-            filepath = self.data_handler.save_file()
+            # Thao tác đã được ghi vào nhật ký, file dữ liệu sẽ được lưu nền
+            filepath = self._schedule_save()
             
             # Cập nhật bảng
-            self.refresh_table()
+            self.apply_changes()
             messagebox.showinfo("Thành công", f"Đã xóa dòng và lưu vào {filepath}")
             
         except Exception as e:
             messagebox.showerror("Lỗi", str(e))
     
+    def _schedule_save(self):
+        """
+        Hẹn lưu nền sau một thao tác trên dòng.
+        Trả về: file đang giữ thay đổi (file dữ liệu, hoặc nhật ký lớp phủ ở chế độ phân trang:
+        ghi lại cả file lớn sau mỗi lần sửa là quá đắt, việc gộp được hỏi khi đóng ứng dụng)
+        """
+        if self.data_handler.paged is not None:
+            return self.data_handler.paged.journal.path
+        self.autosaver.schedule()
+        return self.data_handler.save_path()
+    
     def clean_data(self):
         """Làm sạch dữ liệu"""
+        if self.loader is not None or self._paged_unsupported("làm sạch dữ liệu"):
+            return
         try:
-            # Gọi hàm clean từ DataHandler (đã tự động lưu file)
-            self.data_handler.clean_data()
+            # Gọi hàm clean từ DataHandler, việc lưu file do lưu nền đảm nhận
+            report = self.data_handler.clean_data(persist=False)
+            self.autosaver.schedule()
             
             filename = self.data_handler.file_name
 
             # Cập nhật bảng
             self.refresh_table()
-            messagebox.showinfo("Thành công", f"Đã làm sạch dữ liệu và lưu vào {filename}")
+            messagebox.showinfo(
+                "Thành công",
+                f"Đã làm sạch dữ liệu ({report.summary()}) và lưu vào {filename}"
+            )
             
         except Exception as e:
             messagebox.showerror("Lỗi", str(e))
     
+    def undo(self):
+        """Hoàn tác thao tác gần nhất (Ctrl+Z)"""
+        self._history_step(self.data_handler.undo, "Đã hoàn tác", "Không còn thao tác để hoàn tác")
+    
+    def redo(self):
+        """Làm lại thao tác vừa hoàn tác (Ctrl+Y)"""
+        self._history_step(self.data_handler.redo, "Đã làm lại", "Không còn thao tác để làm lại")
+    
+    def _history_step(self, step, done_text, empty_text):
+        """Thực hiện một bước Hoàn tác/Làm lại rồi cập nhật bảng"""
+        if self._paged_unsupported("hoàn tác / làm lại"):
+            return
+        if self.loader is not None:
+            return
+        try:
+            description = step()
+        except Exception as e:
+            messagebox.showerror("Lỗi", str(e))
+            return
+        
+        if description is None:
+            self.ui.update_status_label(empty_text, "red")
+            return
+        
+        # Thao tác ngược đã được ghi vào nhật ký, file dữ liệu sẽ được lưu nền
+        self.autosaver.schedule()
+        
+        # Dòng khôi phục có thể nằm giữa bảng -> đổ lại cửa sổ hiển thị
+        self.data_handler.pop_changes()
+        self.refresh_table()
+        self.ui.update_status_label(f"{done_text}: {description}", "green")
+    
     def show_visualization_popup(self):
         """Hiển thị popup vẽ biểu đồ"""
-        self.visualizer.show_visualization_popup(self.data_handler.df)
\ No newline at end of file
+        if self._paged_unsupported("vẽ biểu đồ"):
+            return
+        self.visualizer.show_visualization_popup(self.data_handler)
+    
+    def show_summary(self):
+        """Hiển thị bảng thống kê mô tả các cột số"""
+        if self._paged_unsupported("thống kê mô tả"):
+            return
+        self.summary_panel.show(self.data_handler)
\ No newline at end of file
@@ -0,0 +1,58 @@
+"""
+Module Atomic - Ghi file nguyên tử
+Nội dung được ghi vào file tạm cùng thư mục rồi os.replace sang file đích, nên file đích không bao giờ
+bị ghi dở. File tạm của tempfile.mkstemp luôn có quyền 0600 và os.replace giữ nguyên quyền đó, vì vậy
+trước khi đổi tên file tạm được đặt lại quyền như file đích cũ (hoặc quyền mặc định theo umask khi
+file đích chưa có), để lần lưu không biến file dữ liệu thành file riêng của chủ sở hữu.
+"""
+
+import contextlib
+import os
+import shutil
+import tempfile
+
+
+def _umask():
+    """
+    umask hiện tại của tiến trình. Đọc từ /proc nếu có: os.umask() phải đổi umask rồi đặt lại,
+    không an toàn khi luồng khác đang tạo file (VD: lưu nền, đọc file nền).
+    """
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("Umask:"):
+                    return int(line.split()[1], 8)
+    except (OSError, ValueError):
+        pass
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+def _apply_mode(tmp_path, filepath):
+    """Quyền của file tạm: như file đích cũ, hoặc 0666 & ~umask như khi tạo file bằng open()"""
+    if os.path.exists(filepath):
+        shutil.copymode(filepath, tmp_path)
+    else:
+        os.chmod(tmp_path, 0o666 & ~_umask())
+
+
+@contextlib.contextmanager
+def atomic_write(filepath, suffix=None):
+    """
+    Trả về đường dẫn file tạm để ghi; khối lệnh chạy xong không lỗi thì file tạm được đặt quyền
+    và đổi tên thành filepath, có lỗi thì file tạm bị xóa và file đích giữ nguyên.
+    suffix: đuôi file tạm (mặc định như filepath, để thư viện ghi file nhận đúng định dạng)
+    """
+    directory, name = os.path.split(filepath)
+    if suffix is None:
+        suffix = os.path.splitext(name)[1]
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{name}.", suffix=suffix, dir=directory or ".")
+    os.close(fd)
+    try:
+        yield tmp_path
+        _apply_mode(tmp_path, filepath)
+        os.replace(tmp_path, filepath)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
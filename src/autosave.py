@@ -0,0 +1,109 @@
+"""
+Module AutoSave - Tự động lưu nền
+Gom nhiều lần chỉnh sửa liên tiếp thành một lần ghi file, chạy ở luồng nền
+và báo kết quả về luồng giao diện qua hàng đợi sự kiện của Tk
+"""
+
+import queue
+import threading
+
+
+class AutoSaver:
+    """Lưu file dữ liệu ở luồng nền sau một khoảng thời gian không có chỉnh sửa"""
+
+    # Thời gian chờ kể từ lần sửa cuối trước khi ghi file (ms)
+    DEFAULT_DELAY_MS = 2000
+
+    # Chu kỳ kiểm tra kết quả từ luồng nền (ms)
+    POLL_MS = 100
+
+    def __init__(self, root, data_handler, on_done, delay_ms=DEFAULT_DELAY_MS):
+        """
+        on_done(filepath, error): được gọi trên luồng giao diện sau mỗi lần ghi,
+        error là None nếu thành công.
+        """
+        self.root = root
+        self.data_handler = data_handler
+        self.on_done = on_done
+        self.delay_ms = delay_ms
+
+        self._after_id = None      # Lịch ghi đang chờ
+        self._worker = None        # Luồng đang ghi file
+        self._dirty = False        # Có chỉnh sửa chưa được ghi
+        self._results = queue.Queue()
+
+    def schedule(self, delay_ms=None):
+        """Báo có chỉnh sửa mới: hoãn lần ghi tới sau khoảng chờ (debounce)"""
+        self._dirty = True
+        if delay_ms is None:
+            # Nhật ký quá lớn / vừa hoàn tác làm sạch -> ghi ngay để gộp
+            delay_ms = 0 if self.data_handler.needs_compaction() else self.delay_ms
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+        self._after_id = self.root.after(delay_ms, self._start)
+
+    def _start(self):
+        """Chụp dữ liệu và giao cho luồng nền ghi"""
+        self._after_id = None
+        if self._worker is not None:
+            # Đang ghi dở -> ghi tiếp sau khi xong (xem _handle_result)
+            return
+        if not self._dirty:
+            return
+        self._dirty = False
+
+        df, filepath, mark = self.data_handler.snapshot_for_save()
+        self._worker = threading.Thread(
+            target=self._run, args=(df, filepath, mark), daemon=True
+        )
+        self._worker.start()
+        self.root.after(self.POLL_MS, self._poll)
+
+    def _run(self, df, filepath, mark):
+        """Chạy ở luồng nền: chỉ ghi file, không chạm vào Tk"""
+        try:
+            self.data_handler.write_frame(df, filepath)
+            self._results.put((filepath, mark, None))
+        except Exception as e:
+            self._results.put((filepath, mark, e))
+
+    def _poll(self):
+        """Kiểm tra kết quả từ luồng nền trên luồng giao diện"""
+        if self._worker is None:
+            return  # Kết quả đã được xử lý trong wait()
+        try:
+            result = self._results.get_nowait()
+        except queue.Empty:
+            self.root.after(self.POLL_MS, self._poll)
+            return
+        self._handle_result(*result)
+
+    def _handle_result(self, filepath, mark, error):
+        """Xử lý kết quả một lần ghi"""
+        self._worker = None
+        if error is None:
+            self.data_handler.finish_save(filepath, mark)
+        else:
+            # Ghi lỗi -> lần sau thử lại
+            self._dirty = True
+        self.on_done(filepath, error)
+
+        # Có chỉnh sửa trong lúc đang ghi -> lên lịch ghi tiếp
+        if self._dirty and error is None and self._after_id is None:
+            self.schedule()
+
+    def wait(self):
+        """Chờ lần ghi đang chạy (nếu có) hoàn tất, dùng trước khi ghi đồng bộ"""
+        if self._worker is None:
+            return
+        self._worker.join()
+        self._handle_result(*self._results.get())
+
+    def flush(self):
+        """Hủy lịch chờ, đợi luồng nền và gộp mọi chỉnh sửa còn lại (khi đóng ứng dụng)"""
+        self.wait()
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        self._dirty = False
+        self.data_handler.close()
@@ -0,0 +1,238 @@
+"""
+Module Batch - Làm sạch hàng loạt file bằng nhiều tiến trình
+Mỗi file được xử lý độc lập (load -> clean -> save) trong một tiến trình con của pool,
+lỗi của một file không ảnh hưởng các file khác. Kết quả từng file được ghi vào
+manifest.json trong thư mục ra. File có bản kết quả mới hơn file nguồn sẽ được bỏ qua.
+
+File CSV lớn (từ DataHandler.PAGED_MIN_BYTES) hoặc mọi file CSV khi có --stream được làm sạch
+theo khối (xem module stream_clean) để tiến trình con không phải nạp cả file vào bộ nhớ.
+
+Cách dùng:
+    python main.py --batch original_data -o data/batch
+    python -m src.batch "drops/*.csv" -o data/batch --workers 4
+"""
+
+import argparse
+import concurrent.futures
+import glob
+import json
+import os
+import sys
+import time
+
+from .atomic import atomic_write
+from .data_handler import DataHandler
+
+
+# Đuôi file được nhận khi đầu vào là thư mục
+INPUT_EXTENSIONS = ('.csv', '.xlsx', '.xls')
+
+# Tên file tổng kết trong thư mục ra
+MANIFEST_NAME = "manifest.json"
+
+
+def expand_inputs(patterns):
+    """Danh sách file (đã sắp xếp, không trùng) từ các thư mục hoặc mẫu glob"""
+    files = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = [os.path.join(pattern, name) for name in os.listdir(pattern)]
+        else:
+            matches = glob.glob(pattern)
+        files.extend(path for path in matches
+                     if os.path.isfile(path) and path.lower().endswith(INPUT_EXTENSIONS))
+    return sorted(set(os.path.abspath(path) for path in files))
+
+
+def output_for(source, out_dir):
+    """Đường dẫn file kết quả của file nguồn (cùng quy tắc đặt tên với DataHandler.save_file)"""
+    return DataHandler.output_path(out_dir, os.path.basename(source))[0]
+
+
+def is_up_to_date(source, output):
+    """File kết quả đã tồn tại và không cũ hơn file nguồn"""
+    try:
+        return os.stat(output).st_mtime_ns >= os.stat(source).st_mtime_ns
+    except OSError:
+        return False
+
+
+def should_stream(source, stream=False):
+    """File được làm sạch theo khối: bật --stream hoặc file CSV lớn (chỉ CSV đọc được theo khối)"""
+    if not source.lower().endswith('.csv'):
+        return False
+    return stream or os.path.getsize(source) >= DataHandler.PAGED_MIN_BYTES
+
+
+def clean_file(source, out_dir, stream=False):
+    """
+    Xử lý một file trong tiến trình con: load -> clean -> save (stream=True: làm sạch theo khối).
+    Không ném lỗi ra ngoài: lỗi được trả về trong kết quả để các file khác vẫn chạy tiếp.
+    Trả về: dict kết quả của file (status, rows_in, rows_out, duration, error...)
+    """
+    start = time.perf_counter()
+    result = {"source": source, "output": output_for(source, out_dir),
+              "status": "ok", "rows_in": None, "rows_out": None, "error": None}
+    try:
+        if stream:
+            from .stream_clean import StreamCleaner
+            report = StreamCleaner().clean(source, result["output"])
+            result["rows_in"] = report.rows_before
+            result["rows_out"] = report.rows_after
+        else:
+            # Không dùng bộ nhớ đệm: mỗi file chỉ đọc một lần, đệm chỉ tốn đĩa
+            data_handler = DataHandler(data_dir=out_dir, use_cache=False)
+            data_handler.load_file(source)
+            result["rows_in"] = len(data_handler.df)
+            report = data_handler.clean_data(persist=True)
+            result["rows_out"] = report.rows_after
+            data_handler.close()
+    except Exception as e:
+        result["status"] = "failed"
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["duration"] = round(time.perf_counter() - start, 4)
+    return result
+
+
+def _failed(source, output, error):
+    """Kết quả của file lỗi trước khi kịp chạy"""
+    return {"source": source, "output": output, "status": "failed",
+            "rows_in": None, "rows_out": None, "error": error, "duration": 0.0}
+
+
+def _run_pool(sources, out_dir, workers, collect, stream=False):
+    """Chạy clean_file cho các file trong pool, tối đa 2 x workers file chờ cùng lúc"""
+    max_in_flight = 2 * workers
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight = {}
+        queue = iter(sources)
+        while True:
+            # Nạp thêm việc cho tới giới hạn
+            for source in queue:
+                in_flight[executor.submit(clean_file, source, out_dir, should_stream(source, stream))] = source
+                if len(in_flight) >= max_in_flight:
+                    break
+            if not in_flight:
+                break
+
+            done, _ = concurrent.futures.wait(in_flight, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                source = in_flight.pop(future)
+                try:
+                    collect(future.result())
+                except Exception as e:
+                    # Tiến trình con chết bất thường (hết bộ nhớ, bị kill...)
+                    collect(_failed(source, output_for(source, out_dir), f"{type(e).__name__}: {e}"))
+
+
+def write_manifest(manifest, out_dir):
+    """Ghi manifest.json một cách nguyên tử (xem module atomic)"""
+    path = os.path.join(out_dir, MANIFEST_NAME)
+    with atomic_write(path, suffix=".tmp") as tmp_path:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def run_batch(sources, out_dir, workers=None, force=False, on_result=None, stream=False):
+    """
+    Làm sạch các file nguồn song song trong một ProcessPoolExecutor.
+    Số file đang chờ trong pool được giới hạn (2 x số tiến trình) để không nạp sẵn cả danh sách.
+    force=True: xử lý lại cả những file đã có kết quả mới.
+    stream=True: làm sạch mọi file CSV theo khối (mặc định chỉ file CSV lớn).
+    on_result(kết quả): gọi sau mỗi file (kể cả file bỏ qua), ví dụ để in tiến độ.
+    Trả về: manifest (dict), đồng thời được ghi vào out_dir/manifest.json
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    out_dir = os.path.abspath(out_dir)
+    workers = workers or os.cpu_count() or 1
+    started_at = time.strftime("%Y-%m-%dT%H:%M:%S")
+    start = time.perf_counter()
+    results = []
+
+    def collect(result):
+        results.append(result)
+        if on_result is not None:
+            on_result(result)
+
+    # Chọn file cần chạy: bỏ qua file đã có kết quả mới, file ghi đè lên chính nó hoặc trùng tên ra
+    pending = []
+    outputs = set()
+    for source in sources:
+        output = output_for(source, out_dir)
+        if os.path.abspath(output) == os.path.abspath(source):
+            collect(_failed(source, output, "File kết quả trùng file nguồn, hãy chọn thư mục ra khác"))
+        elif output in outputs:
+            collect(_failed(source, output, "Trùng tên file kết quả với một file khác trong lô"))
+        elif not force and is_up_to_date(source, output):
+            outputs.add(output)
+            collect({"source": source, "output": output, "status": "skipped",
+                     "rows_in": None, "rows_out": None, "error": None, "duration": 0.0})
+        else:
+            outputs.add(output)
+            pending.append(source)
+
+    if pending:
+        _run_pool(pending, out_dir, min(workers, len(pending)), collect, stream)
+
+    results.sort(key=lambda r: r["source"])
+    totals = {status: sum(1 for r in results if r["status"] == status)
+              for status in ("ok", "skipped", "failed")}
+    totals["rows_in"] = sum(r["rows_in"] or 0 for r in results)
+    totals["rows_out"] = sum(r["rows_out"] or 0 for r in results)
+    manifest = {
+        "out_dir": out_dir,
+        "workers": workers,
+        "started_at": started_at,
+        "duration": round(time.perf_counter() - start, 4),
+        "totals": totals,
+        "files": results,
+    }
+    write_manifest(manifest, out_dir)
+    return manifest
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Làm sạch hàng loạt file CSV/Excel định dạng Titanic bằng nhiều tiến trình"
+    )
+    parser.add_argument("inputs", nargs="+", help="Thư mục hoặc mẫu glob (ví dụ 'drops/*.csv')")
+    parser.add_argument("-o", "--out-dir", default=os.path.join("data", "batch"),
+                        help="Thư mục ghi kết quả và manifest.json (mặc định: data/batch)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Số tiến trình chạy song song (mặc định: số lõi CPU)")
+    parser.add_argument("--force", action="store_true", help="Xử lý lại cả file đã có kết quả mới")
+    parser.add_argument("--stream", action="store_true",
+                        help="Làm sạch mọi file CSV theo khối (mặc định chỉ file CSV lớn)")
+    return parser
+
+
+def main(argv=None):
+    """Chạy làm sạch hàng loạt, trả về mã thoát (0: không có file lỗi)"""
+    args = build_parser().parse_args(argv)
+    sources = expand_inputs(args.inputs)
+    if not sources:
+        print("Lỗi: không tìm thấy file CSV/Excel nào", file=sys.stderr)
+        return 2
+
+    def report(result):
+        name = os.path.basename(result["source"])
+        if result["status"] == "ok":
+            print(f"[ok] {name}: {result['rows_in']:,} -> {result['rows_out']:,} dòng "
+                  f"({result['duration'] * 1000:.0f} ms)")
+        elif result["status"] == "skipped":
+            print(f"[bỏ qua] {name}: kết quả đã mới nhất")
+        else:
+            print(f"[lỗi] {name}: {result['error']}", file=sys.stderr)
+
+    manifest = run_batch(sources, args.out_dir, workers=args.workers, force=args.force, on_result=report,
+                         stream=args.stream)
+    totals = manifest["totals"]
+    print(f"Xong {len(manifest['files'])} file trong {manifest['duration']:.2f} s: "
+          f"{totals['ok']} thành công, {totals['skipped']} bỏ qua, {totals['failed']} lỗi")
+    print(f"Manifest: {os.path.join(manifest['out_dir'], MANIFEST_NAME)}")
+    return 1 if totals["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
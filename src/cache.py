@@ -0,0 +1,194 @@
+"""
+Module Cache - Bộ nhớ đệm dạng cột nhị phân
+Lưu DataFrame đã đọc từ CSV/Excel ra file Feather (Arrow) trong thư mục data
+để lần mở sau không phải phân tích lại file gốc
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401  (Feather cần pyarrow)
+    HAS_ARROW = True
+except ImportError:
+    HAS_ARROW = False
+
+
+class FrameCache:
+    """
+    Bộ nhớ đệm DataFrame theo file nguồn.
+    Khóa gồm đường dẫn, kích thước, thời điểm sửa và mã băm nội dung của file nguồn;
+    tổng dung lượng bị giới hạn, vượt quá thì xóa mục lâu nhất chưa dùng (LRU).
+    """
+
+    # Dung lượng tối đa của bộ nhớ đệm (byte)
+    DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+    INDEX_NAME = "index.json"
+
+    def __init__(self, cache_dir, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        # Feather giữ nguyên kiểu dữ liệu và đọc theo cột; không có pyarrow thì dùng pickle
+        self.extension = ".feather" if HAS_ARROW else ".pkl"
+        self._lock = threading.Lock()
+
+        if not os.path.exists(self.cache_dir):
+            os.makedirs(self.cache_dir)
+
+    @staticmethod
+    def hash_file(file_path, block_size=1024 * 1024):
+        """Mã băm nội dung file (đọc theo khối để không tốn bộ nhớ)"""
+        digest = hashlib.blake2b(digest_size=16)
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(block_size), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _key(file_path, part=None):
+        """Khóa trong chỉ mục: đường dẫn tuyệt đối, thêm #part cho một phần của file (VD: sheet Excel)"""
+        key = os.path.abspath(file_path)
+        return key if part is None else f"{key}#{part}"
+
+    def load(self, file_path, part=None):
+        """
+        Lấy DataFrame đã lưu của file_path (part: phần của file, VD: tên sheet),
+        None nếu chưa có hoặc file nguồn đã đổi
+        """
+        key = self._key(file_path, part)
+        with self._lock:
+            index = self._read_index()
+            entry = index.get(key)
+            if entry is None:
+                return None
+
+            stat = os.stat(file_path)
+            if stat.st_size != entry["size"]:
+                self._remove(index, key)
+                self._write_index(index)
+                return None
+            if stat.st_mtime_ns != entry["mtime_ns"]:
+                # Thời điểm sửa đổi nhưng nội dung có thể vẫn như cũ (VD: copy lại file)
+                if self.hash_file(file_path) != entry["hash"]:
+                    self._remove(index, key)
+                    self._write_index(index)
+                    return None
+                entry["mtime_ns"] = stat.st_mtime_ns
+
+            try:
+                df = self._read_frame(os.path.join(self.cache_dir, entry["file"]))
+            except Exception:
+                # File đệm hỏng -> bỏ đi, đọc lại file nguồn
+                self._remove(index, key)
+                self._write_index(index)
+                return None
+
+            entry["last_used"] = time.time()
+            self._write_index(index)
+            return df
+
+    def store(self, file_path, df, part=None):
+        """Lưu DataFrame của file_path / phần part (bỏ qua nếu đã có bản khớp với file nguồn)"""
+        key = self._key(file_path, part)
+        stat = os.stat(file_path)
+        with self._lock:
+            index = self._read_index()
+            entry = index.get(key)
+            if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+                return
+
+            content_hash = self.hash_file(file_path)
+            stem = hashlib.sha1(
+                f"{key}|{stat.st_size}|{stat.st_mtime_ns}|{content_hash}".encode("utf-8")
+            ).hexdigest()
+            try:
+                name = self._write_frame(df, stem)
+            except Exception as e:
+                print(f"Không thể lưu bộ nhớ đệm: {e}")
+                return
+            path = os.path.join(self.cache_dir, name)
+
+            if entry is not None:
+                self._remove(index, key)
+            index[key] = {
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "hash": content_hash,
+                "file": name,
+                "bytes": os.path.getsize(path),
+                "last_used": time.time(),
+            }
+            self._evict(index)
+            self._write_index(index)
+
+    def _evict(self, index):
+        """Xóa các mục lâu nhất chưa dùng cho tới khi tổng dung lượng nằm trong giới hạn"""
+        total = sum(entry["bytes"] for entry in index.values())
+        for key in sorted(index, key=lambda k: index[k]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            total -= index[key]["bytes"]
+            self._remove(index, key)
+
+    def _remove(self, index, key):
+        """Xóa một mục khỏi chỉ mục và xóa file đệm của nó"""
+        entry = index.pop(key, None)
+        if entry is None:
+            return
+        path = os.path.join(self.cache_dir, entry["file"])
+        if os.path.exists(path):
+            os.remove(path)
+
+    def _read_frame(self, path):
+        """Đọc file đệm"""
+        if path.endswith(".feather"):
+            return pd.read_feather(path)
+        return pd.read_pickle(path)
+
+    def _write_frame(self, df, stem):
+        """
+        Ghi file đệm (qua file tạm rồi đổi tên), trả về tên file đã ghi.
+        Cột object lẫn nhiều kiểu (VD: Ticket vừa số vừa chuỗi trong Excel)
+        không ghi được ra Arrow -> dùng pickle cho file đó.
+        """
+        df = df.reset_index(drop=True)
+        extensions = [self.extension] if self.extension == ".pkl" else [self.extension, ".pkl"]
+        for i, extension in enumerate(extensions):
+            path = os.path.join(self.cache_dir, stem + extension)
+            tmp_path = path + ".tmp"
+            try:
+                if extension == ".feather":
+                    df.to_feather(tmp_path)
+                else:
+                    df.to_pickle(tmp_path, compression=None)
+                os.replace(tmp_path, path)
+                return stem + extension
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                if i == len(extensions) - 1:
+                    raise
+
+    def _index_path(self):
+        return os.path.join(self.cache_dir, self.INDEX_NAME)
+
+    def _read_index(self):
+        """Đọc chỉ mục bộ nhớ đệm (rỗng nếu chưa có hoặc bị hỏng)"""
+        try:
+            with open(self._index_path(), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_index(self, index):
+        """Ghi chỉ mục một cách nguyên tử"""
+        tmp_path = self._index_path() + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+        os.replace(tmp_path, self._index_path())
@@ -0,0 +1,161 @@
+"""
+Module Charts - Vẽ biểu đồ từ số liệu tổng hợp
+Chỉ dùng matplotlib.figure (không dùng pyplot, không phụ thuộc tkinter),
+nên dùng được cho cả canvas nhúng trong Tk lẫn chế độ chạy không giao diện
+"""
+
+import numpy as np
+
+
+# Danh sách các loại biểu đồ (nhãn hiển thị, mã)
+CHARTS = [
+    ("Sống sót vs Thiệt mạng", "survived"),
+    ("Tỉ lệ Nam / Nữ", "sex"),
+    ("Phân bố độ tuổi", "age"),
+    ("Giá vé (Boxplot)", "fare"),
+    ("Sống sót theo Giới tính", "sex_survived"),
+    ("Sống sót theo hạng vé", "survived_pclass"),
+    ("Mật độ tuổi theo Sống sót", "age_kde"),
+    ("Ma trận tương quan", "corr"),
+]
+
+# Bảng màu (tương ứng pastel / Set2 / crest của seaborn)
+PASTEL = ['#a1c9f4', '#ffb482', '#8de5a1', '#ff9f9b']
+SET2 = ['#66c2a5', '#fc8d62', '#8da0cb', '#e78ac3']
+CREST = ['#6aa8a0', '#2d5f8a', '#3a8a9c', '#24416f']
+
+
+def _grouped_bars(ax, table, colors):
+    """Biểu đồ cột nhóm từ bảng đếm (dòng: nhóm trên trục x, cột: màu)"""
+    n_groups, n_series = table.shape
+    width = 0.8 / max(1, n_series)
+    x = np.arange(n_groups)
+    for i, col in enumerate(table.columns):
+        ax.bar(x + (i - (n_series - 1) / 2) * width, table[col].to_numpy(), width,
+               color=colors[i % len(colors)], label=str(col))
+    ax.set_xticks(x)
+    ax.set_xticklabels([str(v) for v in table.index])
+    ax.set_xlabel(str(table.index.name))
+    ax.set_ylabel('count')
+
+
+def draw_survived(ax, counts):
+    """1. Biểu đồ Cột: Số lượng Sống sót vs Thiệt mạng"""
+    ax.bar([str(v) for v in counts.index], counts.to_numpy(), color=PASTEL[:len(counts)])
+    ax.set_title('Số lượng Sống sót (1) vs Thiệt mạng (0)')
+    ax.set_xlabel('Survived')
+    ax.set_ylabel('Số lượng')
+
+
+def draw_sex(ax, counts):
+    """2. Biểu đồ Tròn: Tỉ lệ Nam/Nữ"""
+    ax.pie(counts.to_numpy(), labels=[str(v) for v in counts.index], autopct='%1.1f%%',
+           colors=['skyblue', 'pink'])
+    ax.set_aspect('equal')
+    ax.set_title('Tỉ lệ Nam / Nữ')
+
+
+def draw_age(ax, hist):
+    """3. Biểu đồ Histogram: Phân bố độ tuổi"""
+    edges = hist["edges"]
+    ax.bar(edges[:-1], hist["counts"], width=np.diff(edges), align='edge',
+           color='green', alpha=0.5, edgecolor='white')
+    ax.plot(hist["kde_x"], hist["kde_y"], color='green')
+    ax.set_title('Phân bố độ tuổi hành khách')
+    ax.set_xlabel('Age')
+    ax.set_ylabel('Count')
+
+
+def draw_fare(ax, stats):
+    """4. Biểu đồ Hộp: Kiểm tra ngoại lai giá vé"""
+    ax.bxp([stats], vert=False, showfliers=True, patch_artist=True,
+           boxprops={'facecolor': 'orange'})
+    ax.set_yticks([])
+    ax.set_xlabel('Fare')
+    ax.set_title('Biểu đồ hộp (Boxplot) Giá vé')
+
+
+def draw_sex_survived(ax, table):
+    """5. Biểu đồ Cột nhóm: Tỉ lệ sống sót theo Giới tính"""
+    _grouped_bars(ax, table, PASTEL)
+    ax.legend(title='Survived')
+    ax.set_title('Tỉ lệ sống sót theo Giới tính')
+
+
+def draw_pclass_survived(ax, table):
+    """6. Biểu đồ Cột nhóm: So sánh Sống/Chết Hạng 1 vs Hạng 3"""
+    _grouped_bars(ax, table, SET2)
+    ax.legend(title='Trạng thái', labels=['Thiệt mạng (0)', 'Sống sót (1)'])
+    ax.set_title('So sánh tỉ lệ Sống sót: Hạng Nhất (1) vs Hạng Ba (3)')
+
+
+def draw_age_kde(ax, kde):
+    """7. Biểu đồ Mật độ (KDE): So sánh phân phối Tuổi (Sống vs Chết)"""
+    # Tô màu vùng dưới đường cong
+    for color, (key, density) in zip(CREST, kde["curves"].items()):
+        ax.fill_between(kde["x"], density, color=color, alpha=0.25)
+        ax.plot(kde["x"], density, color=color, label=str(key))
+    ax.legend(title='Survived')
+    ax.set_title('Phân phối Độ tuổi: Nhóm Sống sót vs Thiệt mạng')
+    ax.set_xlabel('Tuổi')
+    ax.set_ylabel('Mật độ')
+    # Chú thích thêm: Đỉnh nhỏ ở đoạn 0-10 tuổi của nhóm Sống (trẻ em được ưu tiên)
+
+
+def draw_correlation(ax, corr, cax):
+    """8. Biểu đồ Nhiệt: Tương quan giữa các biến số"""
+    image = ax.imshow(corr.to_numpy(), cmap='coolwarm', vmin=-1, vmax=1, aspect='auto')
+    labels = [str(c) for c in corr.columns]
+    ax.set_xticks(range(len(labels)))
+    ax.set_xticklabels(labels, rotation=45, ha='right')
+    ax.set_yticks(range(len(labels)))
+    ax.set_yticklabels(labels)
+    for i in range(len(labels)):
+        for j in range(len(labels)):
+            value = corr.iat[i, j]
+            if not np.isnan(value):
+                ax.text(j, i, f"{value:.2f}", ha='center', va='center', fontsize=8)
+    ax.figure.colorbar(image, cax=cax)
+    ax.set_title('Biểu đồ nhiệt tương quan (Correlation Heatmap)')
+
+
+DRAW_FUNCTIONS = {
+    "survived": draw_survived,
+    "sex": draw_sex,
+    "age": draw_age,
+    "fare": draw_fare,
+    "sex_survived": draw_sex_survived,
+    "survived_pclass": draw_pclass_survived,
+    "age_kde": draw_age_kde,
+}
+
+
+class ChartRenderer:
+    """
+    Vẽ các biểu đồ lên một Figure dùng lại nhiều lần.
+    Figure và các Axes được tạo một lần; mỗi lần vẽ chỉ xóa và vẽ lại các đối tượng trên Axes.
+    """
+
+    def __init__(self, figure):
+        self.figure = figure
+        # Axes chính và Axes cho thanh màu (chỉ hiện với biểu đồ nhiệt)
+        self.ax = figure.add_axes([0.1, 0.12, 0.75, 0.78])
+        self.cax = figure.add_axes([0.88, 0.12, 0.03, 0.78])
+        self.cax.set_visible(False)
+
+    def render(self, chart_type, aggregate):
+        """Vẽ biểu đồ chart_type từ số liệu đã tổng hợp"""
+        self.ax.clear()
+        self.cax.clear()
+        self.ax.set_aspect('auto')
+        self.cax.set_visible(chart_type == "corr")
+        self.ax.set_position([0.1, 0.12, 0.75, 0.78] if chart_type == "corr" else [0.1, 0.12, 0.85, 0.78])
+
+        if aggregate is None or len(aggregate) == 0:
+            self.ax.set_title('Không có dữ liệu để vẽ')
+            return
+
+        if chart_type == "corr":
+            draw_correlation(self.ax, aggregate, self.cax)
+        else:
+            DRAW_FUNCTIONS[chart_type](self.ax, aggregate)
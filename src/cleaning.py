@@ -0,0 +1,201 @@
+"""
+Module Cleaning - Làm sạch dữ liệu
+Kế hoạch làm sạch gồm: tính trước các giá trị thống kê (trung vị, giá trị phổ biến nhất),
+rồi xử lý từng cột một lần, không sao chép toàn bộ bảng
+"""
+
+import numpy as np
+import pandas as pd
+
+
+# Các cột khóa: thiếu giá trị -> xóa dòng
+KEY_COLUMNS = ['PassengerId', 'Survived']
+
+# Danh sách các cột số nguyên (Int) cần điền 0
+ZERO_FILL_COLUMNS = ['SibSp', 'Parch']
+
+# Danh sách các cột cần điền giá trị trung vị (Hàm median tự động bỏ qua NaN)
+MEDIAN_COLUMNS = ['Age', 'Fare']
+
+# Danh sách các cột điền giá trị phổ biến nhất
+MODE_COLUMNS = ['Pclass', 'Embarked']
+
+# Danh sách cột chuỗi có thể thiếu dữ liệu -> điền "no_info"
+STRING_COLUMNS = ['Name', 'Sex', 'Cabin', 'Embarked', 'Ticket']
+
+# Danh sách các cột số lượng bắt buộc phải dương
+POSITIVE_COLUMNS = ['Fare', 'SibSp', 'Parch']
+
+MISSING_TEXT = "no_info"
+
+
+class CleaningReport:
+    """Thống kê một lần làm sạch: số dòng bị xóa, số ô được điền/sửa theo từng cột"""
+
+    def __init__(self, rows_before):
+        self.rows_before = rows_before
+        self.rows_after = rows_before
+        self.dropped_missing_key = 0   # Dòng thiếu PassengerId/Survived
+        self.dropped_duplicates = 0    # Dòng trùng PassengerId
+        self.filled = {}               # {cột: số ô trống được điền}
+        self.fixed_negative = {}       # {cột: số ô âm được lấy trị tuyệt đối}
+        self.estimated = {}            # {cột: sai số tối đa (tỉ lệ) của giá trị điền ước lượng khi làm sạch theo luồng}
+
+    def merge(self, other):
+        """Cộng dồn báo cáo của một khối dữ liệu khác (dùng khi làm sạch theo khối)"""
+        self.rows_before += other.rows_before
+        self.rows_after += other.rows_after
+        self.dropped_missing_key += other.dropped_missing_key
+        self.dropped_duplicates += other.dropped_duplicates
+        for target, source in ((self.filled, other.filled), (self.fixed_negative, other.fixed_negative)):
+            for col, count in source.items():
+                target[col] = target.get(col, 0) + count
+        for col, error in other.estimated.items():
+            self.estimated[col] = max(self.estimated.get(col, 0.0), error)
+
+    def summary(self):
+        """Tóm tắt ngắn gọn để hiển thị"""
+        dropped = self.rows_before - self.rows_after
+        filled = sum(self.filled.values())
+        fixed = sum(self.fixed_negative.values())
+        return (f"xóa {dropped:,} dòng ({self.dropped_missing_key:,} thiếu khóa, "
+                f"{self.dropped_duplicates:,} trùng), điền {filled:,} ô trống, sửa {fixed:,} ô âm")
+
+
+def missing_key_mask(df):
+    """Mảng bool: dòng thiếu PassengerId hoặc Survived"""
+    mask = np.zeros(len(df), dtype=bool)
+    for col in KEY_COLUMNS:
+        if col in df.columns:
+            mask |= df[col].isna().to_numpy()
+    return mask
+
+
+def compute_fill_values(df, keep):
+    """
+    Tính trước giá trị điền cho từng cột trên các dòng được giữ lại (keep là mảng bool).
+    Trả về: {cột: giá trị điền}
+    """
+    def mode_of(col):
+        mode = df[col][keep].mode()
+        return mode.iloc[0] if len(mode) else None
+
+    return build_fill_values(df.columns, lambda col: df[col][keep].median(), mode_of)
+
+
+def build_fill_values(columns, median_of, mode_of):
+    """
+    Bảng giá trị điền cho các cột có trong columns.
+    median_of(cột), mode_of(cột): trung vị / giá trị phổ biến nhất (None nếu cột không có giá trị),
+    tính chính xác trên cả bảng hoặc ước lượng khi làm sạch theo luồng (xem stream_clean).
+    """
+    fill_values = {}
+    for col in ZERO_FILL_COLUMNS:
+        if col in columns:
+            fill_values[col] = 0
+    for col in MEDIAN_COLUMNS:
+        if col in columns:
+            fill_values[col] = median_of(col)
+    for col in MODE_COLUMNS:
+        if col in columns:
+            mode = mode_of(col)
+            if mode is not None:
+                fill_values[col] = mode
+    for col in STRING_COLUMNS:
+        if col in columns and col not in fill_values:
+            fill_values[col] = MISSING_TEXT
+    return fill_values
+
+
+def _map_unique(series, func):
+    """Áp func lên từng giá trị khác nhau của cột rồi trải lại theo mã (nhanh hơn .str trên cột lớn)"""
+    codes, uniques = pd.factorize(series)
+    mapped = np.array([func(val) for val in uniques] + [np.nan], dtype=object)
+    result = pd.Series(mapped[codes], index=series.index, name=series.name)
+    # Giữ kiểu category nếu cột đã được tối ưu bộ nhớ
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        result = result.astype("category")
+    return result
+
+
+def transform_column(col, series, fill_values, report):
+    """
+    Làm sạch một cột (đã bỏ các dòng bị xóa) và ghi số liệu vào report.
+    Dùng chung cho làm sạch cả bảng và làm sạch theo khối.
+    """
+    if col in fill_values:
+        missing = int(series.isna().sum())
+        if missing:
+            value = fill_values[col]
+            if isinstance(series.dtype, pd.CategoricalDtype) and value not in series.cat.categories:
+                series = series.cat.add_categories([value])
+            series = series.fillna(value)
+            report.filled[col] = report.filled.get(col, 0) + missing
+
+    # Định dạng cột Sex thành chữ thường
+    if col == 'Sex':
+        # Ép kiểu chuỗi -> Chuyển chữ thường -> Cắt khoảng trắng thừa
+        series = _map_unique(series, lambda val: str(val).lower().strip())
+
+    # Định dạng cột Embarked thành chữ hoa
+    elif col == 'Embarked':
+        # Ép kiểu chuỗi -> Chuyển chữ HOA -> Cắt khoảng trắng thừa
+        series = _map_unique(series, lambda val: str(val).upper().strip())
+
+    # Chuyển đổi cột Age sang kiểu số nguyên (Integer)
+    elif col == 'Age':
+        if not series.isna().any():
+            series = series.astype(int)
+
+    # Chuyển đổi PassengerId sang kiểu chuỗi (String)
+    elif col == 'PassengerId':
+        series = series.astype(str)
+
+    if col in POSITIVE_COLUMNS:
+        # Lấy trị tuyệt đối cho các ô âm
+        negative = int((series < 0).sum())
+        if negative:
+            series = series.abs()
+            report.fixed_negative[col] = report.fixed_negative.get(col, 0) + negative
+
+    return series
+
+
+def clean_frame(df):
+    """
+    Làm sạch DataFrame theo kế hoạch:
+    1. Tìm các dòng bị xóa (thiếu khóa, trùng PassengerId)
+    2. Tính trung vị/giá trị phổ biến trên các dòng hợp lệ (trước khi bỏ trùng, như trước đây)
+    3. Xử lý từng cột một, bỏ cột cũ ngay sau khi có cột mới để bộ nhớ chỉ tăng thêm một cột
+    DataFrame đầu vào bị thay đổi. Trả về: (DataFrame đã làm sạch, CleaningReport)
+    """
+    report = CleaningReport(len(df))
+
+    missing = missing_key_mask(df)
+    keep = ~missing
+    fill_values = compute_fill_values(df, keep)
+
+    # Bỏ trùng lặp dựa trên PassengerId, giữ bản ghi đầu tiên
+    if 'PassengerId' in df.columns:
+        # Chỉ xét trùng lặp giữa các dòng được giữ lại
+        duplicated = np.zeros(len(df), dtype=bool)
+        duplicated[np.flatnonzero(keep)] = df['PassengerId'][keep].duplicated(keep='first').to_numpy()
+        keep &= ~duplicated
+        report.dropped_duplicates = int(duplicated.sum())
+    report.dropped_missing_key = int(missing.sum())
+
+    if keep.all():
+        # Không có dòng nào bị xóa -> thay từng cột tại chỗ
+        for col in list(df.columns):
+            df[col] = transform_column(col, df[col], fill_values, report)
+        return df, report
+
+    index = df.index[keep]
+    columns = {}
+    for col in list(df.columns):
+        columns[col] = transform_column(col, df[col][keep], fill_values, report)
+        # Giải phóng cột cũ ngay
+        del df[col]
+    cleaned = pd.DataFrame(columns, index=index, copy=False)
+    report.rows_after = len(cleaned)
+    return cleaned, report
@@ -0,0 +1,163 @@
+"""
+Module CLI - Chạy xử lý dữ liệu không cần giao diện
+load -> validate -> clean -> save -> render, ghi file đã làm sạch và ảnh biểu đồ vào thư mục data.
+Module này (và mọi module nó dùng) không import tkinter, chạy được trên máy chủ không có màn hình.
+
+Cách dùng:
+    python main.py --headless original_data/titanic.csv
+    python -m src.cli original_data/titanic.xlsx --charts survived,age_kde
+    python main.py --headless rat_lon.csv --stream     # làm sạch theo khối, không nạp cả file
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from .data_handler import DataHandler
+from .aggregates import AggregateCache
+from .charts import CHARTS, ChartRenderer
+
+
+CHART_TYPES = [value for _, value in CHARTS]
+
+
+class StageTimer:
+    """Đo và in thời gian của từng bước"""
+
+    def __init__(self):
+        self.timings = []
+
+    def run(self, name, func, *args, **kwargs):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        self.timings.append((name, elapsed))
+        print(f"[{name}] {elapsed * 1000:.1f} ms")
+        return result
+
+    def total(self):
+        return sum(elapsed for _, elapsed in self.timings)
+
+
+def render_charts(data_handler, chart_types, output_prefix):
+    """Vẽ các biểu đồ ra file PNG (backend Agg, không cần màn hình). Trả về danh sách file"""
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    figure = Figure(figsize=(8, 5.5), dpi=100)
+    FigureCanvasAgg(figure)
+    renderer = ChartRenderer(figure)
+    aggregates = AggregateCache()
+
+    paths = []
+    for chart_type in chart_types:
+        renderer.render(chart_type, aggregates.get(chart_type, data_handler))
+        path = f"{output_prefix}_{chart_type}.png"
+        figure.savefig(path)
+        paths.append(path)
+    return paths
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Xử lý file dữ liệu Titanic không cần giao diện: load -> validate -> clean -> save -> render"
+    )
+    parser.add_argument("input", help="File CSV/Excel cần xử lý")
+    parser.add_argument("--data-dir", default="data", help="Thư mục ghi kết quả (mặc định: data)")
+    parser.add_argument("--charts", default="all",
+                        help="Danh sách biểu đồ, cách nhau bởi dấu phẩy ('all', 'none' hoặc: "
+                             + ", ".join(CHART_TYPES) + ")")
+    parser.add_argument("--no-clean", action="store_true", help="Bỏ qua bước làm sạch")
+    parser.add_argument("--optimize-memory", action="store_true", help="Tối ưu kiểu dữ liệu khi load")
+    parser.add_argument("--stream", action="store_true",
+                        help="Làm sạch file CSV theo khối với bộ nhớ cố định (file lớn hơn RAM); "
+                             "bỏ qua kiểm tra và biểu đồ")
+    parser.add_argument("--quantile-k", type=int, default=None,
+                        help="Độ chính xác của trung vị ước lượng khi --stream (mặc định 512, lớn hơn: chính xác hơn)")
+    return parser
+
+
+def parse_chart_types(text):
+    """Đọc danh sách biểu đồ từ tham số --charts"""
+    if text == "all":
+        return list(CHART_TYPES)
+    if text == "none":
+        return []
+    chart_types = [item.strip() for item in text.split(",") if item.strip()]
+    unknown = [item for item in chart_types if item not in CHART_TYPES]
+    if unknown:
+        raise ValueError(f"Không có loại biểu đồ: {', '.join(unknown)}")
+    return chart_types
+
+
+def run_stream(args):
+    """Chế độ --stream: làm sạch theo khối từ file nguồn ra thư mục data (xem module stream_clean)"""
+    from .stream_clean import StreamCleaner, QUANTILE_K
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    target = DataHandler.output_path(args.data_dir, os.path.basename(args.input))[0]
+    if os.path.abspath(target) == os.path.abspath(args.input):
+        print("Lỗi: file kết quả trùng file nguồn, hãy chọn --data-dir khác", file=sys.stderr)
+        return 2
+
+    timer = StageTimer()
+    cleaner = StreamCleaner(quantile_k=args.quantile_k or QUANTILE_K)
+    try:
+        report = timer.run("clean (stream)", cleaner.clean, args.input, target)
+    except Exception as e:
+        print(f"Lỗi: {e}", file=sys.stderr)
+        return 1
+    print(f"  {cleaner.rows:,} dòng, {len(cleaner.columns)} cột")
+    print(f"  {report.summary()}")
+    for col, error in report.estimated.items():
+        print(f"  {col}: giá trị điền {cleaner.fill_values.get(col)} là ước lượng (sai số tối đa {error:.2%})")
+    print(f"  {target}")
+    print(f"Tổng thời gian: {timer.total() * 1000:.1f} ms")
+    return 0
+
+
+def main(argv=None):
+    """Chạy toàn bộ quy trình, trả về mã thoát (0: thành công)"""
+    args = build_parser().parse_args(argv)
+    try:
+        chart_types = parse_chart_types(args.charts)
+    except ValueError as e:
+        print(f"Lỗi: {e}", file=sys.stderr)
+        return 2
+    if args.stream:
+        return run_stream(args)
+
+    timer = StageTimer()
+    data_handler = DataHandler(data_dir=args.data_dir)
+    data_handler.optimize_memory = args.optimize_memory
+
+    try:
+        timer.run("load", data_handler.load_file, args.input)
+        print(f"  {len(data_handler.df):,} dòng, {len(data_handler.df.columns)} cột")
+
+        report = timer.run("validate", data_handler.validate_frame)
+        print(f"  {report.summary()}")
+
+        if not args.no_clean:
+            cleaning = timer.run("clean", data_handler.clean_data, persist=False)
+            print(f"  {cleaning.summary()}")
+
+        filepath = timer.run("save", data_handler.save_file)
+        print(f"  {filepath}")
+
+        if chart_types:
+            prefix = os.path.join(args.data_dir, os.path.splitext(data_handler.file_name)[0])
+            paths = timer.run("render", render_charts, data_handler, chart_types, prefix)
+            for path in paths:
+                print(f"  {path}")
+    except Exception as e:
+        print(f"Lỗi: {e}", file=sys.stderr)
+        return 1
+
+    print(f"Tổng thời gian: {timer.total() * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,21 +3,147 @@ Module xử lý dữ liệu - Data Handler
 Chứa các hàm xử lý, validate, clean dữ liệu
 """
 
+import concurrent.futures
+import numpy as np
 import pandas as pd
 import os
 
+from .atomic import atomic_write
+from .journal import EditJournal
+from .cache import FrameCache
+from .validation import validate_frame, validate_row
+from .cleaning import clean_frame
+from .dtypes import compact_dtypes, fit_value
+from .indexes import ColumnIndexes, parse_filter
+from .moments import RunningMoments
+from .sorting import SortCache
+from .history import EditHistory, diff_clean, undo_clean, describe
+from . import excel_io, paged
+from .profiler import profiled
+
 
 class DataHandler:
     """Lớp xử lý dữ liệu"""
     
-    def __init__(self):
+    # Nhật ký lớn hơn ngưỡng này (byte) sẽ được gộp vào file dữ liệu
+    JOURNAL_COMPACT_BYTES = 1024 * 1024
+    
+    # Số dòng mỗi khối khi đọc file ở luồng nền
+    CHUNK_ROWS = 50000
+    
+    # Dòng thêm mới được gom trong vùng đệm, ghép vào DataFrame khi đủ
+    # max(PENDING_FLUSH_ROWS, số dòng / PENDING_FLUSH_RATIO) dòng hoặc khi có chỗ đọc df
+    PENDING_FLUSH_ROWS = 4096
+    PENDING_FLUSH_RATIO = 8
+    
+    # File CSV lớn hơn ngưỡng này (byte) được mở ở chế độ phân trang (xem module paged)
+    PAGED_MIN_BYTES = 1024 * 1024 * 1024
+    
+    def __init__(self, data_dir="data", use_cache=True):
         self.df = pd.DataFrame()
-        self.data_dir = "data"
+        self.data_dir = data_dir
         self.file_name = "titanic.csv"
         
+        # Mã dòng ổn định: chính là nhãn index của DataFrame, không đánh số lại khi xóa
+        self._next_row_id = 0
+        
+        # Các dòng đã thay đổi kể từ lần gọi pop_changes() gần nhất
+        self._changes = self._empty_changes()
+        
+        # Phiên bản dữ liệu, tăng sau mỗi lần load/thêm/sửa/xóa/làm sạch
+        # _rows_version: lần gần nhất tập dòng thay đổi; _column_versions: lần gần nhất từng cột bị sửa
+        self.version = 0
+        self._rows_version = 0
+        self._column_versions = {}
+        
+        # Nhật ký ghi trước cho file đang mở và thông tin file gốc của nó
+        self.journal = None
+        self._journal_base = None
+        self._replaying = False
+        self.replayed_count = 0  # Số thao tác khôi phục từ nhật ký ở lần load gần nhất
+        self._replay_cleans = []  # Khi phát lại: bản chụp dữ liệu trước mỗi lần làm sạch chưa bị hoàn tác
+        # Vị trí nhật ký ngay sau bản ghi "unclean" chưa được ghi vào file dữ liệu (None: không có).
+        # Nhật ký chỉ phát lại được "unclean" khi còn chứa lần làm sạch tương ứng -> cần gộp sớm.
+        self._unclean_mark = None
+        
+        # Kết quả kiểm tra ràng buộc của file vừa load
+        self.validation_report = None
+        
+        # Chế độ tối ưu bộ nhớ khi load (category, kiểu số nhỏ nhất) và báo cáo dung lượng
+        self.optimize_memory = False
+        self.memory_report = None
+        
+        # Chỉ mục theo cột cho tìm kiếm/lọc (dựng khi truy vấn lần đầu, cập nhật theo từng thao tác)
+        self.indexes = ColumnIndexes()
+        
+        # Mô-men theo cặp cột số cho ma trận tương quan / thống kê mô tả (cập nhật theo từng thao tác)
+        self.moments = RunningMoments()
+        
+        # Hoán vị sắp xếp đã tính, theo phiên bản dữ liệu của các cột
+        self.sort_cache = SortCache()
+        
+        # Lịch sử Hoàn tác / Làm lại; _history_mode cho biết thay đổi mới thuộc ngăn nào
+        self.history = EditHistory()
+        self._history_mode = None  # None: thao tác mới, "undo": đang hoàn tác, "redo": đang làm lại
+        self._remembered = None    # Thay đổi vừa được lưu vào lịch sử (mô tả bước Làm lại)
+        
+        # Dữ liệu của file mở ở chế độ phân trang (PagedDataset), None khi dữ liệu nằm trong self.df
+        self.paged = None
+        
+        # File Excel .xlsx: tên các sheet, sheet đang mở (self.df) và các sheet còn lại
+        # {tên: DataFrame, hoặc Future khi còn đang đọc song song ở luồng nền}
+        self.sheet_names = []
+        self.sheet_name = None
+        self._sheets = {}
+        self._sheet_base = None  # File mà dữ liệu các sheet trong bộ nhớ đang khớp (gốc nhật ký)
+        
         # Tạo thư mục data nếu chưa tồn tại
         if not os.path.exists(self.data_dir):
             os.makedirs(self.data_dir)
+        
+        # Bộ nhớ đệm dạng cột của các file đã đọc (data/.cache), None nếu tắt
+        self.cache = FrameCache(os.path.join(self.data_dir, ".cache")) if use_cache else None
+    
+    @property
+    def df(self):
+        """DataFrame hiện tại (đã gồm các dòng còn trong vùng đệm thêm mới)"""
+        if self._pending_ids:
+            self.flush_pending()
+        return self._df
+    
+    @df.setter
+    def df(self, value):
+        # Thay cả DataFrame -> các dòng còn trong vùng đệm (của dữ liệu cũ) không còn ý nghĩa
+        self._df = value
+        self._pending = {}       # {cột: danh sách giá trị} của các dòng chờ ghép
+        self._pending_ids = []   # Mã dòng tương ứng
+        self._columns_cache = (None, [])
+    
+    def flush_pending(self):
+        """
+        Ghép các dòng trong vùng đệm vào DataFrame bằng một lần concat.
+        Kiểu cột được nới theo từng giá trị khác nhau của các dòng mới (như khi thêm từng dòng).
+        """
+        if not self._pending_ids:
+            return
+        pending, ids = self._pending, self._pending_ids
+        self._pending, self._pending_ids = {}, []
+        
+        df = self._df
+        for col, values in pending.items():
+            series = df[col]
+            if pd.api.types.is_object_dtype(series.dtype):
+                continue  # Cột object chứa được mọi giá trị
+            values = pd.unique(pd.Series(values, dtype=object))
+            if isinstance(series.dtype, pd.StringDtype):
+                # Cột chuỗi (VD: Name) chỉ cần xét các giá trị không phải chuỗi
+                values = [value for value in values if not isinstance(value, str)]
+            for value in values:
+                fitted = fit_value(series, value)
+                if fitted is not None:
+                    df[col] = series = fitted
+        new_rows = pd.DataFrame(pending, index=ids, columns=df.columns).astype(df.dtypes.to_dict())
+        self._df = pd.concat([df, new_rows]) if len(df) else new_rows
     
     @staticmethod
     def parse_value(val):
@@ -41,184 +167,805 @@ class DataHandler:
     def validate_data(row_data):
         """
         Kiểm tra tính hợp lệ của dữ liệu trước khi Thêm hoặc Update.
+        Dùng chung bộ luật với validate_frame (xem module validation).
         Trả về: (True, "") nếu hợp lệ, (False, "Lỗi...") nếu không hợp lệ.
         """
-        
-        # 1. Kiểm tra Survived (0 hoặc 1)
-        if 'Survived' in row_data:
-            val = row_data['Survived']
-            # Chấp nhận số 0, 1 hoặc chuỗi "0", "1"
-            if str(val) not in ['0', '1']:
-                return False, "Cột 'Survived' chỉ được nhập 0 hoặc 1."
-
-        # 2. Kiểm tra Pclass (1, 2, 3)
-        if 'Pclass' in row_data:
-            val = row_data['Pclass']
-            if str(val) not in ['1', '2', '3']:
-                return False, "Cột 'Pclass' chỉ được nhập 1, 2 hoặc 3."
-
-        # 3. Kiểm tra Sex (male hoặc female)
-        if 'Sex' in row_data:
-            val = str(row_data['Sex']).lower().strip()
-            if val not in ['male', 'female']:
-                return False, "Cột 'Sex' chỉ được nhập 'male' hoặc 'female'."
-
-        # 4. Kiểm tra Age (>0 và <=146)
-        if 'Age' in row_data:
-            val = row_data['Age']
-            # Kiểm tra xem có phải số không (int hoặc float)
-            if not isinstance(val, (int, float)):
-                return False, "Cột 'Age' phải là số."
-            if not (0 < val <= 146):
-                return False, "Cột 'Age' phải lớn hơn 0 và nhỏ hơn hoặc bằng 146."
-
-        # 5. Các cột bắt buộc là số: SibSp, Parch, Fare
-        numeric_cols = ['SibSp', 'Parch', 'Fare']
-        for col in numeric_cols:
-            if col in row_data:
-                val = row_data[col]
-                if not isinstance(val, (int, float)):
-                    return False, f"Cột '{col}' bắt buộc phải nhập số."
-                if val < 0:
-                    return False, f"Cột '{col}' không được là số âm."
-
-        return True, ""
+        return validate_row(row_data)
+    
+    @profiled(rows=lambda self, df=None: len(self.df if df is None else df))
+    def validate_frame(self, df=None):
+        """
+        Kiểm tra toàn bộ DataFrame bằng các luật dạng vector.
+        Trả về: ValidationReport (mã dòng vi phạm theo từng luật)
+        """
+        if df is None:
+            df = self.df
+        return validate_frame(df)
 
-    def load_file(self, file_path):
-        """Load file CSV hoặc Excel"""
+    @profiled(rows=lambda self, *_: len(self.df))
+    def load_file(self, file_path, sheet=None):
+        """
+        Load file CSV hoặc Excel
+        sheet: sheet cần mở của file .xlsx (mặc định sheet đầu tiên); các sheet còn lại được
+        đọc song song ở luồng nền (xem select_sheet)
+        """
+        return self.finish_load(file_path, self._read_frame(file_path, sheet), sheet=sheet)
+    
+    def _read_frame(self, file_path, sheet=None):
+        """Đọc một file (một sheet của file .xlsx), dùng bản đệm nếu file nguồn chưa thay đổi"""
+        part = self._cache_part(file_path, sheet)
+        df = self.cache.load(file_path, part) if self.cache else None
+        if df is None:
+            # Logic đọc file
+            if file_path.endswith('.csv'):
+                df = pd.read_csv(file_path)
+            elif file_path.endswith('.xlsx'):
+                df = excel_io.read_sheet(file_path, sheet)
+            else:
+                df = pd.read_excel(file_path)
+            if self.cache:
+                self.cache.store(file_path, df, part)
+        return df
+    
+    @staticmethod
+    def _cache_part(file_path, sheet):
+        """Khóa phụ của bộ đệm: tên sheet, trừ sheet đầu tiên (cùng khóa với khi đọc theo khối)"""
+        if sheet is None or not file_path.endswith('.xlsx'):
+            return None
+        return None if excel_io.sheet_names(file_path)[:1] == [sheet] else sheet
+    
+    def read_chunks(self, file_path, chunksize=None):
+        """
+        Đọc file theo từng khối dòng (dùng cho việc load ở luồng nền)
+        CSV đọc bằng pd.read_csv(chunksize=...), sheet đầu tiên của Excel .xlsx đọc theo luồng (excel_io).
+        Trả về (generator): (khối DataFrame, số byte đã đọc, tổng số byte)
+        Người gọi nên lưu DataFrame hoàn chỉnh vào self.cache sau khi ghép các khối.
+        """
+        chunksize = chunksize or self.CHUNK_ROWS
+        total_bytes = os.path.getsize(file_path)
+        
+        # Có bản đệm -> trả về một khối duy nhất
+        cached = self.cache.load(file_path) if self.cache else None
+        if cached is not None:
+            yield cached, total_bytes, total_bytes
+            return
+        
+        if file_path.endswith('.csv'):
+            with open(file_path, 'rb') as f:
+                for chunk in pd.read_csv(f, chunksize=chunksize):
+                    yield chunk, f.tell(), total_bytes
+        elif file_path.endswith('.xlsx'):
+            # File Excel nén nên số byte được ước lượng theo phần XML đã giải nén
+            for chunk, fraction in excel_io.iter_sheet(file_path, chunksize=chunksize):
+                yield chunk, int(total_bytes * fraction), total_bytes
+        else:
+            # .xls không đọc được theo dòng -> đọc một lần
+            yield pd.read_excel(file_path), total_bytes, total_bytes
+    
+    @profiled(rows=lambda self, *_: len(self.df))
+    def finish_load(self, file_path, df, memory_report=None, sheet=None):
+        """
+        Nhận DataFrame vừa đọc từ file_path làm dữ liệu hiện tại
+        memory_report: báo cáo nếu DataFrame đã được tối ưu kiểu sẵn (VD: ở luồng đọc nền)
+        sheet: sheet của file .xlsx mà df được đọc từ đó (mặc định sheet đầu tiên)
+        """
         # Cập nhật tên file hiện tại (self.file_name) dựa trên file vừa chọn
         # Hàm os.path.basename sẽ lấy tên file từ đường dẫn đầy đủ (VD: C:/data/file.xlsx -> file.xlsx)
         self.file_name = os.path.basename(file_path)
-
-        # Logic đọc file
-        if file_path.endswith('.csv'):
-            self.df = pd.read_csv(file_path)
-        else:
-            self.df = pd.read_excel(file_path)
+        self._close_paged()
+        self._open_sheets(file_path, sheet)
+        return self._take_frame(file_path, df, memory_report)
+    
+    def _take_frame(self, file_path, df, memory_report=None):
+        """Nhận df (của file_path / sheet hiện tại) làm dữ liệu hiện tại, phát lại nhật ký nếu có"""
+        # File mới -> đánh lại mã dòng từ 0, bỏ các thay đổi cũ
+        self.df = df.reset_index(drop=True)
+        self._next_row_id = len(self.df)
+        self._changes = self._empty_changes()
+        self.indexes.reset()
+        self.moments.reset()
+        self.history.clear()
+        
+        self._bump_version()
+        
+        # Đổi sang kiểu dữ liệu gọn hơn nếu bật chế độ tối ưu bộ nhớ
+        self.memory_report = memory_report
+        if self.optimize_memory and memory_report is None:
+            self.df, self.memory_report = compact_dtypes(self.df)
+        
+        # Áp lại các thao tác chưa được gộp từ nhật ký (nếu có)
+        self._open_journal(file_path)
+        
+        # Kiểm tra ràng buộc trên toàn bộ dữ liệu vừa load
+        self.validation_report = self.validate_frame()
         return self.df
     
+    def _open_sheets(self, file_path, sheet=None):
+        """
+        Ghi nhận các sheet của file vừa mở. File .xlsx nhiều sheet: các sheet khác sheet đang mở
+        được đọc song song ở luồng nền ngay từ bây giờ, để chuyển sheet và lưu file không phải chờ.
+        """
+        for frame in self._sheets.values():
+            if isinstance(frame, concurrent.futures.Future):
+                frame.cancel()
+        self._sheets = {}
+        self._sheet_base = file_path
+        self.sheet_names = excel_io.sheet_names(file_path) if file_path.endswith('.xlsx') else []
+        self.sheet_name = sheet or next(iter(self.sheet_names), None)
+        
+        others = [name for name in self.sheet_names if name != self.sheet_name]
+        if others:
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers=min(len(others), os.cpu_count() or 1))
+            self._sheets = {name: executor.submit(self._read_frame, file_path, name) for name in others}
+            executor.shutdown(wait=False)
+    
+    def sheet_ready(self, name):
+        """Sheet name đã đọc xong (chuyển sang sẽ không phải chờ)"""
+        frame = self._sheets.get(name)
+        return not isinstance(frame, concurrent.futures.Future) or frame.done()
+    
+    def select_sheet(self, name):
+        """
+        Chuyển sang sheet khác của file Excel đang mở. Sheet đang mở được giữ lại cùng các thay đổi
+        (nhật ký của nó được gộp vào file trước, vì mỗi sheet có nhật ký riêng); lịch sử hoàn tác
+        bắt đầu lại như khi mở file.
+        """
+        if name == self.sheet_name:
+            return self.df
+        if name not in self._sheets:
+            raise ValueError(f"Không có sheet '{name}' trong file")
+        self.close()
+        frame = self._sheets.pop(name)
+        if isinstance(frame, concurrent.futures.Future):
+            frame = frame.result()
+        self._sheets[self.sheet_name] = self.df
+        self.sheet_name = name
+        return self._take_frame(self._sheet_base, frame)
+    
+    def _workbook_frames(self, df):
+        """
+        Dữ liệu cần ghi khi lưu: df, hoặc với file .xlsx là {tên sheet: DataFrame / Future}
+        gồm mọi sheet theo thứ tự trong file, sheet đang mở lấy df
+        """
+        if not self.sheet_names:
+            return df
+        frames = dict(self._sheets)
+        frames[self.sheet_name] = df
+        return {name: frames[name] for name in self.sheet_names}
+    
+    def should_page(self, file_path):
+        """File có nên được mở ở chế độ phân trang không (CSV lớn, cần pyarrow)"""
+        return (paged.HAS_ARROW and file_path.lower().endswith('.csv')
+                and os.path.getsize(file_path) >= self.PAGED_MIN_BYTES)
+    
+    def open_paged(self, file_path, on_progress=None, cancelled=None):
+        """
+        Chuyển file sang kho phân trang trong data/.store (dùng lại nếu file chưa đổi) và mở kho.
+        Không chạm vào trạng thái của DataHandler nên có thể chạy ở luồng nền.
+        Trả về: PagedDataset, hoặc None nếu bị hủy (cancelled() trả về True)
+        """
+        return paged.open_dataset(file_path, self.data_dir, on_progress, cancelled)
+    
+    def finish_paged_load(self, file_path, dataset):
+        """
+        Nhận dữ liệu phân trang vừa mở làm dữ liệu hiện tại.
+        self.df chỉ còn là khung rỗng giữ tên cột; dòng được đọc qua row_source()/get_row().
+        Lớp phủ chỉnh sửa có nhật ký riêng trong kho, nên không dùng nhật ký của file dữ liệu.
+        """
+        self.file_name = os.path.basename(file_path)
+        self._close_paged()
+        self.paged = dataset
+        self._open_sheets(file_path)
+        self.df = pd.DataFrame(columns=dataset.columns, dtype=object)
+        self._next_row_id = dataset.next_id
+        self._changes = self._empty_changes()
+        self.indexes.reset()
+        self.moments.reset()
+        self.history.clear()
+        self._bump_version()
+        
+        self.memory_report = None
+        self.validation_report = None
+        self.journal = None
+        self._journal_base = None
+        self.replayed_count = dataset.replayed_count
+        return dataset
+    
+    def _close_paged(self):
+        if self.paged is not None:
+            self.paged.close()
+            self.paged = None
+    
+    def row_count(self):
+        """Số dòng của dữ liệu hiện tại (kể cả chế độ phân trang)"""
+        return len(self.paged) if self.paged is not None else len(self.df)
+    
+    def row_source(self):
+        """Nguồn dòng cho bảng: DataFrame, hoặc PagedDataset (đọc theo trang) ở chế độ phân trang"""
+        return self.paged if self.paged is not None else self.df
+    
+    def get_row(self, index):
+        """Dòng có mã index dạng Series"""
+        if self.paged is not None:
+            return self.paged.row(index)
+        return self.df.loc[index]
+    
+    def _require_in_memory(self, action):
+        """Các thao tác cần toàn bộ dữ liệu trong bộ nhớ không chạy ở chế độ phân trang"""
+        if self.paged is not None:
+            raise RuntimeError(f"Chế độ phân trang (file lớn) không hỗ trợ {action}")
+    
+    def _journal_path(self):
+        """
+        Đường dẫn file nhật ký của file đang mở (nằm trong thư mục data).
+        Mỗi sheet của file Excel có nhật ký riêng; sheet đầu tiên dùng tên như file một sheet.
+        """
+        name = self.file_name
+        if self.sheet_names and self.sheet_name != self.sheet_names[0]:
+            name += f"#{self.sheet_names.index(self.sheet_name)}"
+        return os.path.join(self.data_dir, name + ".journal")
+    
+    def _open_journal(self, file_path):
+        """Mở nhật ký của file vừa load và phát lại nếu nhật ký được ghi trên chính file này"""
+        self.journal = EditJournal(self._journal_path())
+        self._journal_base = EditJournal.describe_base(file_path)
+        self.replayed_count = 0
+        self._unclean_mark = None
+        if not self.journal.exists():
+            return
+        
+        base, entries = self.journal.read()
+        if base is None or any(base.get(k) != v for k, v in self._journal_base.items()) \
+                or not self._replayable(entries):
+            # Nhật ký thuộc về phiên bản khác của file -> cất đi, không áp lên dữ liệu này
+            self.journal.discard()
+            return
+        
+        # File gốc được ghi khi mã dòng không liên tục (đã xóa dòng) -> dùng lại đúng các mã đó
+        runs = base.get("ids")
+        if runs and sum(length for _, length in runs) == len(self.df):
+            self.df.index = np.concatenate([np.arange(start, start + length) for start, length in runs])
+            self._next_row_id = max(self._next_row_id, int(self.df.index.max()) + 1)
+            self._journal_base["ids"] = runs
+        
+        self._replaying = True
+        try:
+            for entry in entries:
+                self._apply_journal_entry(entry)
+        finally:
+            self._replaying = False
+            self._replay_cleans = []
+        self.replayed_count = len(entries)
+        self._changes = self._empty_changes()
+    
+    @staticmethod
+    def _replayable(entries):
+        """
+        Mỗi bản ghi "unclean" phải có lần làm sạch tương ứng ở trước nó trong nhật ký
+        (làm sạch đã nằm sẵn trong file gốc thì không dựng lại được dữ liệu trước khi làm sạch)
+        """
+        cleans = 0
+        for entry in entries:
+            if entry["op"] == "clean":
+                cleans += 1
+            elif entry["op"] == "unclean":
+                if not cleans:
+                    return False
+                cleans -= 1
+        return True
+    
+    def _apply_journal_entry(self, entry):
+        """Phát lại một thao tác trong nhật ký"""
+        op = entry["op"]
+        if op == "insert":
+            self._next_row_id = max(self._next_row_id, entry["id"])
+            self.add_row(entry["row"])
+        elif op == "update":
+            self.update_row(entry["id"], entry["row"])
+        elif op == "delete":
+            self.delete_row(entry["id"])
+        elif op == "restore":
+            self._restore_row(entry["id"], entry["row"])
+        elif op == "clean":
+            # Giữ bản chụp (nông, copy-on-write) để phát lại "unclean" sau đó
+            self._replay_cleans.append(self.df.copy(deep=False))
+            self.clean_data(persist=False)
+        elif op == "unclean":
+            self._restore_frame(self._replay_cleans.pop())
+    
+    def _log(self, entry):
+        """Ghi một thao tác vào nhật ký (bỏ qua khi đang phát lại hoặc chưa load file)"""
+        if self.journal is None or self._replaying:
+            return
+        if not self.journal.exists():
+            self.journal.start(self._journal_base)
+        self.journal.append(entry)
+    
+    def _log_many(self, entries):
+        """Ghi nhiều thao tác vào nhật ký với một lần đẩy xuống đĩa"""
+        if self.journal is None or self._replaying or not entries:
+            return
+        if not self.journal.exists():
+            self.journal.start(self._journal_base)
+        self.journal.append_many(entries)
+    
+    def persist_changes(self):
+        """
+        Đảm bảo các thao tác vừa làm đã an toàn trên đĩa.
+        Nhật ký nhỏ -> chỉ cần nối thêm (đã làm khi sửa); vượt ngưỡng -> gộp vào file dữ liệu.
+        Trả về: đường dẫn file chứa thay đổi (nhật ký hoặc file dữ liệu)
+        """
+        if self.journal is None:
+            return self.save_file()
+        if self.needs_compaction():
+            return self.compact()
+        return self.journal.path
+    
+    def compact(self):
+        """Gộp nhật ký vào file dữ liệu: ghi toàn bộ DataFrame rồi xóa nhật ký"""
+        return self.save_file()
+    
+    def close(self):
+        """
+        Gộp nhật ký còn dở trước khi đóng ứng dụng.
+        Chế độ phân trang: không làm gì, lớp phủ đã nằm an toàn trong kho; việc gộp (ghi lại
+        cả file lớn) do người dùng chọn qua save_file().
+        """
+        if self.paged is None and self.journal is not None and self.journal.exists():
+            self.compact()
+    
+    @staticmethod
+    def _empty_changes():
+        """Tập thay đổi rỗng"""
+        return {"inserted": [], "modified": [], "removed": []}
+    
+    def _record_change(self, kind, row_id):
+        """Ghi nhận một dòng bị thêm/sửa/xóa (gộp các thay đổi trên cùng một dòng)"""
+        changes = self._changes
+        if kind == "modified":
+            # Dòng vừa thêm thì vẫn tính là "inserted"
+            if row_id not in changes["inserted"] and row_id not in changes["modified"]:
+                changes["modified"].append(row_id)
+        elif kind == "removed":
+            if row_id in changes["modified"]:
+                changes["modified"].remove(row_id)
+            if row_id in changes["inserted"]:
+                # Thêm rồi xóa ngay -> coi như chưa từng tồn tại
+                changes["inserted"].remove(row_id)
+            else:
+                changes["removed"].append(row_id)
+        else:
+            changes["inserted"].append(row_id)
+    
+    def _bump_version(self, columns=None):
+        """Tăng phiên bản dữ liệu (columns=None: cả tập dòng thay đổi)"""
+        self.version += 1
+        if columns is None:
+            self._rows_version = self.version
+        else:
+            for col in columns:
+                self._column_versions[col] = self.version
+    
+    def columns_version(self, columns=None):
+        """
+        Khóa phiên bản của một nhóm cột (None = mọi cột), dùng để lưu kết quả tính toán.
+        Khóa chỉ đổi khi tập dòng thay đổi hoặc một trong các cột đó bị sửa.
+        """
+        if columns is None:
+            columns = list(self._df.columns)
+        return (self._rows_version, tuple(columns)) + \
+            tuple(self._column_versions.get(col, 0) for col in columns)
+    
+    def pop_changes(self):
+        """
+        Trả về các dòng đã thay đổi kể từ lần gọi trước và xóa danh sách ghi nhận.
+        Kết quả: {"inserted": [...], "modified": [...], "removed": [...]} (mã dòng ổn định)
+        """
+        changes = self._changes
+        self._changes = self._empty_changes()
+        return changes
+    
+    def _fit_columns(self, row):
+        """Nới kiểu các cột (category mới, số nguyên lớn hơn, ô rỗng...) để chứa được giá trị của dòng"""
+        for col, val in row.items():
+            if col in self.df.columns:
+                fitted = fit_value(self.df[col], val)
+                if fitted is not None:
+                    self.df[col] = fitted
+    
+    @staticmethod
+    def _same_value(old, new):
+        """So sánh hai giá trị ô (coi hai ô rỗng là bằng nhau)"""
+        if pd.isna(old) and (new is None or pd.isna(new)):
+            return True
+        try:
+            return bool(old == new)
+        except (TypeError, ValueError):
+            return False
+    
+    def _column_list(self):
+        """Danh sách tên cột (lưu lại theo đối tượng columns, duyệt Index mỗi lần thêm dòng khá chậm)"""
+        columns = self._df.columns
+        if self._columns_cache[0] is not columns:
+            self._columns_cache = (columns, list(columns))
+        return self._columns_cache[1]
+    
+    def _last_row_id(self):
+        """Mã dòng cuối cùng (kể cả dòng trong vùng đệm), None nếu chưa có dòng"""
+        if self._pending_ids:
+            return self._pending_ids[-1]
+        return self._df.index[-1] if len(self._df) else None
+    
+    def _insert_row(self, row_id, row):
+        """Chèn dòng có mã row_id vào đúng vị trí theo mã dòng (mã dòng tăng dần theo vị trí)"""
+        # Cột không có trong row nhận giá trị rỗng
+        full_row = {col: row.get(col) for col in self._column_list()}
+        last_id = self._last_row_id()
+        if last_id is not None and row_id > last_id:
+            # Thêm vào cuối -> chỉ gom vào vùng đệm theo cột, ghép sau
+            for col, val in full_row.items():
+                self._pending.setdefault(col, []).append(val)
+            self._pending_ids.append(row_id)
+            if len(self._pending_ids) >= max(self.PENDING_FLUSH_ROWS, len(self._df) // self.PENDING_FLUSH_RATIO):
+                self.flush_pending()
+        else:
+            self._fit_columns(full_row)
+            # Tạo dòng mới đúng kiểu của từng cột để không làm mất category/kiểu số nhỏ khi ghép
+            row_df = pd.DataFrame([full_row], index=[row_id], columns=self.df.columns)
+            row_df = row_df.astype(self.df.dtypes.to_dict())
+            if not len(self.df):
+                self.df = row_df
+            else:
+                position = self.df.index.searchsorted(row_id)
+                self.df = pd.concat([self.df.iloc[:position], row_df, self.df.iloc[position:]])
+        self.indexes.on_insert(row_id, full_row)
+        self.moments.on_insert(full_row)
+        self._bump_version()
+        self.sort_cache.on_change(self.version, row_id)
+        self._record_change("inserted", row_id)
+        self._remember({"op": "insert", "id": row_id, "row": full_row})
+    
     def add_row(self, new_row):
-        """Thêm dòng mới vào DataFrame"""
-        self.df.loc[len(self.df)] = new_row
-        return self.df
+        """
+        Thêm dòng mới vào cuối DataFrame với mã dòng mới.
+        Dòng được gom vào vùng đệm (chi phí O(1)), self.df luôn thấy dòng này khi đọc.
+        Trả về: mã dòng của dòng mới
+        """
+        if self.paged is not None:
+            row_id = self.paged.insert(new_row)
+            self._next_row_id = self.paged.next_id
+            self._bump_version()
+            self._record_change("inserted", row_id)
+            return row_id
+        row_id = self._next_row_id
+        self._next_row_id += 1
+        self._insert_row(row_id, new_row)
+        self._log({"op": "insert", "id": row_id, "row": new_row})
+        return row_id
+    
+    def add_rows(self, rows):
+        """Thêm nhiều dòng (VD: nhập hàng loạt bằng script), ghi nhật ký một lần. Trả về: danh sách mã dòng"""
+        if self.paged is not None:
+            return [self.add_row(new_row) for new_row in rows]
+        entries = []
+        for new_row in rows:
+            row_id = self._next_row_id
+            self._next_row_id += 1
+            self._insert_row(row_id, new_row)
+            entries.append({"op": "insert", "id": row_id, "row": new_row})
+        self._log_many(entries)
+        return [entry["id"] for entry in entries]
+    
+    def _restore_row(self, row_id, row):
+        """Đưa lại dòng đã xóa về đúng vị trí cũ với mã cũ (Hoàn tác xóa / Làm lại thêm)"""
+        self._insert_row(row_id, row)
+        self._log({"op": "restore", "id": row_id, "row": row})
     
     def update_row(self, index, updated_row):
-        """Cập nhật dòng tại index"""
+        """Cập nhật dòng có mã index"""
+        if self.paged is not None:
+            self.paged.update(index, updated_row)
+            self._bump_version(list(updated_row))
+            self._record_change("modified", index)
+            return self.df
+        self._fit_columns(updated_row)
+        changed = {}
         for col, val in updated_row.items():
+            old = self.df.at[index, col]
+            if not self._same_value(old, val):
+                changed[col] = None if pd.isna(old) else old
             self.df.at[index, col] = val
+        # Chỉ các cột thật sự đổi giá trị mới làm mất kết quả tính toán đã lưu
+        if changed:
+            new_values = {col: updated_row[col] for col in changed}
+            self.indexes.on_update(index, changed, new_values)
+            self.moments.on_update(self.df, index, changed)
+            self._bump_version(list(changed))
+            self.sort_cache.on_change(self.version, index, changed)
+            self._remember({"op": "update", "id": index, "old": changed, "new": new_values})
+        self._record_change("modified", index)
+        self._log({"op": "update", "id": index, "row": updated_row})
         return self.df
     
     def delete_row(self, index):
-        """Xóa dòng tại index (dòng đang chọn)"""
-        self.df = self.df.drop(index).reset_index(drop=True)
+        """Xóa dòng có mã index (dòng đang chọn), các dòng khác giữ nguyên mã"""
+        if self.paged is not None:
+            self.paged.delete(index)
+            self._bump_version()
+            self._record_change("removed", index)
+            return self.df
+        # Ô rỗng -> None để dòng ghi được vào nhật ký và khôi phục đúng khi Hoàn tác
+        row = {col: None if pd.isna(val) else val for col, val in self.df.loc[index].items()}
+        self.indexes.on_delete(index, row)
+        self.moments.on_delete(row)
+        self.df = self.df.drop(index)
+        self._bump_version()
+        self.sort_cache.on_change(self.version, index)
+        self._record_change("removed", index)
+        self._remember({"op": "delete", "id": index, "row": row})
+        self._log({"op": "delete", "id": index})
         return self.df
     
-    def save_file(self, filename=None):
+    @profiled(rows=lambda self, *_: len(self.df))
+    def filter_rows(self, column, text):
         """
-        Lưu DataFrame ra file CSV hoặc Excel trong thư mục data
-        Tự động nhận diện định dạng dựa trên đuôi file gốc
+        Tìm các dòng theo biểu thức lọc trên một cột (xem indexes.parse_filter):
+        "giá trị" (bằng), "a..b", ">= a", "< b"... Cột có chỉ mục trả về gần như tức thì,
+        cột khác được duyệt toàn bộ.
+        Trả về: mảng mã dòng tăng dần (đúng thứ tự trong DataFrame)
+        """
+        self._require_in_memory("lọc dữ liệu")
+        return self.indexes.query(self.df, column, parse_filter(text))
+    
+    @profiled(rows=lambda self, *_: len(self.df))
+    def sort_order(self, keys, row_ids=None):
+        """
+        Mã dòng theo thứ tự sắp xếp keys = [(cột, tăng dần?), ...], không sắp xếp lại DataFrame.
+        row_ids: chỉ lấy các mã dòng này (VD: kết quả lọc), giữ thứ tự sắp xếp.
+        """
+        self._require_in_memory("sắp xếp")
+        order = self.sort_cache.order(self, keys)
+        if row_ids is not None:
+            order = order[np.isin(order, row_ids)]
+        return order
+    
+    @profiled(rows=lambda self, *_: len(self.df))
+    def summary_stats(self):
+        """
+        Thống kê mô tả các cột số (count, missing, mean, std, min, max), mỗi cột một dòng.
+        Tính từ mô-men cập nhật dần (xem module moments) nên làm mới không phải duyệt lại mọi dòng.
+        """
+        self._require_in_memory("thống kê mô tả")
+        return self.moments.describe(self.df)
+    
+    def _target_path(self, filename=None):
+        """
+        Đường dẫn file lưu trong thư mục data và đuôi file tương ứng
+        Đuôi lạ sẽ được ép về CSV (thêm đuôi .csv)
         """
         # Nếu không truyền filename, dùng tên file gốc đã lưu ở hàm load_file
         if filename is None:
             filename = self.file_name
-        
+        return self.output_path(self.data_dir, filename)
+    
+    @staticmethod
+    def output_path(data_dir, filename):
+        """Đường dẫn file lưu của filename trong thư mục data_dir và đuôi file tương ứng"""
         # Tạo đường dẫn đầy đủ
-        filepath = os.path.join(self.data_dir, filename)
+        filepath = os.path.join(data_dir, filename)
         
         # Lấy đuôi file (extension) để kiểm tra: .csv hay .xlsx/.xls
         # file_extension sẽ lấy đuôi .csv... và chuyển các ký tự thành in thường
         _, file_extension = os.path.splitext(filename)
         file_extension = file_extension.lower()
         
-        try:
+        if file_extension not in ['.csv', '.xlsx', '.xls']:
+            filepath = filepath + ".csv"
+            file_extension = '.csv'
+        return filepath, file_extension
+    
+    def _id_runs(self):
+        """
+        Mã dòng hiện tại dạng các đoạn liên tiếp [[mã đầu, độ dài], ...] để ghi vào bản ghi base
+        của nhật ký (file lưu không chứa mã dòng). None nếu mã dòng là 0..n-1 như khi load lại.
+        """
+        ids = self.df.index.to_numpy()
+        if not len(ids) or (ids[0] == 0 and ids[-1] == len(ids) - 1):
+            return None
+        breaks = np.flatnonzero(np.diff(ids) != 1) + 1
+        starts = ids[np.concatenate([[0], breaks])]
+        lengths = np.diff(np.concatenate([[0], breaks, [len(ids)]]))
+        return [[int(start), int(length)] for start, length in zip(starts, lengths)]
+    
+    def _rebase(self, filepath, runs):
+        """File filepath vừa được ghi từ dữ liệu có mã dòng runs -> thành gốc mới của nhật ký"""
+        self._journal_base = EditJournal.describe_base(filepath)
+        self._sheet_base = filepath
+        if runs:
+            self._journal_base["ids"] = runs
+    
+    def save_path(self):
+        """Đường dẫn file dữ liệu mà save_file() sẽ ghi"""
+        return self._target_path()[0]
+    
+    @staticmethod
+    @profiled(rows=lambda df, *_: len(df) if isinstance(df, pd.DataFrame) else None)
+    def write_frame(df, filepath):
+        """
+        Ghi DataFrame ra file một cách nguyên tử:
+        ghi vào file tạm cùng thư mục rồi os.replace (xem module atomic), nên file đích không bao giờ
+        bị ghi dở và giữ nguyên quyền truy cập.
+        File .xlsx ghi theo luồng (excel_io); df có thể là {tên sheet: DataFrame / Future} để ghi
+        nhiều sheet (Future: sheet còn đang đọc, chờ đọc xong rồi ghi).
+        Hàm không chạm vào trạng thái của DataHandler nên có thể chạy ở luồng nền.
+        """
+        file_extension = os.path.splitext(filepath)[1].lower()
+        with atomic_write(filepath) as tmp_path:
             if file_extension == '.csv':
                 # Trường hợp csv
-                self.df.to_csv(filepath, index=False, encoding='utf-8')
-                
-            elif file_extension in ['.xlsx', '.xls']:
+                df.to_csv(tmp_path, index=False, encoding='utf-8')
+            elif file_extension == '.xlsx':
+                sheets = df if isinstance(df, dict) else {"Sheet1": df}
+                excel_io.write_workbook(tmp_path, {
+                    name: frame.result() if isinstance(frame, concurrent.futures.Future) else frame
+                    for name, frame in sheets.items()
+                })
+            else:
                 # Trường hợp excel
                 # Sử dụng engine='openpyxl' để ghi file Excel
-                self.df.to_excel(filepath, index=False, engine='openpyxl')
-                
+                df.to_excel(tmp_path, index=False, engine='openpyxl')
+        return filepath
+    
+    @profiled(rows=lambda self, *_: self.row_count())
+    def save_file(self, filename=None):
+        """
+        Lưu DataFrame ra file CSV hoặc Excel trong thư mục data
+        Tự động nhận diện định dạng dựa trên đuôi file gốc
+        Chế độ phân trang: gộp dữ liệu gốc với lớp phủ chỉnh sửa, ghi lần lượt từng khối (chỉ CSV)
+        """
+        filepath, file_extension = self._target_path(filename)
+        
+        try:
+            if self.paged is not None:
+                if file_extension != '.csv':
+                    raise ValueError("Chế độ phân trang chỉ lưu được file CSV")
+                self.paged.save(filepath)
             else:
-                # Trường hợp đuôi lạ, mặc định ép về CSV và thêm đuôi .csv
-                filepath = filepath + ".csv"
-                self.df.to_csv(filepath, index=False, encoding='utf-8')
-
+                self.write_frame(self._workbook_frames(self.df), filepath)
             print(f"Đã lưu file thành công tại: {filepath}")
+            
+            # Ghi đè file dữ liệu của file đang mở -> nhật ký đã được gộp, file này thành gốc mới
+            if self.journal is not None and filepath == self.save_path():
+                self.journal.clear()
+                self._unclean_mark = None
+                self._rebase(filepath, self._id_runs())
                 
         except Exception as e:
             print(f"Lỗi khi lưu file: {e}")
             raise e # Ném lỗi để bên App.py hiển thị popup thông báo
         
         return filepath
-
-    def clean_data(self):
-
-        data = self.df.copy()
+    
+    def needs_compaction(self):
+        """Nhật ký đã vượt ngưỡng hoặc có hoàn tác làm sạch chưa ghi vào file -> nên gộp vào file dữ liệu"""
+        return self.journal is not None and (
+            self.journal.size() > self.JOURNAL_COMPACT_BYTES or self._unclean_mark is not None
+        )
+    
+    def snapshot_for_save(self):
+        """
+        Chụp trạng thái hiện tại để luồng nền ghi file (chạy trên luồng giao diện).
+        Trả về: (bản sao DataFrame, đường dẫn đích, mốc = (vị trí hiện tại của nhật ký, mã dòng))
+        """
+        mark = self.journal.mark() if self.journal is not None else 0
+        return self._workbook_frames(self.df.copy()), self.save_path(), (mark, self._id_runs())
+    
+    def finish_save(self, filepath, mark):
+        """
+        Gọi sau khi luồng nền ghi xong bản chụp (chạy trên luồng giao diện):
+        file vừa ghi thành gốc mới, chỉ giữ lại các thao tác phát sinh sau thời điểm chụp.
+        """
+        if self.journal is None or filepath != self.save_path():
+            return
+        mark, runs = mark
+        if self._unclean_mark is not None and mark >= self._unclean_mark:
+            self._unclean_mark = None
+        self._rebase(filepath, runs)
+        self.journal.truncate_before(mark, self._journal_base)
+    
+    @profiled(rows=lambda self, *_: len(self.df))
+    def clean_data(self, persist=True):
+        """
+        Làm sạch dữ liệu (xem module cleaning): xóa dòng thiếu khóa/trùng lặp,
+        điền giá trị thiếu, chuẩn hóa chuỗi, sửa số âm.
+        persist=True: lưu ngay ra file; False: chỉ ghi vào nhật ký, người gọi tự lưu sau.
+        Trả về: CleaningReport
+        """
+        self._require_in_memory("làm sạch dữ liệu")
+        # Bản nông giữ lại các cột cũ (copy-on-write) để tính thay đổi cho Hoàn tác
+        before = self.df.copy(deep=False)
+        self.df, report = clean_frame(self.df)
+        if not self._replaying:
+            self._remember(diff_clean(before, self.df))
+        del before
+        self.indexes.reset()
+        self.moments.reset()
+        self._bump_version()
         
-        # Hàm dropna() loại bỏ các dòng có giá trị null
-        # Nếu PassengerId hoặc Survived bị null -> Xóa dòng đó
-        data = data.dropna(subset=['PassengerId', 'Survived'])
-
-        # Danh sách các cột số nguyên (Int) cần điền 0
-        columns_int = ['SibSp', 'Parch']
-
-        for col in columns_int:
-            if col in data.columns:
-                # Điền giá trị thiếu bằng 0
-                data[col] = data[col].fillna(0)
-
-        # Danh sách các cột cần điền giá trị trung vị (Hàm median tự động bỏ qua NaN)
-        columns_median = ['Age', 'Fare']
-        for col in columns_median:
-            if col in data.columns:
-                data[col] = data[col].fillna(data[col].median())
-
-        # Danh sách các cột điền giá trị phổ biến nhất     
-        columns_mode = ['Pclass', 'Embarked']
-        for col in columns_mode:
-            if col in data.columns:
-                data[col] = data[col].fillna(data[col].mode()[0])
-
-        # Danh sách cột chuỗi có thể thiếu dữ liệu
-        string_cols = ['Name', 'Sex', 'Cabin', 'Embarked', 'Ticket']
-
-        # Điền chuỗi "no_info" vào các ô trống
-        for col in string_cols:
-            if col in data.columns:
-                data[col] = data[col].fillna("no_info")
+        # Bảng thay đổi toàn bộ -> người gọi làm mới cả bảng
+        self._changes = self._empty_changes()
         
-        #Hàm loại bỏ các bản ghi trùng lặp dựa PassengerId và trả về DataFrame đã được làm sạch
-        data = data.drop_duplicates(subset=['PassengerId'], keep='first') 
-
-        # Định dạng cột Sex thành chữ thường
-        if 'Sex' in data.columns:
-            # Ép kiểu chuỗi -> Chuyển chữ thường -> Cắt khoảng trắng thừa
-            data['Sex'] = data['Sex'].astype(str).str.lower().str.strip()
-
-        # Định dạng cột Embarked thành chữ hoa
-        if 'Embarked' in data.columns:
-            # Ép kiểu chuỗi -> Chuyển chữ HOA -> Cắt khoảng trắng thừa
-            data['Embarked'] = data['Embarked'].astype(str).str.upper().str.strip()
-
-        # Chuyển đổi cột Age sang kiểu số nguyên (Integer)
-        if 'Age' in data.columns:
-            data['Age'] = data['Age'].astype(int)
-
-        # Chuyển đổi PassengerId sang kiểu chuỗi (String)
-        if 'PassengerId' in data.columns:
-            data['PassengerId'] = data['PassengerId'].astype(str)
-
-        # Danh sách các cột số lượng bắt buộc phải dương
-        cols_pos = ['Fare', 'SibSp', 'Parch']
-
-        for col in cols_pos:
-            if col in data.columns:
-                # Lấy trị tuyệt đối cho toàn bộ cột
-                data[col] = data[col].abs()
-        
-        # Lưu vào file csv, xlsx/xls tương ứng
-        self.df = data
-        self.save_file()
-
+        if persist:
+            # Lưu vào file csv, xlsx/xls tương ứng
+            self.save_file()
+        else:
+            self._log({"op": "clean"})
+        return report
+    
+    def _remember(self, delta):
+        """Lưu thay đổi vào lịch sử (bỏ qua khi đang phát lại nhật ký)"""
+        if self._replaying:
+            return
+        self._remembered = delta
+        if self._history_mode == "undo":
+            self.history.push(delta, redo=True)
+        else:
+            # Làm lại không làm mất các bước Làm lại còn lại
+            self.history.push(delta, clear_redo=self._history_mode is None)
+    
+    def _revert(self, delta):
+        """Thực hiện thao tác ngược của delta (thao tác ngược lại được ghi vào lịch sử)"""
+        op = delta["op"]
+        if op == "insert":
+            self.delete_row(delta["id"])
+        elif op == "delete":
+            self._restore_row(delta["id"], delta["row"])
+        elif op == "update":
+            self.update_row(delta["id"], delta["old"])
+        elif op == "clean":
+            self._unclean(delta)
+        elif op == "unclean":
+            self.clean_data(persist=False)
+    
+    def _unclean(self, delta):
+        """
+        Đưa dữ liệu về trước lần làm sạch. Không ghi file ở đây (lưu nền đảm nhận): nhật ký nhận
+        bản ghi "unclean", khi phát lại sẽ đưa dữ liệu về bản chụp trước lần làm sạch tương ứng.
+        Nếu lần làm sạch đã nằm trong file gốc, nhật ký không phát lại được -> needs_compaction()
+        báo cần gộp ngay cho tới khi file dữ liệu được ghi lại (xem finish_save).
+        """
+        self._restore_frame(undo_clean(self.df, delta))
+        self._remember({"op": "unclean"})
+        self._log({"op": "unclean"})
+        if self.journal is not None:
+            self._unclean_mark = self.journal.mark()
+    
+    def _restore_frame(self, df):
+        """Thay toàn bộ dữ liệu (hoàn tác làm sạch), bảng được làm mới toàn bộ"""
+        self.df = df
+        self.indexes.reset()
+        self.moments.reset()
+        self._bump_version()
+        self._changes = self._empty_changes()
+    
+    def undo(self):
+        """Hoàn tác thao tác gần nhất. Trả về: mô tả thao tác, hoặc None nếu không còn gì để hoàn tác"""
+        return self._step("undo")
+    
+    def redo(self):
+        """Làm lại thao tác vừa hoàn tác. Trả về: mô tả thao tác, hoặc None"""
+        return self._step("redo")
+    
+    def _step(self, mode):
+        self._require_in_memory("hoàn tác / làm lại")
+        delta = self.history.pop_undo() if mode == "undo" else self.history.pop_redo()
+        if delta is None:
+            return None
+        self._history_mode = mode
+        self._remembered = None
+        try:
+            self._revert(delta)
+        finally:
+            self._history_mode = None
+        # Ngăn Làm lại giữ thao tác ngược -> mô tả thao tác thuận vừa được ghi lại vào ngăn Hoàn tác
+        return describe(delta if mode == "undo" else self._remembered)
@@ -0,0 +1,73 @@
+"""
+Module Density - Ước lượng mật độ nhanh cho dữ liệu lớn
+Gom dữ liệu vào lưới cố định (linear binning) rồi tích chập với nhân Gaussian bằng FFT:
+chi phí O(số dòng + kích thước lưới * log) thay vì O(số dòng * kích thước lưới)
+"""
+
+import numpy as np
+
+
+# Số điểm của lưới gom dữ liệu (mịn hơn nhiều so với băng thông để sai số nhỏ)
+BIN_GRID_SIZE = 2048
+
+
+def linear_binning(values, lo, hi, gridsize, groups=None, n_groups=1):
+    """
+    Gom dữ liệu vào lưới đều [lo, hi]: mỗi giá trị chia trọng số cho hai điểm lưới kề nhau
+    theo khoảng cách. groups (mã nhóm 0..n_groups-1) cho phép gom mọi nhóm trong một lần duyệt.
+    Trả về: ma trận (n_groups, gridsize) trọng số tại các điểm lưới
+    """
+    delta = (hi - lo) / (gridsize - 1)
+    pos = (values - lo) / delta
+    left = np.clip(np.floor(pos).astype(np.int64), 0, gridsize - 2)
+    frac = np.clip(pos - left, 0.0, 1.0)
+    if groups is None:
+        groups = np.zeros(len(values), dtype=np.int64)
+    idx = groups * gridsize + left
+    size = n_groups * gridsize
+    counts = np.bincount(idx, weights=1.0 - frac, minlength=size)
+    counts += np.bincount(idx + 1, weights=frac, minlength=size)
+    return counts.reshape(n_groups, gridsize)
+
+
+def fft_convolve_gaussian(counts, delta, bandwidths):
+    """
+    Tích chập từng dòng của counts với nhân Gaussian có băng thông tương ứng (qua FFT).
+    Nhân được cắt ở 4 lần băng thông; đệm đủ để không bị chồng lấn vòng.
+    """
+    n_groups, gridsize = counts.shape
+    bandwidths = np.asarray(bandwidths, dtype="float64")
+    half = int(min(gridsize - 1, np.ceil(4 * bandwidths.max() / delta)))
+    size = 1 << int(np.ceil(np.log2(gridsize + 2 * half)))
+
+    offsets = np.arange(-half, half + 1) * delta
+    kernels = np.exp(-0.5 * (offsets[None, :] / bandwidths[:, None]) ** 2) \
+        / (bandwidths[:, None] * np.sqrt(2 * np.pi))
+
+    smoothed = np.fft.irfft(np.fft.rfft(counts, size, axis=1) * np.fft.rfft(kernels, size, axis=1),
+                            size, axis=1)
+    return smoothed[:, half:half + gridsize]
+
+
+def binned_kde(values, grid, bandwidth, groups=None, n_groups=1, bin_gridsize=BIN_GRID_SIZE):
+    """
+    KDE Gaussian xấp xỉ tại các điểm grid.
+    Với groups: bandwidth là mảng theo nhóm, trả về ma trận (n_groups, len(grid)) mật độ của
+    từng nhóm (mỗi nhóm chuẩn hóa theo số phần tử của nhóm đó); không có groups trả về một mảng.
+    """
+    bandwidths = np.broadcast_to(np.asarray(bandwidth, dtype="float64"), (n_groups,))
+    lo, hi = grid[0], grid[-1]
+    if hi <= lo:
+        # Lưới không có độ rộng (mọi giá trị bằng nhau, cut=0) -> gom trên khoảng ± băng thông
+        lo, hi = lo - bandwidths.max(), hi + bandwidths.max()
+    counts = linear_binning(values, lo, hi, bin_gridsize, groups, n_groups)
+    delta = (hi - lo) / (bin_gridsize - 1)
+    smoothed = fft_convolve_gaussian(counts, delta, bandwidths)
+
+    sizes = counts.sum(axis=1, keepdims=True)
+    smoothed = smoothed / np.where(sizes > 0, sizes, 1)
+
+    # Nội suy từ lưới gom về lưới cần vẽ
+    bin_grid = np.linspace(lo, hi, bin_gridsize)
+    result = np.vstack([np.interp(grid, bin_grid, row) for row in smoothed])
+    return result if groups is not None else result[0]
@@ -0,0 +1,120 @@
+"""
+Module Dtypes - Tối ưu kiểu dữ liệu để giảm bộ nhớ
+Chuỗi ít giá trị khác nhau -> category, số nguyên/thực -> kiểu nhỏ nhất đủ chứa,
+số thực có NaN nhưng toàn giá trị nguyên -> kiểu số nguyên cho phép rỗng (Int8, Int16...)
+"""
+
+import numpy as np
+import pandas as pd
+
+
+# Cột chuỗi có tỉ lệ số giá trị khác nhau / số dòng không vượt quá ngưỡng -> category
+CATEGORY_MAX_RATIO = 0.5
+
+_INT_TYPES = [np.int8, np.int16, np.int32, np.int64]
+
+
+def _smallest_int(min_value, max_value):
+    """Kiểu số nguyên nhỏ nhất chứa được khoảng [min_value, max_value]"""
+    for int_type in _INT_TYPES:
+        info = np.iinfo(int_type)
+        if info.min <= min_value and max_value <= info.max:
+            return int_type
+    return np.int64
+
+
+def _compact_series(series):
+    """Trả về cột với kiểu gọn hơn, hoặc None nếu không nên đổi"""
+    dtype = series.dtype
+    if isinstance(dtype, pd.CategoricalDtype) or pd.api.types.is_bool_dtype(dtype):
+        return None
+
+    if pd.api.types.is_integer_dtype(dtype):
+        if series.isna().all():
+            return None
+        int_type = _smallest_int(series.min(), series.max())
+        nullable = isinstance(dtype, pd.api.extensions.ExtensionDtype)
+        target = pd.api.types.pandas_dtype(np.dtype(int_type).name.capitalize()) if nullable \
+            else np.dtype(int_type)
+        return None if target == dtype else series.astype(target)
+
+    if pd.api.types.is_float_dtype(dtype):
+        values = series.dropna()
+        if len(values) == 0:
+            return None
+        if (values == np.round(values)).all() and values.abs().max() < 2 ** 53:
+            # Toàn số nguyên (NaN chỉ vì thiếu dữ liệu) -> số nguyên cho phép rỗng
+            int_type = _smallest_int(values.min(), values.max())
+            return series.astype(np.dtype(int_type).name.capitalize())
+        if dtype == np.float64:
+            # Chỉ hạ xuống float32 khi không mất độ chính xác
+            as_float32 = values.astype(np.float32)
+            if (as_float32.astype(np.float64) == values).all():
+                return series.astype(np.float32)
+        return None
+
+    if pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype):
+        if len(series) and series.nunique(dropna=True) <= CATEGORY_MAX_RATIO * len(series):
+            return series.astype("category")
+    return None
+
+
+def compact_dtypes(df):
+    """
+    Đổi kiểu từng cột của DataFrame sang kiểu gọn nhất (thay trực tiếp từng cột).
+    Trả về: (DataFrame, báo cáo {"before": byte, "after": byte, "columns": {cột: (kiểu cũ, kiểu mới)}})
+    """
+    before = int(df.memory_usage(deep=True).sum())
+    changed = {}
+    for col in df.columns:
+        compacted = _compact_series(df[col])
+        if compacted is not None:
+            changed[col] = (str(df[col].dtype), str(compacted.dtype))
+            df[col] = compacted
+    after = int(df.memory_usage(deep=True).sum())
+    return df, {"before": before, "after": after, "columns": changed}
+
+
+def fit_value(series, value):
+    """
+    Đảm bảo cột chứa được value trước khi gán (thêm category mới, nới kiểu số nguyên...).
+    Trả về: cột đã đổi kiểu, hoặc None nếu cột hiện tại đã chứa được.
+    """
+    dtype = series.dtype
+    missing = value is None or (isinstance(value, float) and np.isnan(value))
+
+    if isinstance(dtype, pd.CategoricalDtype):
+        if missing or value in dtype.categories:
+            return None
+        return series.cat.add_categories([value])
+
+    if pd.api.types.is_integer_dtype(dtype):
+        nullable = isinstance(dtype, pd.api.extensions.ExtensionDtype)
+        if missing:
+            # Số nguyên numpy không chứa được rỗng -> kiểu cho phép rỗng cùng độ rộng
+            return None if nullable else series.astype(dtype.name.capitalize())
+        if isinstance(value, (bool, np.bool_)):
+            return None
+        if isinstance(value, (int, np.integer)):
+            info = np.iinfo(dtype.numpy_dtype if nullable else dtype)
+            if info.min <= value <= info.max:
+                return None
+            return series.astype("Int64" if nullable else np.int64)
+        if isinstance(value, (float, np.floating)):
+            if float(value).is_integer() and np.iinfo(np.int64).min <= value <= np.iinfo(np.int64).max:
+                return fit_value(series, int(value))
+            return series.astype("Float64" if nullable else np.float64)
+        return series.astype(object)
+
+    if pd.api.types.is_float_dtype(dtype):
+        if missing or isinstance(value, (int, float, np.number)):
+            return None
+        return series.astype(object)
+
+    if pd.api.types.is_string_dtype(dtype) and not pd.api.types.is_object_dtype(dtype):
+        # Cột kiểu str chỉ nhận chuỗi -> giá trị khác (VD: số vé nhập thành số) cần cột object
+        if missing or isinstance(value, str):
+            return None
+        return series.astype(object)
+
+    return None
@@ -0,0 +1,763 @@
+"""
+Module ExcelIO - Đọc/ghi file Excel .xlsx theo luồng, không dựng mô hình workbook trong bộ nhớ
+File .xlsx là file zip chứa XML; mỗi sheet là một file XML liệt kê các ô theo dòng.
+    Đọc: giải nén từng khối XML của sheet, tách ô và lấy kiểu/giá trị bằng biểu thức chính quy
+         của pyarrow (chạy trong C++ trên cả khối), dựng thẳng thành các cột của DataFrame
+    Ghi: dựng XML của từng khối dòng theo cột (pyarrow) rồi ghi nối vào file zip; chuỗi được ghi
+         trực tiếp trong ô (inline) nên không cần bảng chuỗi dùng chung
+Bộ nhớ chỉ gồm một khối XML và dữ liệu của các cột. Không có pyarrow: dùng openpyxl ở chế độ
+read-only / write-only (cũng không giữ cả workbook, nhưng chậm hơn nhiều vì xử lý từng ô).
+Nhiều sheet được đọc song song bằng luồng (pyarrow và zlib nhả GIL khi làm việc).
+Quy ước giống openpyxl: số không có dấu chấm là số nguyên, ô chữ giữ nguyên là chuỗi,
+dòng trống ở giữa được giữ (toàn ô trống), tên cột trùng được đánh số như pandas (a, a.1).
+"""
+
+import concurrent.futures
+import datetime
+import html
+import posixpath
+import re
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    HAS_ARROW = True
+except ImportError:
+    HAS_ARROW = False
+
+
+# Số byte XML (đã giải nén) mỗi lần đọc và số dòng mỗi khối khi ghi
+BLOCK_BYTES = 8 * 1024 * 1024
+WRITE_CHUNK_ROWS = 50000
+
+# Mức nén zip khi ghi (1: nhanh nhất; XML lặp nhiều nên file vẫn nhỏ)
+COMPRESS_LEVEL = 1
+
+_MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_XML_HEADER = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+# Mã định dạng số có sẵn của Excel là ngày giờ
+_DATE_FORMAT_IDS = set(range(14, 23)) | {45, 46, 47}
+
+# Loại ô khi đọc
+_NUM, _SHARED, _TEXT, _INLINE, _BOOL, _ERROR, _ISO_DATE, _DATE = range(8)
+_CELL_TYPES = {None: _NUM, "n": _NUM, "s": _SHARED, "str": _TEXT, "inlineStr": _INLINE,
+               "b": _BOOL, "e": _ERROR, "d": _ISO_DATE}
+_STRING_KINDS = {_SHARED, _TEXT, _INLINE}
+
+# Biểu thức tách thuộc tính / giá trị của một ô (áp lên đoạn XML ngay sau "<c ").
+# _CELL khớp cách ghi thông dụng (thuộc tính theo thứ tự r, s, t như Excel/openpyxl) trong một lượt;
+# các đoạn không khớp mới dùng các biểu thức riêng cho từng phần
+_CELL = (r'^r="(?P<col>[A-Z]+)(?P<row>[0-9]+)"(?: s="(?P<s>[0-9]+)")?(?: t="(?P<t>[A-Za-z]+)")? ?'
+         r'(?:/>|>(?:<f\b[^>]*/>|<f\b[^>]*>[^<]*</f>)?'
+         r'(?:<v>(?P<v>[^<]*)</v>|<is><t\b[^>]*>(?P<is>[^<]*)</t></is>)?</c>)')
+_REF = r'^[^>]*?\br="(?P<col>[A-Z]+)(?P<row>[0-9]+)"'
+_TYPE = r'^[^>]*?\bt="(?P<t>[A-Za-z]+)"'
+_STYLE = r'^[^>]*?\bs="(?P<s>[0-9]+)"'
+_VALUE = r'^[^>]*[^/]>(?:<f\b[^>]*/>|<f\b[^>]*>[^<]*</f>)?<v>(?P<v>[^<]*)</v>'
+_INLINE_TEXT = r'^[^>]*[^/]><is><t\b[^>]*>(?P<t>[^<]*)</t></is>'
+_TEXT_RUN = re.compile(r'<t\b[^>]*>([^<]*)</t>')
+_PHONETIC = re.compile(r'<rPh\b.*?</rPh>', re.S)
+_ILLEGAL_XML = r'[\x00-\x08\x0b\x0c\x0e-\x1f]'
+
+# Chuỗi được hiểu là ô trống (giống giá trị mặc định na_values của pandas)
+NA_STRINGS = {"", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+              "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null"}
+
+
+class UnsupportedSheet(ValueError):
+    """Sheet có cấu trúc bộ đọc nhanh không xử lý (VD: ô không ghi tọa độ)"""
+
+
+def column_letter(index):
+    """Chỉ số cột (0, 1, ...) -> chữ cái cột Excel (A, B, ..., AA)"""
+    letters = ""
+    index += 1
+    while index:
+        index, rest = divmod(index - 1, 26)
+        letters = chr(65 + rest) + letters
+    return letters
+
+
+def column_index(letters):
+    """Chữ cái cột Excel -> chỉ số cột (A -> 0)"""
+    index = 0
+    for char in letters:
+        index = index * 26 + ord(char) - 64
+    return index - 1
+
+
+def _attr(tag, name):
+    match = re.search(r'\b' + name + r'="([^"]*)"', tag)
+    return html.unescape(match.group(1)) if match else None
+
+
+def _is_date_format(code):
+    """Chuỗi định dạng số có phải ngày giờ không (bỏ phần trong ngoặc kép / ngoặc vuông)"""
+    code = re.sub(r'"[^"]*"|\[[^\]]*\]|\\.|_.|\*.', "", code)
+    return code.lower() != "general" and re.search(r'[dmyhs]', code, re.I) is not None
+
+
+class Workbook:
+    """File .xlsx mở để đọc: danh sách sheet, bảng chuỗi dùng chung và các kiểu ô ngày giờ"""
+
+    def __init__(self, path):
+        self.path = path
+        self._zip = zipfile.ZipFile(path)
+        names = set(self._zip.namelist())
+
+        workbook = self._zip.read("xl/workbook.xml").decode("utf-8")
+        targets = {}
+        shared_path, styles_path = "xl/sharedStrings.xml", "xl/styles.xml"
+        if "xl/_rels/workbook.xml.rels" in names:
+            rels = self._zip.read("xl/_rels/workbook.xml.rels").decode("utf-8")
+            for tag in re.findall(r'<Relationship\b[^>]*>', rels):
+                target = _attr(tag, "Target")
+                target = target.lstrip("/") if target.startswith("/") else posixpath.normpath("xl/" + target)
+                kind = _attr(tag, "Type").rsplit("/", 1)[-1]
+                if kind == "worksheet":
+                    targets[_attr(tag, "Id")] = target
+                elif kind == "sharedStrings":
+                    shared_path = target
+                elif kind == "styles":
+                    styles_path = target
+
+        # {tên sheet: file XML trong zip}, theo thứ tự trong workbook
+        self.sheets = {}
+        for tag in re.findall(r'<sheet\b[^>]*>', workbook):
+            rel_id = re.search(r'\b[\w]+:id="([^"]*)"', tag)
+            target = targets.get(rel_id.group(1)) if rel_id else None
+            if target in names:
+                self.sheets[_attr(tag, "name")] = target
+
+        date1904 = re.search(r'<workbookPr\b[^>]*\bdate1904="(1|true)"', workbook)
+        self.epoch = pd.Timestamp("1904-01-01" if date1904 else "1899-12-30")
+        self._shared_path = shared_path if shared_path in names else None
+        self._shared = None
+        self.date_styles = self._read_date_styles(styles_path) if styles_path in names else set()
+
+    def close(self):
+        self._zip.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _read_date_styles(self, styles_path):
+        """Chỉ số kiểu ô (thuộc tính s) có định dạng ngày giờ"""
+        styles = self._zip.read(styles_path).decode("utf-8")
+        formats = {int(_attr(tag, "numFmtId")): _attr(tag, "formatCode") or ""
+                   for tag in re.findall(r'<numFmt\b[^>]*>', styles)}
+        cell_xfs = re.search(r'<cellXfs\b[^>]*>(.*?)</cellXfs>', styles, re.S)
+        date_styles = set()
+        if cell_xfs:
+            for index, tag in enumerate(re.findall(r'<xf\b[^>]*>', cell_xfs.group(1))):
+                format_id = int(_attr(tag, "numFmtId") or 0)
+                if format_id in _DATE_FORMAT_IDS or (format_id in formats and _is_date_format(formats[format_id])):
+                    date_styles.add(index)
+        return date_styles
+
+    def shared_strings(self):
+        """Bảng chuỗi dùng chung (mảng numpy object), đọc một lần khi cần"""
+        if self._shared is None:
+            strings = []
+            if self._shared_path is not None:
+                text = self._zip.read(self._shared_path).decode("utf-8")
+                for item in re.findall(r'<si>(.*?)</si>|<si/>', text, re.S):
+                    if "<rPh" in item:
+                        item = _PHONETIC.sub("", item)
+                    value = html.unescape("".join(_TEXT_RUN.findall(item)))
+                    strings.append(np.nan if value in NA_STRINGS else value)
+            self._shared = np.array(strings, dtype=object)
+        return self._shared
+
+    def sheet_size(self, sheet):
+        """Số byte XML (đã giải nén) của sheet, để tính tiến độ"""
+        return self._zip.getinfo(self.sheets[sheet]).file_size
+
+    def iter_blocks(self, sheet):
+        """(khối XML gồm các dòng trọn vẹn của sheetData, số byte đã giải nén)"""
+        carry = b""
+        started = False
+        read_bytes = 0
+        with self._zip.open(self.sheets[sheet]) as f:
+            while True:
+                data = f.read(BLOCK_BYTES)
+                read_bytes += len(data)
+                buffer = carry + data
+                if not started:
+                    start = buffer.find(b"<sheetData")
+                    if start < 0:
+                        carry = buffer[-16:]
+                        if not data:
+                            return
+                        continue
+                    buffer = buffer[start:]
+                    started = True
+                end = buffer.find(b"</sheetData>")
+                if end >= 0:
+                    yield buffer[:end].decode("utf-8"), read_bytes
+                    return
+                if not data:
+                    yield buffer.decode("utf-8"), read_bytes
+                    return
+                cut = buffer.rfind(b"</row>")
+                if cut < 0:
+                    carry = buffer
+                    continue
+                cut += len(b"</row>")
+                carry = buffer[cut:]
+                yield buffer[:cut].decode("utf-8"), read_bytes
+
+
+def _unescape(values):
+    """
+    Giải mã thực thể XML (&amp;...) trong mảng chuỗi pyarrow -> mảng numpy object
+    (chuỗi thuộc NA_STRINGS -> NaN)
+    """
+    escaped = pc.match_substring(values, "&").to_numpy(zero_copy_only=False)
+    missing = pc.is_in(values, value_set=pa.array(sorted(NA_STRINGS))).to_numpy(zero_copy_only=False)
+    values = values.to_numpy(zero_copy_only=False)
+    if escaped.any():
+        values[escaped] = [html.unescape(value) for value in values[escaped]]
+        missing |= escaped & np.isin(values, list(NA_STRINGS))
+    if missing.any():
+        values[missing] = np.nan
+    return values
+
+
+def _number(text):
+    """Giá trị số của một ô (như openpyxl: không có dấu chấm / số mũ là số nguyên)"""
+    if "." in text or "e" in text or "E" in text:
+        return float(text)
+    return int(text)
+
+
+def _excel_dates(epoch, days):
+    """
+    Số ngày Excel (mảng số thực) -> thời điểm, như openpyxl: phần lẻ của ngày làm tròn tới mili giây.
+    Tách phần nguyên để không mất độ chính xác khi đổi cả số ngày sang nano giây.
+    """
+    whole = np.floor(days)
+    millis = np.round((days - whole) * 86400000)
+    return epoch + pd.to_timedelta(whole, unit="D") + pd.to_timedelta(millis, unit="ms")
+
+
+def _dedupe_names(names):
+    """Tên cột trùng -> thêm hậu tố .1, .2 như pandas.read_csv (bỏ qua hậu tố trùng tên cột khác)"""
+    names = list(names)
+    counts = {}
+    for i, name in enumerate(names):
+        count = counts.get(name, 0)
+        if count:
+            renamed = name
+            while count:
+                counts[name] = count + 1
+                renamed = f"{name}.{count}"
+                count = count + 1 if renamed in names else counts.get(renamed, 0)
+            names[i] = renamed
+        counts[names[i]] = count + 1
+    return names
+
+
+class _SheetParser:
+    """Dựng DataFrame từ các khối XML của một sheet (dòng đầu tiên có dữ liệu là tiêu đề)"""
+
+    def __init__(self, book):
+        self.book = book
+        self.header = None      # {chỉ số cột: tên cột}
+        self.next_row = None    # Số dòng Excel của dòng dữ liệu tiếp theo
+
+    def columns(self):
+        """Tên các cột theo tiêu đề (cột giữa không có tiêu đề -> Unnamed: i)"""
+        if not self.header:
+            return {}
+        width = max(self.header) + 1
+        names = [self.header.get(i) for i in range(width)]
+        names = [f"Unnamed: {i}" if name is None or name == "" else name for i, name in enumerate(names)]
+        return dict(zip(range(width), _dedupe_names(names)))
+
+    def parse(self, block):
+        """Một khối XML -> DataFrame các dòng của khối (None nếu khối không có dòng dữ liệu)"""
+        if "<c>" in block:
+            raise UnsupportedSheet("Ô không có thuộc tính")
+        segments = pc.split_pattern(pa.array([block]), "<c ").flatten()[1:]
+        if not len(segments):
+            return None
+
+        letters, rows, styles, types, value, inline = self._fields(segments)
+
+        kinds = self._kinds(types, styles)
+        inline_kind = kinds == _INLINE
+        has_value = (value.is_valid().to_numpy(zero_copy_only=False)
+                     | inline.is_valid().to_numpy(zero_copy_only=False))
+        rich = inline_kind & ~has_value
+        if rich.any():
+            rich &= pc.match_substring(segments, "<is>").to_numpy(zero_copy_only=False)
+        if rich.any():
+            # Chuỗi inline nhiều đoạn định dạng -> ghép các đoạn bằng Python
+            segments_np = segments.to_numpy(zero_copy_only=False)
+            inline_np = inline.to_numpy(zero_copy_only=False)
+            for i in np.flatnonzero(rich):
+                inline_np[i] = "".join(_TEXT_RUN.findall(segments_np[i].split("</c>", 1)[0]))
+            inline = pa.array(inline_np, type=pa.string())
+            has_value |= rich
+        has_value &= kinds != _ERROR
+        if not has_value.any():
+            return None
+        if letters.null_count and not letters.is_valid().to_numpy(zero_copy_only=False)[has_value].all():
+            raise UnsupportedSheet("Ô không ghi tọa độ")
+
+        keep = np.flatnonzero(has_value)
+        rows = pc.cast(rows.take(pa.array(keep)), pa.int64()).to_numpy(zero_copy_only=False)
+        letters = pc.dictionary_encode(letters.take(pa.array(keep)))
+        letter_index = np.array([column_index(letter) for letter in letters.dictionary.to_pylist()], dtype=np.int64)
+        cols = letter_index[letters.indices.to_numpy(zero_copy_only=False)]
+        kinds = kinds[keep]
+        value = value.take(pa.array(keep))
+        inline = inline.take(pa.array(keep))
+
+        if self.header is None:
+            first = rows.min()
+            at_header = rows == first
+            self.header = {int(col): self._python_value(kind, value[i].as_py(), inline[i].as_py())
+                           for i, col, kind in zip(np.flatnonzero(at_header), cols[at_header], kinds[at_header])}
+            self.next_row = first + 1
+            data = ~at_header
+            if not data.any():
+                return None
+            rows, cols, kinds = rows[data], cols[data], kinds[data]
+            value = value.filter(pa.array(data))
+            inline = inline.filter(pa.array(data))
+
+        n_rows = int(rows.max()) - self.next_row + 1
+        positions = rows - self.next_row
+        self.next_row += n_rows
+
+        names = self.columns()
+        data = {}
+        order = np.argsort(cols, kind="stable")
+        unique_cols, starts = np.unique(cols[order], return_index=True)
+        bounds = np.append(starts, len(order))
+        for i, col in enumerate(unique_cols):
+            idx = order[bounds[i]:bounds[i + 1]]
+            data[int(col)] = self._column(kinds[idx], positions[idx], value, inline, idx, n_rows)
+
+        width = max(max(names, default=-1), int(unique_cols.max())) + 1
+        frame = {}
+        for col in range(width):
+            name = names.get(col, f"Unnamed: {col}")
+            frame[name] = data[col] if col in data else np.full(n_rows, np.nan)
+        return pd.DataFrame(frame)
+
+    @staticmethod
+    def _fields(segments):
+        """Các phần của từng ô: (cột, dòng, kiểu định dạng, loại, giá trị, chuỗi inline); thiếu -> null"""
+        cells = pc.extract_regex(segments, _CELL)
+        # struct_field giữ cả null của struct (đoạn không khớp), khác StructArray.field;
+        # nhóm tùy chọn không khớp cho chuỗi rỗng -> đổi thành null
+        empty = pa.scalar(None, pa.string())
+        fields = [pc.struct_field(cells, [i]) for i in range(6)]
+        fields[2:] = [pc.if_else(pc.equal(pc.utf8_length(field), 0), empty, field) for field in fields[2:]]
+        unmatched = cells.is_null()
+        if not pc.any(unmatched).as_py():
+            return fields
+        rest = segments.filter(unmatched)
+        extra = [pc.struct_field(pc.extract_regex(rest, _REF), [0]),
+                 pc.struct_field(pc.extract_regex(rest, _REF), [1]),
+                 pc.struct_field(pc.extract_regex(rest, _STYLE), [0]),
+                 pc.struct_field(pc.extract_regex(rest, _TYPE), [0]),
+                 pc.struct_field(pc.extract_regex(rest, _VALUE), [0]),
+                 pc.struct_field(pc.extract_regex(rest, _INLINE_TEXT), [0])]
+        return [pc.replace_with_mask(field, unmatched, replacement) for field, replacement in zip(fields, extra)]
+
+    def _kinds(self, types, styles):
+        """Loại của từng ô (_NUM, _SHARED, ...); ô số có kiểu định dạng ngày giờ -> _DATE"""
+        encoded = pc.dictionary_encode(types)
+        codes = np.array([_CELL_TYPES.get(t, _TEXT) for t in encoded.dictionary.to_pylist()] + [_NUM],
+                         dtype=np.int8)
+        indices = encoded.indices.fill_null(len(codes) - 1).to_numpy(zero_copy_only=False)
+        kinds = codes[indices]
+        if self.book.date_styles and styles.null_count < len(styles):
+            styles = pc.dictionary_encode(styles)
+            is_date = np.array([int(s) in self.book.date_styles for s in styles.dictionary.to_pylist()] + [False])
+            dated = is_date[styles.indices.fill_null(len(is_date) - 1).to_numpy(zero_copy_only=False)]
+            kinds[dated & (kinds == _NUM)] = _DATE
+        return kinds
+
+    def _python_value(self, kind, text, inline_text):
+        """Giá trị Python của một ô"""
+        if kind == _INLINE:
+            text = html.unescape(inline_text) if inline_text is not None else None
+            return None if text in NA_STRINGS else text
+        if text is None:
+            return None
+        if kind == _NUM:
+            return _number(text)
+        if kind == _SHARED:
+            text = self.book.shared_strings()[int(text)]
+            return None if pd.isna(text) else text
+        if kind == _TEXT:
+            text = html.unescape(text)
+            return None if text in NA_STRINGS else text
+        if kind == _BOOL:
+            return text == "1"
+        if kind == _DATE:
+            return _excel_dates(self.book.epoch, np.array([float(text)]))[0]
+        if kind == _ISO_DATE:
+            return pd.Timestamp(text)
+        return None
+
+    def _column(self, kinds, positions, value, inline, idx, n_rows):
+        """Mảng giá trị của một cột trong khối (ô trống -> NaN)"""
+        present = set(np.unique(kinds).tolist())
+        if present == {_NUM}:
+            texts = value.take(pa.array(idx))
+            if len(idx) == n_rows and not pc.any(pc.match_substring_regex(texts, "[.eE]")).as_py():
+                try:
+                    result = np.empty(n_rows, dtype=np.int64)
+                    result[positions] = pc.cast(texts, pa.int64()).to_numpy(zero_copy_only=False)
+                    return result
+                except pa.ArrowInvalid:
+                    pass  # Vượt giới hạn int64 -> số thực
+            result = np.full(n_rows, np.nan)
+            result[positions] = pc.cast(texts, pa.float64()).to_numpy(zero_copy_only=False)
+            return result
+        if present == {_DATE}:
+            days = pc.cast(value.take(pa.array(idx)), pa.float64()).to_numpy(zero_copy_only=False)
+            result = pd.Series(pd.NaT, index=range(n_rows), dtype="datetime64[ns]")
+            result.iloc[positions] = _excel_dates(self.book.epoch, days)
+            return result.to_numpy()
+        result = np.full(n_rows, np.nan, dtype=object)
+        if present <= _STRING_KINDS:
+            for kind in present:
+                mask = kinds == kind
+                if kind == _SHARED:
+                    indices = pc.cast(value.take(pa.array(idx[mask])), pa.int64()).to_numpy(zero_copy_only=False)
+                    result[positions[mask]] = self.book.shared_strings()[indices]
+                else:
+                    source = inline if kind == _INLINE else value
+                    result[positions[mask]] = _unescape(source.take(pa.array(idx[mask])))
+            return result
+        # Cột lẫn nhiều loại (số, chữ, ngày, đúng/sai) -> chuyển từng ô
+        texts = value.take(pa.array(idx)).to_pylist()
+        inline_texts = inline.take(pa.array(idx)).to_pylist()
+        for position, kind, text, inline_text in zip(positions, kinds, texts, inline_texts):
+            cell = self._python_value(kind, text, inline_text)
+            if cell is not None:
+                result[position] = cell
+        return result
+
+
+def _finish(frames, parser):
+    """Ghép các khối của một sheet; sheet chỉ có tiêu đề -> DataFrame rỗng có đủ cột"""
+    if not frames:
+        return pd.DataFrame(columns=list(parser.columns().values()))
+    df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+    return df.infer_objects()
+
+
+def sheet_names(path):
+    """Tên các sheet của file .xlsx theo thứ tự"""
+    if not HAS_ARROW:
+        import openpyxl
+        wb = openpyxl.load_workbook(path, read_only=True)
+        try:
+            return list(wb.sheetnames)
+        finally:
+            wb.close()
+    with Workbook(path) as book:
+        return list(book.sheets)
+
+
+def iter_sheet(path, sheet=None, chunksize=50000):
+    """
+    Đọc một sheet (mặc định sheet đầu tiên) theo khối.
+    Trả về (generator): (khối DataFrame khoảng chunksize dòng, tỉ lệ đã đọc 0..1)
+    Các khối chưa suy lại kiểu chung; người gọi ghép rồi gọi infer_objects() (như read_sheet).
+    """
+    if not HAS_ARROW:
+        yield from _iter_sheet_openpyxl(path, sheet, chunksize)
+        return
+    with Workbook(path) as book:
+        if sheet is None:
+            sheet = next(iter(book.sheets), None)
+        if sheet not in book.sheets:
+            raise ValueError(f"Không có sheet '{sheet}' trong file")
+        total = max(1, book.sheet_size(sheet))
+        parser = _SheetParser(book)
+        pending, rows, yielded = [], 0, False
+        try:
+            for block, read_bytes in book.iter_blocks(sheet):
+                frame = parser.parse(block)
+                if frame is not None:
+                    pending.append(frame)
+                    rows += len(frame)
+                if rows >= chunksize:
+                    yield _finish(pending, parser), min(1.0, read_bytes / total)
+                    pending, rows, yielded = [], 0, True
+        except UnsupportedSheet:
+            if yielded:
+                raise
+            # Sheet ghi theo kiểu bộ đọc nhanh không hỗ trợ -> đọc lại bằng openpyxl
+            yield from _iter_sheet_openpyxl(path, sheet, chunksize)
+            return
+        if pending or not yielded:
+            yield _finish(pending, parser), 1.0
+
+
+def _iter_sheet_openpyxl(path, sheet, chunksize):
+    """Đọc sheet bằng openpyxl chế độ read-only, từng dòng gom vào bộ đệm theo cột"""
+    import openpyxl
+
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb[sheet] if sheet is not None else wb.worksheets[0]
+        rows = ws.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            yield pd.DataFrame(), 1.0
+            return
+        names = _dedupe_names([f"Unnamed: {i}" if name is None else name for i, name in enumerate(header)])
+        total_rows = max(1, (ws.max_row or 1) - 1)
+        buffers = [[] for _ in names]
+        read_rows = 0
+        for row in rows:
+            for buffer, cell in zip(buffers, row):
+                buffer.append(cell)
+            for buffer in buffers[len(row):]:
+                buffer.append(None)
+            if buffers and len(buffers[0]) >= chunksize:
+                read_rows += len(buffers[0])
+                yield pd.DataFrame(dict(zip(names, buffers))), min(1.0, read_rows / total_rows)
+                buffers = [[] for _ in names]
+        yield pd.DataFrame(dict(zip(names, buffers)), columns=names), 1.0
+    finally:
+        wb.close()
+
+
+def read_sheet(path, sheet=None):
+    """Đọc cả một sheet (mặc định sheet đầu tiên) thành DataFrame"""
+    frames = [frame for frame, _ in iter_sheet(path, sheet, chunksize=1 << 62)]
+    df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+    return df.infer_objects()
+
+
+def read_sheets(path, sheets=None, workers=None):
+    """
+    Đọc nhiều sheet song song bằng luồng (mặc định tất cả).
+    Trả về: {tên sheet: DataFrame} theo thứ tự sheet trong file
+    """
+    if sheets is None:
+        sheets = sheet_names(path)
+    if len(sheets) <= 1:
+        return {sheet: read_sheet(path, sheet) for sheet in sheets}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers or len(sheets)) as executor:
+        futures = {sheet: executor.submit(read_sheet, path, sheet) for sheet in sheets}
+        return {sheet: future.result() for sheet, future in futures.items()}
+
+
+# --------------------------------------------------------------------------- ghi
+
+# Gốc của số ngày Excel (hệ 1900, khi ghi)
+_EPOCH = pd.Timestamp("1899-12-30")
+
+def _escape(values):
+    """Mảng chuỗi pyarrow -> văn bản XML hợp lệ (thoát &, <, > và bỏ ký tự điều khiển)"""
+    if pc.any(pc.match_substring_regex(values, "[&<>]")).as_py():
+        values = pc.replace_substring(values, "&", "&amp;")
+        values = pc.replace_substring(values, "<", "&lt;")
+        values = pc.replace_substring(values, ">", "&gt;")
+    if pc.any(pc.match_substring_regex(values, _ILLEGAL_XML)).as_py():
+        values = pc.replace_substring_regex(values, _ILLEGAL_XML, "")
+    return values
+
+
+def _string_cells(values, refs):
+    """Ô chuỗi inline; khoảng trắng đầu/cuối cần xml:space="preserve" để không bị cắt"""
+    values = _escape(values)
+    open_tag = pc.if_else(pc.match_substring_regex(values, r"^\s|\s$"),
+                          '"><is><t xml:space="preserve">', '"><is><t>')
+    return pc.binary_join_element_wise('<c r="', refs, '" t="inlineStr', open_tag, values, "</t></is></c>", "")
+
+
+def _number_cells(texts, refs, attrs=""):
+    return pc.binary_join_element_wise('<c r="', refs, '"' + attrs + "><v>", texts, "</v></c>", "")
+
+
+def _column_cells(series, refs):
+    """
+    XML các ô của một cột trong khối (mảng chuỗi pyarrow, ô trống -> "").
+    refs: tọa độ ô (A2, A3, ...) của khối
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype(series.cat.categories.dtype)
+    values = series.to_numpy()
+    dtype = values.dtype
+    if dtype.kind == "b":
+        cells = _number_cells(pa.array(np.where(values, "1", "0")), refs, ' t="b"')
+    elif dtype.kind in "iu":
+        cells = _number_cells(pc.cast(pa.array(values), pa.string()), refs)
+    elif dtype.kind == "f":
+        # NaN / vô cực -> ô trống (Excel không lưu được)
+        finite = np.isfinite(values)
+        cells = _number_cells(pc.cast(pa.array(values, mask=~finite), pa.string()), refs)
+    elif dtype.kind == "M":
+        days = ((series - _EPOCH) / pd.Timedelta(days=1)).to_numpy(dtype=np.float64, na_value=np.nan)
+        cells = _number_cells(pc.cast(pa.array(days, from_pandas=True), pa.string()), refs, ' s="1"')
+    elif pd.api.types.infer_dtype(values, skipna=True) in ("string", "empty"):
+        cells = _string_cells(pa.array(values, type=pa.string(), from_pandas=True), refs)
+    else:
+        cells = _object_cells(values, refs)
+    return cells.fill_null("")
+
+
+def _object_cells(values, refs):
+    """Cột object / chuỗi: chia theo kiểu từng giá trị, mỗi nhóm dựng XML theo cột"""
+    values = np.asarray(values, dtype=object)
+    is_str = np.fromiter((isinstance(v, str) for v in values), dtype=bool, count=len(values))
+    cells = np.full(len(values), "", dtype=object)
+    groups = {"str": is_str}
+    missing = pd.isna(values) & ~is_str
+    is_bool = np.fromiter((isinstance(v, (bool, np.bool_)) for v in values), dtype=bool, count=len(values))
+    is_number = np.fromiter((isinstance(v, (int, float, np.number)) for v in values), dtype=bool,
+                            count=len(values)) & ~is_bool & ~missing
+    is_date = np.fromiter((isinstance(v, (datetime.date, np.datetime64)) for v in values),
+                          dtype=bool, count=len(values)) & ~missing
+    groups.update(bool=is_bool, number=is_number, date=is_date)
+    other = ~(is_str | is_bool | is_number | is_date | missing)
+    if other.any():
+        values = values.copy()
+        values[other] = [str(v) for v in values[other]]
+        groups["str"] = is_str | other
+
+    for kind, mask in groups.items():
+        if not mask.any():
+            continue
+        group_refs = refs.filter(pa.array(mask))
+        if kind == "str":
+            group = _string_cells(pa.array(values[mask], type=pa.string()), group_refs)
+        elif kind == "bool":
+            group = _number_cells(pa.array(["1" if v else "0" for v in values[mask]]), group_refs, ' t="b"')
+        elif kind == "number":
+            numbers = np.array([float(v) if np.isfinite(float(v)) else np.nan for v in values[mask]])
+            texts = [str(v) if isinstance(v, (int, np.integer)) else None for v in values[mask]]
+            texts = pc.coalesce(pa.array(texts, type=pa.string()),
+                                pc.cast(pa.array(numbers, from_pandas=True), pa.string()))
+            group = _number_cells(texts, group_refs)
+        else:
+            days = (pd.to_datetime(pd.Series(values[mask])).dt.tz_localize(None) - _EPOCH) / pd.Timedelta(days=1)
+            group = _number_cells(pc.cast(pa.array(days.to_numpy()), pa.string()), group_refs, ' s="1"')
+        cells[mask] = group.fill_null("").to_numpy(zero_copy_only=False)
+    return pa.array(cells, type=pa.string())
+
+
+def _array_bytes(array):
+    """Nội dung nối liền của một mảng chuỗi pyarrow không có null (không chép)"""
+    array = array.combine_chunks() if isinstance(array, pa.ChunkedArray) else array
+    offsets = np.frombuffer(array.buffers()[1], dtype=np.int32)[array.offset:array.offset + len(array) + 1]
+    return memoryview(array.buffers()[2])[offsets[0]:offsets[-1]]
+
+
+def _write_sheet(stream, df, chunksize):
+    """Ghi XML của một sheet vào stream (file trong zip) theo từng khối dòng"""
+    width = len(df.columns)
+    letters = [column_letter(i) for i in range(width)]
+    last = f"{letters[-1]}{len(df) + 1}" if width else "A1"
+    stream.write((f'{_XML_HEADER}<worksheet xmlns="{_MAIN_NS}"><dimension ref="A1:{last}"/>'
+                  f"<sheetData>").encode("utf-8"))
+    if width:
+        header = pa.array([str(name) for name in df.columns], type=pa.string())
+        refs = pa.array([f"{letter}1" for letter in letters])
+        stream.write(b'<row r="1">' + bytes(_array_bytes(_string_cells(header, refs))) + b"</row>")
+
+    for start in range(0, len(df), chunksize):
+        chunk = df.iloc[start:start + chunksize]
+        rows = pc.cast(pa.array(np.arange(start + 2, start + 2 + len(chunk))), pa.string())
+        cells = [_column_cells(chunk.iloc[:, i], pc.binary_join_element_wise(letter, rows, ""))
+                 for i, letter in enumerate(letters)]
+        xml = pc.binary_join_element_wise('<row r="', rows, '">', *cells, "</row>", "")
+        stream.write(_array_bytes(xml))
+    stream.write(b"</sheetData></worksheet>")
+
+
+_STYLES = (f'{_XML_HEADER}<styleSheet xmlns="{_MAIN_NS}">'
+           '<numFmts count="1"><numFmt numFmtId="164" formatCode="yyyy-mm-dd hh:mm:ss"/></numFmts>'
+           '<fonts count="1"><font><sz val="11"/><name val="Calibri"/><family val="2"/></font></fonts>'
+           '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+           '<fill><patternFill patternType="gray125"/></fill></fills>'
+           '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+           '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+           '<cellXfs count="2"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+           '<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/></cellXfs>'
+           '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+           '</styleSheet>')
+
+
+def write_workbook(path, sheets, chunksize=WRITE_CHUNK_ROWS):
+    """
+    Ghi {tên sheet: DataFrame} ra file .xlsx tại path (ghi thẳng, người gọi lo file tạm).
+    Bộ nhớ dùng thêm chỉ khoảng một khối chunksize dòng.
+    """
+    if not HAS_ARROW:
+        return _write_workbook_openpyxl(path, sheets)
+    names = list(sheets)
+    content_types = "".join(
+        f'<Override PartName="/xl/worksheets/sheet{i}.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        for i in range(1, len(names) + 1))
+    workbook_rels = "".join(
+        f'<Relationship Id="rId{i}" Type="{_REL_NS}/worksheet" Target="worksheets/sheet{i}.xml"/>'
+        for i in range(1, len(names) + 1))
+    sheet_tags = "".join(
+        f'<sheet name="{html.escape(str(name), quote=True)}" sheetId="{i}" r:id="rId{i}"/>'
+        for i, name in enumerate(names, start=1))
+
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=COMPRESS_LEVEL) as zf:
+        zf.writestr("[Content_Types].xml", (
+            f'{_XML_HEADER}<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/styles.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+            f'{content_types}</Types>'))
+        zf.writestr("_rels/.rels", (
+            f'{_XML_HEADER}<Relationships xmlns="{_PKG_REL_NS}">'
+            f'<Relationship Id="rId1" Type="{_REL_NS}/officeDocument" Target="xl/workbook.xml"/>'
+            '</Relationships>'))
+        zf.writestr("xl/workbook.xml", (
+            f'{_XML_HEADER}<workbook xmlns="{_MAIN_NS}" xmlns:r="{_REL_NS}">'
+            f'<sheets>{sheet_tags}</sheets></workbook>'))
+        zf.writestr("xl/_rels/workbook.xml.rels", (
+            f'{_XML_HEADER}<Relationships xmlns="{_PKG_REL_NS}">{workbook_rels}'
+            f'<Relationship Id="rId{len(names) + 1}" Type="{_REL_NS}/styles" Target="styles.xml"/>'
+            '</Relationships>'))
+        zf.writestr("xl/styles.xml", _STYLES)
+        for i, name in enumerate(names, start=1):
+            with zf.open(f"xl/worksheets/sheet{i}.xml", "w", force_zip64=True) as stream:
+                _write_sheet(stream, sheets[name], chunksize)
+    return path
+
+
+def _write_workbook_openpyxl(path, sheets):
+    """Ghi bằng openpyxl chế độ write-only (từng dòng được ghi thẳng ra file tạm của openpyxl)"""
+    import openpyxl
+
+    wb = openpyxl.Workbook(write_only=True)
+    for name, df in sheets.items():
+        ws = wb.create_sheet(str(name))
+        ws.append([str(col) for col in df.columns])
+        for row in df.astype(object).where(df.notna(), None).itertuples(index=False, name=None):
+            ws.append(row)
+    wb.save(path)
+    return path
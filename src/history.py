@@ -0,0 +1,162 @@
+"""
+Module History - Lịch sử Hoàn tác / Làm lại
+Mỗi thao tác được lưu dưới dạng thay đổi nhỏ có thể đảo ngược (không chụp lại cả DataFrame):
+    insert  : {"op": "insert", "id", "row"}              dòng vừa thêm
+    delete  : {"op": "delete", "id", "row"}              dòng vừa xóa (toàn bộ giá trị)
+    update  : {"op": "update", "id", "old", "new"}       chỉ các ô đã đổi, kèm giá trị cũ
+    clean   : {"op": "clean", "dropped", "columns", "dtypes", "order"}
+              các dòng bị xóa khi làm sạch + theo từng cột: mã dòng và giá trị cũ của các ô bị đổi
+    unclean : {"op": "unclean"}                          đã hoàn tác làm sạch (làm lại = làm sạch lại)
+Tổng dung lượng ước tính được giới hạn: vượt ngân sách thì bỏ thao tác cũ nhất trước.
+"""
+
+import sys
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+
+# Ngân sách bộ nhớ mặc định cho toàn bộ lịch sử (byte)
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def _row_bytes(row):
+    """Ước lượng dung lượng một dòng dạng dict"""
+    return sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row.values())
+
+
+def estimate_bytes(delta):
+    """Ước lượng dung lượng bộ nhớ của một thay đổi"""
+    op = delta["op"]
+    if op in ("insert", "delete"):
+        return _row_bytes(delta["row"])
+    if op == "update":
+        return _row_bytes(delta["old"]) + _row_bytes(delta["new"])
+    if op == "clean":
+        total = int(delta["dropped"].memory_usage(deep=True).sum())
+        for ids, values in delta["columns"].values():
+            total += ids.nbytes + int(values.memory_usage(deep=True))
+        return total
+    return sys.getsizeof(delta)
+
+
+def describe(delta):
+    """Mô tả ngắn của thao tác (hiển thị trên thanh trạng thái)"""
+    op = delta["op"]
+    if op == "insert":
+        return f"thêm dòng {delta['id']}"
+    if op == "delete":
+        return f"xóa dòng {delta['id']}"
+    if op == "update":
+        return f"sửa dòng {delta['id']} ({', '.join(delta['old'])})"
+    if op == "clean":
+        return "làm sạch dữ liệu"
+    return "hoàn tác làm sạch"
+
+
+def diff_clean(before, after):
+    """
+    Thay đổi do làm sạch: before là bản nông (copy(deep=False)) của DataFrame trước khi làm sạch,
+    after là kết quả. Chỉ giữ giá trị cũ của các ô thật sự bị đổi.
+    """
+    kept = before.index.isin(after.index)
+    dropped = before[~kept].copy()
+    positions = np.flatnonzero(kept)
+    columns = {}
+    for col in before.columns:
+        old = before[col].iloc[positions]
+        old_values = old.to_numpy(dtype=object, na_value=None)
+        new_values = after[col].to_numpy(dtype=object, na_value=None)
+        # Cùng giá trị nhưng khác kiểu (VD: 22.0 -> 22) được khôi phục khi ép lại kiểu cũ của cột
+        same = (old_values == new_values) | (pd.isna(old_values) & pd.isna(new_values))
+        changed = np.flatnonzero(~same)
+        if len(changed):
+            columns[col] = (after.index.to_numpy()[changed], old.iloc[changed])
+    return {
+        "op": "clean",
+        "dropped": dropped,
+        "columns": columns,
+        "dtypes": before.dtypes.to_dict(),
+        "order": list(before.columns),
+    }
+
+
+def undo_clean(df, delta):
+    """DataFrame trước khi làm sạch, dựng lại từ kết quả làm sạch df và thay đổi delta"""
+    dropped = delta["dropped"]
+    restored = {}
+    for col in delta["order"]:
+        dtype = delta["dtypes"][col]
+        diff = delta["columns"].get(col)
+        series = df[col] if col in df.columns else pd.Series(np.nan, index=df.index)
+        if diff is None and not len(dropped) and series.dtype == dtype:
+            restored[col] = series
+            continue
+        series = series.astype(object)
+        if diff is not None:
+            ids, old = diff
+            series.loc[ids] = old.to_numpy(dtype=object)
+        if len(dropped):
+            series = pd.concat([series, dropped[col].astype(object)])
+        restored[col] = series
+    result = pd.DataFrame(restored, columns=delta["order"])
+    if len(dropped):
+        result = result.sort_index()
+    return result.astype(delta["dtypes"])
+
+
+class EditHistory:
+    """Hai ngăn xếp Hoàn tác / Làm lại với ngân sách bộ nhớ (bỏ thao tác cũ nhất trước)"""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._undo = deque()  # (thay đổi, dung lượng), phần tử cuối là thao tác mới nhất
+        self._redo = deque()
+        self.total_bytes = 0
+
+    def push(self, delta, redo=False, clear_redo=True):
+        """
+        Lưu một thay đổi vào ngăn Hoàn tác (redo=True: vào ngăn Làm lại).
+        clear_redo: thao tác mới của người dùng làm mất các bước Làm lại.
+        """
+        if clear_redo and not redo:
+            self._clear(self._redo)
+        size = estimate_bytes(delta)
+        (self._redo if redo else self._undo).append((delta, size))
+        self.total_bytes += size
+        self._evict()
+
+    def pop_undo(self):
+        return self._pop(self._undo)
+
+    def pop_redo(self):
+        return self._pop(self._redo)
+
+    def can_undo(self):
+        return bool(self._undo)
+
+    def can_redo(self):
+        return bool(self._redo)
+
+    def clear(self):
+        self._clear(self._undo)
+        self._clear(self._redo)
+
+    def _pop(self, stack):
+        if not stack:
+            return None
+        delta, size = stack.pop()
+        self.total_bytes -= size
+        return delta
+
+    def _clear(self, stack):
+        self.total_bytes -= sum(size for _, size in stack)
+        stack.clear()
+
+    def _evict(self):
+        """Vượt ngân sách -> bỏ thao tác cũ nhất (Hoàn tác trước, rồi tới Làm lại)"""
+        while self.total_bytes > self.max_bytes and (self._undo or self._redo):
+            stack = self._undo if self._undo else self._redo
+            _, size = stack.popleft()
+            self.total_bytes -= size
@@ -0,0 +1,324 @@
+"""
+Module Indexes - Chỉ mục theo cột để tìm kiếm/lọc nhanh
+HashIndex: tra cứu bằng giá trị (PassengerId, Ticket...).
+SortedIndex: truy vấn khoảng trên cột số (Age, Fare...).
+Mỗi chỉ mục gồm phần gốc dựng một lần bằng numpy và phần thay đổi nhỏ (dòng thêm/sửa/xóa)
+cập nhật dần theo từng thao tác; phần thay đổi quá lớn thì chỉ mục được dựng lại ở lần truy vấn sau.
+Kết quả truy vấn là mảng mã dòng (nhãn index của DataFrame) tăng dần.
+"""
+
+import bisect
+
+import numpy as np
+import pandas as pd
+
+
+# Chỉ mục mặc định của dữ liệu Titanic: {cột: loại}
+DEFAULT_INDEXES = {
+    "PassengerId": "hash",
+    "Ticket": "hash",
+    "Age": "sorted",
+    "Fare": "sorted",
+}
+
+# Phần thay đổi vượt max(REBUILD_MIN, REBUILD_RATIO x số dòng gốc) -> dựng lại chỉ mục
+REBUILD_MIN = 1000
+REBUILD_RATIO = 0.05
+
+
+def hash_key(value):
+    """
+    Khóa tra cứu của một giá trị: chuỗi bỏ khoảng trắng hai đầu, chuỗi dạng số được đổi thành số
+    để "7", 7 và 7.0 cùng một khóa (trong dict, 7 == 7.0). Ô rỗng -> None (không được đánh chỉ mục).
+    """
+    if value is None or value is pd.NA or (isinstance(value, (float, np.floating)) and np.isnan(value)):
+        return None
+    if isinstance(value, np.generic):
+        value = value.item()
+    if not isinstance(value, str):
+        return value
+    text = value.strip()
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        number = float(text)
+    except ValueError:
+        return text
+    return number if np.isfinite(number) else text
+
+
+def _to_float(value):
+    """Giá trị số của một ô (None nếu rỗng hoặc không phải số)"""
+    if value is None or isinstance(value, (bool, np.bool_)):
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if np.isnan(number) else number
+
+
+def _ids_array(ids):
+    return np.asarray(sorted(ids), dtype=np.int64)
+
+
+class HashIndex:
+    """Chỉ mục băm: khóa -> các mã dòng có giá trị đó"""
+
+    kind = "hash"
+
+    def __init__(self, column):
+        self.column = column
+        self._codes = {}                       # {khóa: mã nhóm}
+        self._ids = np.empty(0, np.int64)      # Mã dòng xếp theo nhóm
+        self._starts = np.zeros(1, np.int64)   # Nhóm i nằm trong _ids[_starts[i]:_starts[i + 1]]
+        self._added = {}                       # {khóa: tập mã dòng} thêm/sửa sau khi dựng
+        self._removed = set()                  # Mã dòng trong phần gốc đã bị xóa/sửa
+        self._base_size = 0
+        self._overlay = 0
+
+    def build(self, series):
+        """Dựng chỉ mục từ một cột (nhãn index là mã dòng)"""
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+        if pd.api.types.is_numeric_dtype(uniques.dtype) and not pd.api.types.is_bool_dtype(uniques.dtype):
+            # Cột số: giá trị đã là khóa, không cần duyệt từng giá trị
+            keys = uniques.tolist()
+        else:
+            # Các giá trị gốc khác nhau có thể cùng khóa (VD: 7 và "7") -> gộp nhóm theo khóa
+            key_codes, keys = pd.factorize(pd.Series([hash_key(value) for value in uniques], dtype=object),
+                                           use_na_sentinel=True)
+            if len(codes):
+                codes = np.where(codes >= 0, key_codes[np.maximum(codes, 0)] if len(key_codes) else -1, -1)
+            keys = list(keys)
+        valid = codes >= 0
+        row_ids = series.index.to_numpy(dtype=np.int64)[valid]
+        codes = codes[valid]
+        order = np.argsort(codes, kind="stable")
+        self._ids = row_ids[order]
+        self._starts = np.concatenate([[0], np.cumsum(np.bincount(codes, minlength=len(keys)))])
+        self._codes = dict(zip(keys, range(len(keys))))
+        self._added = {}
+        self._removed = set()
+        self._base_size = len(self._ids)
+        self._overlay = 0
+
+    def needs_rebuild(self):
+        return self._overlay > max(REBUILD_MIN, REBUILD_RATIO * self._base_size)
+
+    def insert(self, row_id, value):
+        key = hash_key(value)
+        if key is not None:
+            self._added.setdefault(key, set()).add(row_id)
+            self._overlay += 1
+
+    def remove(self, row_id, value):
+        key = hash_key(value)
+        if key is None:
+            return
+        added = self._added.get(key)
+        if added is not None and row_id in added:
+            added.discard(row_id)
+        else:
+            self._removed.add(row_id)
+        self._overlay += 1
+
+    def lookup(self, value):
+        """Các mã dòng có giá trị bằng value"""
+        key = hash_key(value)
+        code = self._codes.get(key)
+        ids = self._ids[self._starts[code]:self._starts[code + 1]] if code is not None \
+            else np.empty(0, np.int64)
+        if self._removed and len(ids):
+            ids = ids[~np.isin(ids, _ids_array(self._removed))]
+        added = self._added.get(key)
+        if added:
+            ids = np.union1d(ids, _ids_array(added))
+        return np.sort(ids)
+
+
+class SortedIndex:
+    """Chỉ mục sắp xếp trên cột số: giá trị tăng dần kèm mã dòng, truy vấn khoảng bằng tìm nhị phân"""
+
+    kind = "sorted"
+
+    def __init__(self, column):
+        self.column = column
+        self._values = np.empty(0, np.float64)
+        self._ids = np.empty(0, np.int64)
+        self._pending_values = []   # Giá trị thêm/sửa sau khi dựng (giữ tăng dần)
+        self._pending_ids = []
+        self._removed = set()
+        self._base_size = 0
+        self._overlay = 0
+
+    def build(self, series):
+        values = pd.to_numeric(series, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+        valid = ~np.isnan(values)
+        order = np.argsort(values[valid], kind="stable")
+        self._values = values[valid][order]
+        self._ids = series.index.to_numpy(dtype=np.int64)[valid][order]
+        self._pending_values = []
+        self._pending_ids = []
+        self._removed = set()
+        self._base_size = len(self._values)
+        self._overlay = 0
+
+    def needs_rebuild(self):
+        return self._overlay > max(REBUILD_MIN, REBUILD_RATIO * self._base_size)
+
+    def insert(self, row_id, value):
+        number = _to_float(value)
+        if number is not None:
+            i = bisect.bisect_right(self._pending_values, number)
+            self._pending_values.insert(i, number)
+            self._pending_ids.insert(i, row_id)
+            self._overlay += 1
+
+    def remove(self, row_id, value):
+        number = _to_float(value)
+        if number is None:
+            return
+        lo = bisect.bisect_left(self._pending_values, number)
+        hi = bisect.bisect_right(self._pending_values, number)
+        for i in range(lo, hi):
+            if self._pending_ids[i] == row_id:
+                del self._pending_values[i]
+                del self._pending_ids[i]
+                break
+        else:
+            self._removed.add(row_id)
+        self._overlay += 1
+
+    def lookup(self, value):
+        number = _to_float(value)
+        if number is None:
+            return np.empty(0, np.int64)
+        return self.range(number, number)
+
+    def range(self, lo=None, hi=None, include_lo=True, include_hi=True):
+        """Các mã dòng có giá trị trong khoảng [lo, hi] (None: không giới hạn phía đó)"""
+        start = 0 if lo is None else np.searchsorted(self._values, lo, side="left" if include_lo else "right")
+        stop = len(self._values) if hi is None else \
+            np.searchsorted(self._values, hi, side="right" if include_hi else "left")
+        ids = self._ids[start:stop]
+        if self._removed and len(ids):
+            ids = ids[~np.isin(ids, _ids_array(self._removed))]
+
+        p_start = 0 if lo is None else (bisect.bisect_left if include_lo else bisect.bisect_right)(
+            self._pending_values, lo)
+        p_stop = len(self._pending_values) if hi is None else \
+            (bisect.bisect_right if include_hi else bisect.bisect_left)(self._pending_values, hi)
+        if p_stop > p_start:
+            ids = np.concatenate([ids, np.asarray(self._pending_ids[p_start:p_stop], dtype=np.int64)])
+        return np.sort(ids)
+
+
+INDEX_TYPES = {"hash": HashIndex, "sorted": SortedIndex}
+
+
+def parse_filter(text):
+    """
+    Đọc biểu thức lọc của ô tìm kiếm:
+        "abc" hoặc "= abc"      -> bằng
+        "10..20"                -> khoảng đóng [10, 20]
+        ">= 10", "> 10", "<= 20", "< 20"
+    Trả về: ("eq", giá trị) hoặc ("range", lo, hi, include_lo, include_hi)
+    Ném ValueError nếu biểu thức khoảng không phải số.
+    """
+    text = text.strip()
+    for op in (">=", "<=", ">", "<"):
+        if text.startswith(op):
+            number = float(text[len(op):].strip())
+            if op[0] == ">":
+                return ("range", number, None, op == ">=", True)
+            return ("range", None, number, True, op == "<=")
+    if ".." in text:
+        lo_text, hi_text = text.split("..", 1)
+        lo = float(lo_text) if lo_text.strip() else None
+        hi = float(hi_text) if hi_text.strip() else None
+        return ("range", lo, hi, True, True)
+    if text.startswith("="):
+        text = text[1:].strip()
+    return ("eq", text)
+
+
+def scan_filter(series, query):
+    """Lọc bằng cách duyệt cả cột (dùng cho cột không có chỉ mục). Trả về mã dòng tăng dần"""
+    if query[0] == "eq":
+        key = hash_key(query[1])
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+        matches = np.flatnonzero([hash_key(value) == key for value in uniques])
+        mask = np.isin(codes, matches)
+    else:
+        _, lo, hi, include_lo, include_hi = query
+        values = pd.to_numeric(series, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+        mask = ~np.isnan(values)
+        if lo is not None:
+            mask &= (values >= lo) if include_lo else (values > lo)
+        if hi is not None:
+            mask &= (values <= hi) if include_hi else (values < hi)
+    return np.sort(series.index.to_numpy(dtype=np.int64)[mask])
+
+
+class ColumnIndexes:
+    """
+    Quản lý chỉ mục của các cột. Chỉ mục được dựng khi truy vấn lần đầu (không làm chậm lúc load),
+    sau đó được cập nhật dần theo các thao tác thêm/sửa/xóa dòng.
+    """
+
+    def __init__(self, specs=None):
+        self.specs = dict(DEFAULT_INDEXES if specs is None else specs)  # {cột: loại}
+        self._indexes = {}  # Chỉ mục đã dựng {cột: HashIndex/SortedIndex}
+
+    def enable(self, column, kind):
+        """Bật chỉ mục loại kind ("hash"/"sorted") cho cột"""
+        if kind not in INDEX_TYPES:
+            raise ValueError(f"Không có loại chỉ mục: {kind}")
+        if self.specs.get(column) != kind:
+            self.specs[column] = kind
+            self._indexes.pop(column, None)
+
+    def disable(self, column):
+        self.specs.pop(column, None)
+        self._indexes.pop(column, None)
+
+    def reset(self):
+        """Bỏ mọi chỉ mục đã dựng (dữ liệu vừa load/làm sạch), dựng lại khi truy vấn"""
+        self._indexes.clear()
+
+    def get(self, column, df):
+        """Chỉ mục của cột (dựng nếu chưa có hoặc đã quá nhiều thay đổi), None nếu cột không có chỉ mục"""
+        kind = self.specs.get(column)
+        if kind is None or column not in df.columns:
+            return None
+        index = self._indexes.get(column)
+        if index is None or index.needs_rebuild():
+            index = INDEX_TYPES[kind](column)
+            index.build(df[column])
+            self._indexes[column] = index
+        return index
+
+    def on_insert(self, row_id, row):
+        for column, index in self._indexes.items():
+            index.insert(row_id, row.get(column))
+
+    def on_update(self, row_id, old_values, new_values):
+        for column, index in self._indexes.items():
+            if column in new_values:
+                index.remove(row_id, old_values.get(column))
+                index.insert(row_id, new_values[column])
+
+    def on_delete(self, row_id, row):
+        for column, index in self._indexes.items():
+            index.remove(row_id, row.get(column))
+
+    def query(self, df, column, query):
+        """Mã dòng (tăng dần) thỏa biểu thức đã đọc bằng parse_filter"""
+        index = self.get(column, df)
+        if index is None or (query[0] == "range" and index.kind != "sorted"):
+            return scan_filter(df[column], query)
+        if query[0] == "eq":
+            return index.lookup(query[1])
+        return index.range(*query[1:])
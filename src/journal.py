@@ -0,0 +1,128 @@
+"""
+Module Journal - Nhật ký ghi trước (write-ahead journal)
+Ghi từng thao tác thêm/sửa/xóa dòng vào cuối file nhật ký thay vì ghi lại toàn bộ file dữ liệu
+"""
+
+import json
+import os
+
+
+class EditJournal:
+    """
+    Nhật ký các thao tác trên dòng, mỗi dòng của file là một bản ghi JSON.
+    Bản ghi đầu tiên ("op": "base") cho biết file gốc mà các thao tác được áp lên.
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def exists(self):
+        """Kiểm tra file nhật ký có tồn tại không"""
+        return os.path.exists(self.path)
+
+    def size(self):
+        """Kích thước file nhật ký (byte), 0 nếu chưa có"""
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    @staticmethod
+    def describe_base(base_path):
+        """Thông tin nhận diện file gốc: đường dẫn tuyệt đối, kích thước, thời điểm sửa"""
+        stat = os.stat(base_path)
+        return {
+            "path": os.path.abspath(base_path),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+        }
+
+    def start(self, base):
+        """Tạo nhật ký mới với bản ghi mô tả file gốc (base lấy từ describe_base)"""
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"op": "base", **base}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def append(self, entry):
+        """Nối một thao tác vào cuối nhật ký và đẩy xuống đĩa"""
+        line = json.dumps(entry, ensure_ascii=False, default=self._to_json)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def append_many(self, entries):
+        """Nối nhiều thao tác và đẩy xuống đĩa một lần (nhập hàng loạt)"""
+        lines = "".join(
+            json.dumps(entry, ensure_ascii=False, default=self._to_json) + "\n" for entry in entries
+        )
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def read(self):
+        """
+        Đọc nhật ký.
+        Trả về: (base, entries). Bản ghi cuối bị ghi dở (do crash) sẽ được bỏ qua.
+        """
+        base = None
+        entries = []
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break  # Dòng ghi dở -> dừng tại đây
+                if entry.get("op") == "base":
+                    base = entry
+                else:
+                    entries.append(entry)
+        return base, entries
+
+    def mark(self):
+        """Vị trí cuối nhật ký hiện tại (dùng để biết thao tác nào phát sinh sau đó)"""
+        return self.size()
+
+    def truncate_before(self, mark, base):
+        """
+        Bỏ các thao tác trước vị trí mark (đã được ghi vào file gốc mới base),
+        giữ lại các thao tác phát sinh sau đó với bản ghi base mới.
+        """
+        if not self.exists():
+            return
+        with open(self.path, "rb") as f:
+            if mark > 0:
+                f.seek(mark)
+            else:
+                # Lúc chụp chưa có nhật ký -> mọi thao tác trừ bản ghi base đều phát sinh sau
+                f.readline()
+            tail = f.read()
+        if not tail.strip():
+            self.clear()
+            return
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write((json.dumps({"op": "base", **base}) + "\n").encode("utf-8"))
+            f.write(tail)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        """Xóa nhật ký (sau khi đã gộp vào file dữ liệu)"""
+        if self.exists():
+            os.remove(self.path)
+
+    def discard(self):
+        """Đổi tên nhật ký không còn khớp với file gốc thành .bak để không mất dữ liệu"""
+        if self.exists():
+            os.replace(self.path, self.path + ".bak")
+
+    @staticmethod
+    def _to_json(value):
+        """Chuyển kiểu numpy/pandas sang kiểu JSON"""
+        if hasattr(value, "item"):
+            return value.item()
+        return str(value)
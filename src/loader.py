@@ -0,0 +1,134 @@
+"""
+Module Loader - Đọc file ở luồng nền
+Đọc file theo từng khối để giao diện không bị treo, báo tiến độ và cho phép hủy
+"""
+
+import queue
+import threading
+
+import pandas as pd
+
+from .dtypes import compact_dtypes
+from .profiler import span
+
+
+class ChunkedLoader:
+    """Đọc một file dữ liệu theo khối ở luồng nền, kết quả được xử lý trên luồng giao diện"""
+
+    # Chu kỳ kiểm tra tin nhắn từ luồng nền (ms)
+    POLL_MS = 50
+
+    def __init__(self, root, data_handler, file_path, on_progress, on_first_chunk, on_done):
+        """
+        on_progress(rows, bytes_read, total_bytes): sau mỗi khối
+        on_first_chunk(df): khối đầu tiên, để hiển thị trước
+        on_done(df, memory_report, error, cancelled): khi kết thúc
+            (df là toàn bộ dữ liệu nếu thành công, memory_report khi bật tối ưu bộ nhớ)
+        """
+        self.root = root
+        self.data_handler = data_handler
+        self.file_path = file_path
+        self.on_progress = on_progress
+        self.on_first_chunk = on_first_chunk
+        self.on_done = on_done
+
+        self._cancel_event = threading.Event()
+        self._messages = queue.Queue()
+        self._worker = None
+
+    def start(self):
+        """Bắt đầu đọc ở luồng nền"""
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+        self.root.after(self.POLL_MS, self._poll)
+
+    def cancel(self):
+        """Yêu cầu dừng đọc (luồng nền dừng sau khối hiện tại)"""
+        self._cancel_event.set()
+
+    def _run(self):
+        """Chạy ở luồng nền: đọc file, không chạm vào Tk"""
+        with span("ChunkedLoader.read") as read_span:
+            self._read(read_span)
+
+    def _read(self, read_span):
+        """Đọc và ghép các khối, gửi tiến độ/kết quả về luồng giao diện qua hàng đợi"""
+        try:
+            chunks = []
+            rows = 0
+            for chunk, bytes_read, total_bytes in self.data_handler.read_chunks(self.file_path):
+                if self._cancel_event.is_set():
+                    self._messages.put(("cancelled",))
+                    return
+                chunks.append(chunk)
+                rows += len(chunk)
+                read_span.rows = rows
+                first = chunk if len(chunks) == 1 else None
+                self._messages.put(("progress", rows, bytes_read, total_bytes, first))
+
+            if self._cancel_event.is_set():
+                self._messages.put(("cancelled",))
+                return
+
+            # Ghép các khối một lần ở cuối (khối Excel là object -> suy lại kiểu dữ liệu)
+            df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+            df = df.infer_objects()
+            
+            # Lưu bản đệm cho lần mở sau (bỏ qua nếu đã có bản khớp)
+            if self.data_handler.cache:
+                self.data_handler.cache.store(self.file_path, df)
+            
+            # Tối ưu kiểu dữ liệu ngay tại luồng nền nếu được bật
+            memory_report = None
+            if self.data_handler.optimize_memory:
+                df, memory_report = compact_dtypes(df)
+            self._messages.put(("done", df, memory_report))
+        except Exception as e:
+            self._messages.put(("error", e))
+
+    def _poll(self):
+        """Xử lý các tin nhắn từ luồng nền trên luồng giao diện"""
+        while True:
+            try:
+                message = self._messages.get_nowait()
+            except queue.Empty:
+                break
+
+            kind = message[0]
+            if kind == "progress":
+                _, rows, bytes_read, total_bytes, first = message
+                if first is not None:
+                    self.on_first_chunk(first)
+                self.on_progress(rows, bytes_read, total_bytes)
+            elif kind == "done":
+                self.on_done(message[1], message[2], None, False)
+                return
+            elif kind == "error":
+                self.on_done(None, None, message[1], False)
+                return
+            else:
+                self.on_done(None, None, None, True)
+                return
+
+        self.root.after(self.POLL_MS, self._poll)
+
+
+class PagedLoader(ChunkedLoader):
+    """
+    Mở file lớn ở chế độ phân trang ở luồng nền: chuyển file sang kho trên đĩa (hoặc dùng lại kho cũ).
+    on_done nhận PagedDataset thay cho DataFrame; không có khối xem trước.
+    """
+
+    def _read(self, read_span):
+        try:
+            def on_progress(rows, bytes_read, total_bytes):
+                read_span.rows = rows
+                self._messages.put(("progress", rows, bytes_read, total_bytes, None))
+
+            dataset = self.data_handler.open_paged(self.file_path, on_progress, self._cancel_event.is_set)
+            if dataset is None:
+                self._messages.put(("cancelled",))
+                return
+            self._messages.put(("done", dataset, None))
+        except Exception as e:
+            self._messages.put(("error", e))
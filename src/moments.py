@@ -0,0 +1,223 @@
+"""
+Module Moments - Thống kê mô tả và tương quan cập nhật dần theo từng thao tác
+RunningMoments giữ cho mỗi cặp cột số (i, j): số dòng có giá trị ở cả hai cột, trung bình của cột i
+trên các dòng đó, tổng bình phương độ lệch và mô-men chéo (cập nhật kiểu Welford).
+Thêm/sửa/xóa một dòng chỉ tốn O(số cột²), nên ma trận tương quan và bảng thống kê mô tả được làm mới
+mà không phải duyệt lại mọi dòng. Ô trống bị bỏ theo từng cặp cột, giống DataFrame.corr().
+Sau các thao tác hàng loạt (load, làm sạch) số liệu được tính lại từ đầu ở lần dùng sau.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+# Số dòng mỗi khối khi tính từ đầu (giới hạn bộ nhớ mảng tạm)
+BUILD_BLOCK = 100000
+
+# Số thao tác cập nhật dần vượt max(REBUILD_MIN, số dòng lúc tính) -> tính lại từ đầu ở lần dùng sau,
+# để sai số làm tròn không tích lũy mãi (chi phí tính lại được chia đều cho các thao tác)
+REBUILD_MIN = 10000
+
+# Tổng bình phương độ lệch nhỏ hơn ngưỡng này (tương đối) coi như bằng 0: cột hằng số
+VARIANCE_EPS = 1e-12
+
+
+def numeric_columns(df):
+    """Các cột số của DataFrame (cùng cách chọn với ma trận tương quan)"""
+    return list(df.select_dtypes(include="number").columns)
+
+
+def _to_float(value):
+    """Giá trị số của một ô (NaN nếu rỗng hoặc không phải số)"""
+    if value is None or isinstance(value, (bool, np.bool_)):
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+class RunningMoments:
+    """
+    Mô-men theo cặp cột số. Được tính khi dùng lần đầu (không làm chậm lúc load),
+    sau đó cập nhật dần theo các thao tác thêm/sửa/xóa dòng (như ColumnIndexes).
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Bỏ số liệu đã tính (dữ liệu vừa load/làm sạch), tính lại ở lần dùng sau"""
+        self.columns = None     # Các cột số đang theo dõi, None: chưa tính
+        self.rows = 0           # Tổng số dòng (kể cả dòng trống ở mọi cột số)
+        self.count = None       # count[i, j]: số dòng có giá trị ở cả cột i và cột j
+        self.mean = None        # mean[i, j]: trung bình cột i trên các dòng đó
+        self.m2 = None          # m2[i, j]: tổng bình phương độ lệch của cột i trên các dòng đó
+        self.comoment = None    # comoment[i, j]: tổng (x_i - mean[i, j]) * (x_j - mean[j, i])
+        self.minimum = None
+        self.maximum = None
+        self._stale = set()     # Vị trí các cột mà min/max vừa bị xóa -> tính lại từ cột khi cần
+        self._updates = 0
+        self._base_size = 0
+
+    def build(self, df):
+        """Tính từ đầu trên các cột số của df, theo từng khối dòng"""
+        self.reset()
+        columns = numeric_columns(df)
+        numeric = df[columns]
+        k = len(columns)
+        # Dịch gốc về trung bình của cột để tổng bình phương không bị triệt tiêu số lớn
+        shift = numeric.mean().to_numpy(dtype=np.float64, na_value=np.nan)
+        shift = np.where(np.isnan(shift), 0.0, shift)
+
+        count = np.zeros((k, k))
+        sums = np.zeros((k, k))     # sums[i, j]: tổng (x_i - shift_i) trên các dòng có cả i và j
+        squares = np.zeros((k, k))
+        cross = np.zeros((k, k))
+        minimum = np.full(k, np.inf)
+        maximum = np.full(k, -np.inf)
+        for start in range(0, len(numeric), BUILD_BLOCK):
+            values = numeric.iloc[start:start + BUILD_BLOCK].to_numpy(dtype=np.float64, na_value=np.nan)
+            present = ~np.isnan(values)
+            mask = present.astype(np.float64)
+            centered = np.where(present, values - shift, 0.0)
+            count += mask.T @ mask
+            sums += centered.T @ mask
+            squares += (centered * centered).T @ mask
+            cross += centered.T @ centered
+            minimum = np.minimum(minimum, np.where(present, values, np.inf).min(axis=0, initial=np.inf))
+            maximum = np.maximum(maximum, np.where(present, values, -np.inf).max(axis=0, initial=-np.inf))
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean_shift = np.where(count > 0, sums / count, 0.0)
+        self.columns = columns
+        self.rows = len(numeric)
+        self.count = count
+        self.mean = np.where(count > 0, shift[:, None] + mean_shift, 0.0)
+        self.m2 = np.maximum(squares - sums * mean_shift, 0.0)
+        self.comoment = cross - sums * mean_shift.T
+        self.minimum = np.where(np.isfinite(minimum), minimum, np.nan)
+        self.maximum = np.where(np.isfinite(maximum), maximum, np.nan)
+        self._base_size = self.rows
+
+    def _ensure(self, df):
+        """Tính lại nếu chưa tính, tập cột số đã đổi (VD: cột bị đổi kiểu) hoặc đã cập nhật quá nhiều lần"""
+        if (self.columns is None or self._updates > max(REBUILD_MIN, self._base_size)
+                or numeric_columns(df) != self.columns):
+            self.build(df)
+            return
+        for position in self._stale:
+            values = pd.to_numeric(df[self.columns[position]], errors="coerce")
+            self.minimum[position] = values.min()
+            self.maximum[position] = values.max()
+        self._stale.clear()
+
+    def _vector(self, row):
+        return np.array([_to_float(row.get(col)) for col in self.columns], dtype=np.float64)
+
+    def _add(self, x, extremes=None):
+        """
+        Thêm một dòng (mảng giá trị theo self.columns, NaN: ô trống)
+        extremes: mảng bool các cột cần cập nhật min/max (mặc định mọi cột)
+        """
+        self.rows += 1
+        present = ~np.isnan(x)
+        if not present.any():
+            return
+        pair = present[:, None] & present[None, :]
+        xi = np.where(present, x, 0.0)[:, None]
+        self.count = self.count + pair
+        delta = np.where(pair, xi - self.mean, 0.0)
+        mean = self.mean + np.divide(delta, self.count, out=np.zeros_like(delta), where=pair)
+        self.m2 += delta * (xi - mean)
+        self.comoment += delta * (xi.T - mean.T)
+        self.mean = mean
+
+        for position in np.flatnonzero(present if extremes is None else present & extremes):
+            if position not in self._stale:
+                self.minimum[position] = np.fmin(self.minimum[position], x[position])
+                self.maximum[position] = np.fmax(self.maximum[position], x[position])
+
+    def _remove(self, x, extremes=None):
+        """Bỏ một dòng (thao tác ngược của _add)"""
+        self.rows -= 1
+        present = ~np.isnan(x)
+        if not present.any():
+            return
+        pair = present[:, None] & present[None, :]
+        xi = np.where(present, x, 0.0)[:, None]
+        count = self.count - pair
+        left = pair & (count > 0)
+        mean = np.where(left, np.divide(self.mean * self.count - xi, count,
+                                        out=np.zeros_like(self.mean), where=left), self.mean)
+        delta = np.where(pair, xi - mean, 0.0)
+        self.m2 -= delta * (xi - self.mean)
+        self.comoment -= delta * (xi.T - self.mean.T)
+        # Cặp cột không còn dòng nào -> về 0 hẳn (bỏ sai số làm tròn)
+        empty = pair & (count == 0)
+        mean[empty] = 0.0
+        self.m2[empty] = 0.0
+        self.comoment[empty] = 0.0
+        np.maximum(self.m2, 0.0, out=self.m2)
+        self.count = count
+        self.mean = mean
+
+        for position in np.flatnonzero(present if extremes is None else present & extremes):
+            if x[position] <= self.minimum[position] or x[position] >= self.maximum[position]:
+                self._stale.add(position)
+
+    def on_insert(self, row):
+        if self.columns is not None:
+            self._add(self._vector(row))
+            self._updates += 1
+
+    def on_update(self, df, row_id, old_values):
+        """Dòng row_id của df vừa được sửa, old_values: {cột: giá trị cũ} của các cột đổi giá trị"""
+        if self.columns is None or not any(col in old_values for col in self.columns):
+            return
+        new = np.array([_to_float(df.at[row_id, col]) for col in self.columns], dtype=np.float64)
+        old = new.copy()
+        changed = np.zeros(len(self.columns), dtype=bool)
+        for position, col in enumerate(self.columns):
+            if col in old_values:
+                old[position] = _to_float(old_values[col])
+                changed[position] = True
+        # Cột không đổi giá trị: bỏ rồi thêm lại cùng giá trị, min/max giữ nguyên
+        self._remove(old, changed)
+        self._add(new, changed)
+        self._updates += 1
+
+    def on_delete(self, row):
+        if self.columns is not None:
+            self._remove(self._vector(row))
+            self._updates += 1
+
+    def correlation(self, df):
+        """Ma trận tương quan Pearson giữa các cột số (như df.select_dtypes("number").corr())"""
+        self._ensure(df)
+        m2 = np.where(self.m2 > VARIANCE_EPS * self.count * self.mean * self.mean, self.m2, 0.0)
+        denominator = np.sqrt(m2 * m2.T)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            corr = np.where(denominator > 0, self.comoment / denominator, np.nan)
+        corr = np.clip(corr, -1.0, 1.0)
+        np.fill_diagonal(corr, np.where(np.diag(m2) > 0, 1.0, np.nan))
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+    def describe(self, df):
+        """
+        Thống kê mô tả các cột số, mỗi cột một dòng:
+        count (số ô có giá trị), missing (số ô trống), mean, std (độ lệch chuẩn mẫu), min, max
+        """
+        self._ensure(df)
+        count = np.diag(self.count)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(count > 0, np.diag(self.mean), np.nan)
+            std = np.where(count > 1, np.sqrt(np.diag(self.m2) / (count - 1)), np.nan)
+        return pd.DataFrame({
+            "count": count.astype(np.int64),
+            "missing": (self.rows - count).astype(np.int64),
+            "mean": mean,
+            "std": std,
+            "min": self.minimum,
+            "max": self.maximum,
+        }, index=self.columns)
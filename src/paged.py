@@ -0,0 +1,370 @@
+"""
+Module Paged - Chế độ phân trang cho file CSV lớn hơn bộ nhớ
+File nguồn được chuyển một lần sang kho cột trên đĩa (Arrow IPC, chia thành các khối dòng)
+trong data/.store/; kho được đọc qua memory map nên chỉ những khối đang hiển thị mới nằm trong RAM
+(và hệ điều hành tự giải phóng được). Chỉnh sửa (thêm/sửa/xóa dòng) được giữ trong lớp phủ,
+ghi vào nhật ký overlay.journal của kho, và chỉ được gộp với dữ liệu gốc khi lưu (ghi lần lượt
+từng khối). Mọi ô được giữ nguyên dạng chuỗi như trong file nguồn: không phải suy kiểu cho từng
+khối, và các ô không bị sửa được ghi ra y nguyên.
+"""
+
+import csv
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from .atomic import atomic_write
+from .journal import EditJournal
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    HAS_ARROW = True
+except ImportError:
+    HAS_ARROW = False
+
+
+# Thư mục chứa các kho (trong thư mục data)
+STORE_DIR_NAME = ".store"
+
+# Số byte CSV mỗi lần đọc khi chuyển đổi; mỗi lần đọc thành một khối dòng của kho (~50 nghìn dòng
+# Titanic). Khối nhỏ giữ thấp cả bộ nhớ đỉnh khi chuyển đổi lẫn phần kho bị chạm tới khi đọc một trang
+BLOCK_BYTES = 4 * 1024 * 1024
+
+DATA_FILE = "data.arrow"
+META_FILE = "meta.json"
+OVERLAY_FILE = "overlay.journal"
+
+
+def store_dir_for(data_dir, source_path):
+    """Thư mục kho của file nguồn: data/.store/<tên file>-<mã băm đường dẫn>"""
+    digest = hashlib.sha1(os.path.abspath(source_path).encode("utf-8")).hexdigest()[:12]
+    return os.path.join(data_dir, STORE_DIR_NAME, f"{os.path.basename(source_path)}-{digest}")
+
+
+def _read_header(source_path):
+    """Tên các cột (dòng đầu tiên của file CSV)"""
+    with open(source_path, newline="", encoding="utf-8-sig") as f:
+        return next(csv.reader(f), [])
+
+
+def build_store(source_path, store_dir, on_progress=None, cancelled=None):
+    """
+    Chuyển file CSV sang kho cột trong store_dir (ghi đè kho cũ).
+    on_progress(số dòng, byte đã đọc, tổng byte); cancelled(): True thì dừng giữa chừng.
+    Trả về: meta của kho, hoặc None nếu bị hủy
+    """
+    if not HAS_ARROW:
+        raise RuntimeError("Chế độ phân trang cần thư viện pyarrow")
+
+    columns = _read_header(source_path)
+    if not columns:
+        raise ValueError("File không có dòng tiêu đề")
+    if len(set(columns)) != len(columns):
+        raise ValueError("Tên cột bị trùng, không chuyển được sang chế độ phân trang")
+
+    # Bỏ kho cũ (file nguồn đã đổi); meta.json được ghi sau cùng, nên kho dở dang không bị dùng lại.
+    # Lớp phủ của kho cũ được cất thành .bak như nhật ký không khớp file gốc
+    os.makedirs(store_dir, exist_ok=True)
+    for name in (META_FILE, DATA_FILE):
+        if os.path.exists(os.path.join(store_dir, name)):
+            os.remove(os.path.join(store_dir, name))
+    EditJournal(os.path.join(store_dir, OVERLAY_FILE)).discard()
+
+    total_bytes = os.path.getsize(source_path)
+    batch_rows = []
+    fd, tmp_path = tempfile.mkstemp(prefix=".data.", suffix=".arrow", dir=store_dir)
+    os.close(fd)
+    try:
+        with open(source_path, "rb") as f:
+            reader = pa_csv.open_csv(
+                f,
+                read_options=pa_csv.ReadOptions(block_size=BLOCK_BYTES),
+                convert_options=pa_csv.ConvertOptions(
+                    column_types={col: pa.string() for col in columns},
+                    strings_can_be_null=True,
+                ),
+            )
+            with pa.ipc.new_file(tmp_path, reader.schema) as writer:
+                for batch in reader:
+                    if cancelled is not None and cancelled():
+                        return None
+                    if batch.num_rows == 0:
+                        continue
+                    writer.write_batch(batch)
+                    batch_rows.append(batch.num_rows)
+                    if on_progress is not None:
+                        on_progress(sum(batch_rows), min(f.tell(), total_bytes), total_bytes)
+        os.replace(tmp_path, os.path.join(store_dir, DATA_FILE))
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    meta = {
+        "source": EditJournal.describe_base(source_path),
+        "columns": columns,
+        "rows": sum(batch_rows),
+        "batch_rows": batch_rows,
+    }
+    with open(os.path.join(store_dir, META_FILE), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+    return meta
+
+
+def load_meta(source_path, store_dir):
+    """Meta của kho nếu kho đã có và khớp file nguồn hiện tại (cùng kích thước, thời điểm sửa)"""
+    try:
+        with open(os.path.join(store_dir, META_FILE), encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if meta.get("source") != EditJournal.describe_base(source_path):
+        return None
+    if not os.path.exists(os.path.join(store_dir, DATA_FILE)):
+        return None
+    return meta
+
+
+def open_dataset(source_path, data_dir, on_progress=None, cancelled=None):
+    """
+    Mở file nguồn ở chế độ phân trang: dùng lại kho nếu file chưa đổi, nếu không thì chuyển đổi.
+    Trả về: PagedDataset, hoặc None nếu bị hủy
+    """
+    store_dir = store_dir_for(data_dir, source_path)
+    meta = load_meta(source_path, store_dir)
+    if meta is None:
+        meta = build_store(source_path, store_dir, on_progress, cancelled)
+        if meta is None:
+            return None
+    elif on_progress is not None:
+        total = meta["source"]["size"]
+        on_progress(meta["rows"], total, total)
+    return PagedDataset(store_dir, meta)
+
+
+class PagedDataset:
+    """
+    Dữ liệu của file lớn: kho cột gốc (chỉ đọc) + lớp phủ các chỉnh sửa.
+    Mã dòng: dòng gốc thứ i có mã i, dòng thêm mới nhận mã tiếp theo; mã không đổi khi xóa dòng khác.
+    Dùng làm nguồn dòng cho bảng: len(), columns, page(lo, hi), row(mã dòng).
+    """
+
+    def __init__(self, store_dir, meta):
+        self.store_dir = store_dir
+        self.columns = list(meta["columns"])
+        self.base_rows = int(meta["rows"])
+        self._offsets = np.concatenate([[0], np.cumsum(meta["batch_rows"], dtype=np.int64)])
+        self._source = meta["source"]
+
+        self._file = pa.memory_map(os.path.join(store_dir, DATA_FILE), "r")
+        self._reader = pa.ipc.open_file(self._file)
+
+        # Lớp phủ
+        self.updates = {}         # {mã dòng gốc: {cột: giá trị mới}}
+        self.appended = {}        # {mã dòng mới: {cột: giá trị}} theo thứ tự thêm
+        self._deleted = set()     # Mã dòng gốc đã xóa
+        self._deleted_sorted = np.empty(0, dtype=np.int64)
+        self._deleted_dirty = False
+        self.next_id = self.base_rows
+        self.dirty = False        # Có thay đổi chưa được gộp vào file dữ liệu
+
+        self.journal = EditJournal(os.path.join(store_dir, OVERLAY_FILE))
+        self.replayed_count = self._replay()
+
+    # --- Nhật ký lớp phủ ---
+
+    def _replay(self):
+        """Áp lại lớp phủ từ nhật ký (nhật ký của lần chuyển đổi khác -> bỏ qua)"""
+        if not self.journal.exists():
+            return 0
+        base, entries = self.journal.read()
+        if base is None or any(base.get(k) != v for k, v in self._source.items()):
+            self.journal.discard()
+            return 0
+        count = 0
+        for entry in entries:
+            op = entry["op"]
+            if op == "saved":
+                self.dirty = False
+                continue
+            if op == "insert":
+                self._insert(entry["id"], entry["row"])
+            elif op == "update":
+                self._update(entry["id"], entry["row"])
+            elif op == "delete":
+                self._delete(entry["id"])
+            self.dirty = True
+            count += 1
+        return count
+
+    def _log(self, entry):
+        if not self.journal.exists():
+            self.journal.start(self._source)
+        self.journal.append(entry)
+
+    # --- Vị trí <-> mã dòng ---
+
+    def _deleted_array(self):
+        if self._deleted_dirty:
+            self._deleted_sorted = np.array(sorted(self._deleted), dtype=np.int64)
+            self._deleted_dirty = False
+        return self._deleted_sorted
+
+    def __len__(self):
+        return self.base_rows - len(self._deleted) + len(self.appended)
+
+    def ids(self, lo, hi):
+        """Mã dòng của các vị trí hiển thị [lo, hi)"""
+        deleted = self._deleted_array()
+        visible_base = self.base_rows - len(deleted)
+        positions = np.arange(max(0, lo), min(hi, len(self)), dtype=np.int64)
+        base_positions = positions[positions < visible_base]
+        # Dòng gốc thứ p (bỏ qua dòng đã xóa): p + số mã đã xóa đứng trước nó
+        shifted = deleted - np.arange(len(deleted), dtype=np.int64)
+        base_ids = base_positions + np.searchsorted(shifted, base_positions, side="right")
+        appended_ids = list(self.appended)
+        extra = [appended_ids[p - visible_base] for p in positions[positions >= visible_base]]
+        return base_ids.tolist() + extra
+
+    def contains(self, row_id):
+        if row_id in self.appended:
+            return True
+        return 0 <= row_id < self.base_rows and row_id not in self._deleted
+
+    # --- Đọc ---
+
+    def _read_base(self, row_ids):
+        """Giá trị gốc của các dòng (mã dòng gốc, tăng dần): {cột: [giá trị...]}"""
+        values = {col: [] for col in self.columns}
+        if not row_ids:
+            return values
+        ids = np.asarray(row_ids, dtype=np.int64)
+        batches = np.searchsorted(self._offsets, ids, side="right") - 1
+        for batch_index in np.unique(batches):
+            local = ids[batches == batch_index] - self._offsets[batch_index]
+            batch = self._reader.get_batch(int(batch_index)).take(pa.array(local))
+            for col, column in zip(self.columns, batch.columns):
+                values[col].extend(column.to_pylist())
+        return values
+
+    def page(self, lo, hi):
+        """Các dòng ở vị trí hiển thị [lo, hi) dạng DataFrame (index là mã dòng, ô rỗng là None)"""
+        row_ids = self.ids(lo, hi)
+        base_ids = [row_id for row_id in row_ids if row_id < self.base_rows]
+        data = self._read_base(base_ids)
+        for row_id in row_ids[len(base_ids):]:
+            row = self.appended[row_id]
+            for col in self.columns:
+                data[col].append(row.get(col))
+        df = pd.DataFrame(data, index=row_ids, columns=self.columns, dtype=object)
+        for row_id in base_ids:
+            changed = self.updates.get(row_id)
+            if changed:
+                for col, value in changed.items():
+                    df.at[row_id, col] = value
+        return df
+
+    def row(self, row_id):
+        """Một dòng dạng Series (KeyError nếu không có)"""
+        if not self.contains(row_id):
+            raise KeyError(row_id)
+        if row_id in self.appended:
+            row = self.appended[row_id]
+            return pd.Series([row.get(col) for col in self.columns], index=self.columns, dtype=object)
+        values = self._read_base([row_id])
+        series = pd.Series([values[col][0] for col in self.columns], index=self.columns, dtype=object)
+        for col, value in self.updates.get(row_id, {}).items():
+            series[col] = value
+        return series
+
+    # --- Chỉnh sửa (ghi vào lớp phủ và nhật ký) ---
+
+    def _insert(self, row_id, row):
+        self.appended[row_id] = {col: row.get(col) for col in self.columns}
+        self.next_id = max(self.next_id, row_id + 1)
+
+    def _update(self, row_id, row):
+        row = {col: value for col, value in row.items() if col in self.columns}
+        if row_id in self.appended:
+            self.appended[row_id].update(row)
+        else:
+            self.updates.setdefault(row_id, {}).update(row)
+
+    def _delete(self, row_id):
+        if row_id in self.appended:
+            del self.appended[row_id]
+        else:
+            self._deleted.add(row_id)
+            self._deleted_dirty = True
+            self.updates.pop(row_id, None)
+
+    def insert(self, row):
+        """Thêm dòng mới vào cuối, trả về mã dòng"""
+        row_id = self.next_id
+        self._insert(row_id, row)
+        self._log({"op": "insert", "id": row_id, "row": row})
+        self.dirty = True
+        return row_id
+
+    def update(self, row_id, row):
+        if not self.contains(row_id):
+            raise KeyError(row_id)
+        self._update(row_id, row)
+        self._log({"op": "update", "id": row_id, "row": row})
+        self.dirty = True
+
+    def delete(self, row_id):
+        if not self.contains(row_id):
+            raise KeyError(row_id)
+        self._delete(row_id)
+        self._log({"op": "delete", "id": row_id})
+        self.dirty = True
+
+    # --- Lưu ---
+
+    def save(self, filepath, on_progress=None):
+        """
+        Gộp dữ liệu gốc với lớp phủ và ghi ra file CSV filepath (từng khối, ghi nguyên tử qua file tạm).
+        on_progress(số dòng đã ghi, tổng số dòng). Lớp phủ được giữ lại (kho gốc không đổi),
+        chỉ đánh dấu là đã gộp.
+        """
+        deleted = self._deleted_array()
+        # Mã dòng có ô bị sửa, sắp xếp một lần -> mỗi khối chỉ lấy đoạn mã dòng nằm trong khối
+        updated = np.array(sorted(self.updates), dtype=np.int64)
+        written = 0
+        with atomic_write(filepath, suffix=".csv") as tmp_path:
+            with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+                csv.writer(f).writerow(self.columns)
+                for batch_index in range(self._reader.num_record_batches):
+                    start, end = self._offsets[batch_index], self._offsets[batch_index + 1]
+                    chunk = self._reader.get_batch(batch_index).to_pandas().astype(object)
+                    chunk.index = pd.RangeIndex(start, end)
+                    removed = deleted[(deleted >= start) & (deleted < end)]
+                    if len(removed):
+                        chunk = chunk.drop(removed)
+                    lo, hi = np.searchsorted(updated, [start, end])
+                    for row_id in updated[lo:hi].tolist():
+                        for col, value in self.updates[row_id].items():
+                            chunk.at[row_id, col] = value
+                    chunk.to_csv(f, header=False, index=False, lineterminator="\n")
+                    written += len(chunk)
+                    if on_progress is not None:
+                        on_progress(written, len(self))
+                if self.appended:
+                    extra = pd.DataFrame(list(self.appended.values()), columns=self.columns, dtype=object)
+                    extra.to_csv(f, header=False, index=False, lineterminator="\n")
+        if self.journal.exists():
+            self.journal.append({"op": "saved", "path": os.path.abspath(filepath)})
+        self.dirty = False
+        return filepath
+
+    def close(self):
+        """Đóng memory map của kho"""
+        self._reader = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
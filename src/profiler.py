@@ -0,0 +1,267 @@
+"""
+Module Profiler - Đo thời gian các thao tác nặng của ứng dụng
+Mỗi thao tác được ghi thành một "span": tên, thời gian chạy, số dòng xử lý, mức tăng bộ nhớ đỉnh.
+Tắt mặc định; khi tắt, span() trả về một đối tượng rỗng dùng chung và @profiled chỉ kiểm tra một cờ,
+nên gần như không tốn gì. Bật bằng biến môi trường:
+    DATA_APP_PROFILE=1        đo thời gian + mức tăng đỉnh RSS của tiến trình (rẻ)
+    DATA_APP_PROFILE=memory   đo thêm bộ nhớ đỉnh chính xác bằng tracemalloc (chậm hơn đáng kể)
+Phiên đo xuất được ra file JSON theo định dạng Chrome Trace Event, mở bằng chrome://tracing
+hoặc https://ui.perfetto.dev.
+
+Chỉ dùng thư viện chuẩn: module giao diện import được mà không kéo theo pandas.
+"""
+
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import deque
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# Biến môi trường bật đo
+PROFILE_ENV = "DATA_APP_PROFILE"
+
+# Số span giữ lại tối đa (span cũ nhất bị bỏ trước)
+MAX_EVENTS = 10000
+
+
+def _peak_rss():
+    """Bộ nhớ đỉnh (RSS) của tiến trình tính tới hiện tại, byte (None nếu không đọc được)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux trả về KB, macOS trả về byte
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class _NullSpan:
+    """Span rỗng khi không đo: mọi thao tác đều bỏ qua"""
+
+    rows = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """Một lần chạy thao tác. Gán span.rows trong khối with để ghi số dòng đã xử lý."""
+
+    __slots__ = ("profiler", "name", "rows", "start_ns", "_memory_start", "_child_peak")
+
+    def __init__(self, profiler, name, rows=None):
+        self.profiler = profiler
+        self.name = name
+        self.rows = rows
+
+    def __enter__(self):
+        self.profiler._push(self)
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end_ns = time.perf_counter_ns()
+        self.profiler._pop(self, end_ns)
+        return False
+
+
+class Profiler:
+    """Ghi các span của phiên làm việc (an toàn khi gọi từ nhiều luồng)"""
+
+    def __init__(self, enabled=False, trace_memory=False, max_events=MAX_EVENTS):
+        self.enabled = False
+        self.trace_memory = False
+        self._events = deque(maxlen=max_events)
+        self._recorded = 0  # Tổng số span đã ghi (kể cả span cũ đã bị bỏ)
+        self._local = threading.local()
+        self._origin_ns = time.perf_counter_ns()
+        if enabled:
+            self.enable(trace_memory)
+
+    @classmethod
+    def from_env(cls):
+        """Profiler theo biến môi trường DATA_APP_PROFILE (không có / 0: tắt)"""
+        value = os.environ.get(PROFILE_ENV, "").strip().lower()
+        if value in ("", "0", "false", "no", "off"):
+            return cls()
+        return cls(enabled=True, trace_memory=value == "memory")
+
+    def enable(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.trace_memory = False
+
+    def span(self, name, rows=None):
+        """Khối cần đo: with profiler.span("tên") as span: ...; span.rows = số dòng"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(self, name, rows)
+
+    def profiled(self, name=None, rows=None):
+        """
+        Decorator đo một hàm. name mặc định là tên đầy đủ của hàm (VD: DataHandler.load_file).
+        rows(*đối số vị trí của hàm): số dòng đã xử lý, tính sau khi hàm chạy xong.
+        """
+        def decorator(func):
+            label = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with Span(self, label) as span:
+                    result = func(*args, **kwargs)
+                    if rows is not None:
+                        span.rows = rows(*args)
+                    return result
+            return wrapper
+        return decorator
+
+    # --- Ghi span ---
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _push(self, span):
+        stack = self._stack()
+        span._child_peak = 0
+        if self.trace_memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            # Đỉnh tính từ đầu span cha tới giờ được chuyển lên span cha trước khi đặt lại
+            if stack:
+                stack[-1]._child_peak = max(stack[-1]._child_peak, peak)
+            tracemalloc.reset_peak()
+            span._memory_start = current
+        else:
+            span._memory_start = _peak_rss()
+        stack.append(span)
+
+    def _pop(self, span, end_ns):
+        stack = self._stack()
+        stack.pop()
+        depth = len(stack)
+        if self.trace_memory and tracemalloc.is_tracing():
+            peak = max(tracemalloc.get_traced_memory()[1], span._child_peak)
+            memory = peak - span._memory_start
+            if stack:
+                stack[-1]._child_peak = max(stack[-1]._child_peak, peak)
+        else:
+            peak = _peak_rss()
+            memory = peak - span._memory_start if peak is not None and span._memory_start is not None else None
+
+        thread = threading.current_thread()
+        self._events.append({
+            "name": span.name,
+            "start_ns": span.start_ns - self._origin_ns,
+            "duration_ns": end_ns - span.start_ns,
+            "rows": span.rows,
+            "memory_delta": memory,
+            "thread_id": thread.ident,
+            "thread_name": thread.name,
+            "depth": depth,
+        })
+        self._recorded += 1
+
+    # --- Đọc kết quả ---
+
+    def events(self):
+        """Bản sao danh sách span đã ghi (cũ -> mới)"""
+        return list(self._events)
+
+    def event_count(self):
+        """Tổng số span đã ghi từ đầu phiên (tăng dần, dùng để biết có span mới)"""
+        return self._recorded
+
+    def latest(self, count=3):
+        """count span cấp ngoài cùng (không nằm trong span khác) gần nhất, mới nhất trước"""
+        result = []
+        for event in reversed(self.events()):
+            if event["depth"] == 0:
+                result.append(event)
+                if len(result) == count:
+                    break
+        return result
+
+    def clear(self):
+        self._events.clear()
+
+    @staticmethod
+    def format_event(event):
+        """VD: 'DataHandler.clean_data 120 ms (891 dòng, +3.4 MB)'"""
+        ms = event["duration_ns"] / 1e6
+        text = f"{event['name']} {ms / 1000:.2f} s" if ms >= 1000 else f"{event['name']} {ms:.0f} ms"
+        details = []
+        if event["rows"] is not None:
+            details.append(f"{event['rows']:,} dòng")
+        if event["memory_delta"]:
+            details.append(f"+{event['memory_delta'] / 1024 / 1024:.1f} MB")
+        return f"{text} ({', '.join(details)})" if details else text
+
+    def export_chrome_trace(self, path):
+        """
+        Ghi các span ra file JSON định dạng Chrome Trace Event (span dạng "X", thời gian tính bằng µs).
+        Trả về: đường dẫn file
+        """
+        pid = os.getpid()
+        events = self.events()
+        trace = []
+        threads = {}
+        for event in events:
+            threads.setdefault(event["thread_id"], event["thread_name"])
+            args = {"rows": event["rows"]}
+            if event["memory_delta"] is not None:
+                args["memory_delta_bytes"] = event["memory_delta"]
+            trace.append({
+                "name": event["name"],
+                "cat": event["name"].split(".")[0].split(":")[0],
+                "ph": "X",
+                "ts": event["start_ns"] / 1000,
+                "dur": event["duration_ns"] / 1000,
+                "pid": pid,
+                "tid": event["thread_id"],
+                "args": args,
+            })
+        for tid, thread_name in threads.items():
+            trace.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                          "args": {"name": thread_name}})
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms",
+                       "otherData": {"memory": "tracemalloc" if self.trace_memory else "peak_rss"}},
+                      f, ensure_ascii=False)
+        return path
+
+
+# Profiler dùng chung của ứng dụng (bật/tắt theo biến môi trường lúc khởi động)
+profiler = Profiler.from_env()
+span = profiler.span
+profiled = profiler.profiled
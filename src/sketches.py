@@ -0,0 +1,207 @@
+"""
+Module Sketches - Thống kê xấp xỉ trên luồng dữ liệu, bộ nhớ không phụ thuộc số dòng
+Mỗi cấu trúc nhận dữ liệu theo khối (mảng numpy / Series) và gộp được với một bản cùng loại
+(VD: tính song song trên nhiều phần của file rồi gộp lại):
+    QuantileSketch  phân vị xấp xỉ (trung vị) theo kiểu KLL, sai số hạng ~ 1/k
+    HeavyHitters    giá trị phổ biến nhất (Misra-Gries), sai số đếm <= n / (số bộ đếm + 1)
+    BloomFilter     tập "đã gặp" gọn: không bao giờ sót, báo nhầm với xác suất cho trước
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+
+class QuantileSketch:
+    """
+    Phân vị xấp xỉ: các tầng nén, tầng h giữ các mẫu có trọng số 2^h.
+    Tầng đầy -> sắp xếp, giữ một nửa (vị trí chẵn hoặc lẻ, chọn ngẫu nhiên) đẩy lên tầng trên.
+    Tầng trên cùng chứa k mẫu, tầng thấp hơn nhỏ dần theo hệ số 2/3; tổng số mẫu giữ lại ~ 3k.
+    Khi chưa phải nén lần nào, kết quả là chính xác.
+    """
+
+    SHRINK = 2 / 3
+
+    def __init__(self, k=256, seed=0):
+        self.k = k
+        self.count = 0
+        self.levels = [np.empty(0)]
+        self._error = 0  # Tổng sai số hạng tối đa do các lần nén gây ra
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level):
+        return max(2, int(math.ceil(self.k * self.SHRINK ** (len(self.levels) - level - 1))))
+
+    def update(self, values):
+        """Thêm các giá trị (bỏ qua NaN)"""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return
+        self.count += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def merge(self, other):
+        """Gộp một sketch khác vào sketch này"""
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+        self.count += other.count
+        self._error += other._error
+        self._compress()
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) >= self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                items = np.sort(items)
+                # Số mẫu lẻ -> giữ lại một mẫu ở tầng này
+                keep = items[-1:] if len(items) % 2 else items[:0]
+                pairs = items[:len(items) - len(keep)]
+                promoted = pairs[self._rng.integers(0, 2)::2]
+                self.levels[level] = keep
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+                self._error += 2 ** level
+            level += 1
+
+    def is_exact(self):
+        """Chưa nén lần nào: mọi giá trị còn nguyên"""
+        return len(self.levels) == 1
+
+    def rank_error(self):
+        """Sai số hạng tối đa (tỉ lệ trên tổng số giá trị) của phân vị trả về"""
+        return self._error / self.count if self.count else 0.0
+
+    def quantile(self, q):
+        """Phân vị q (0..1); NaN nếu chưa có giá trị nào"""
+        if not self.count:
+            return np.nan
+        if self.is_exact():
+            return float(np.quantile(self.levels[0], q))
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level_items), 2 ** level, dtype=np.int64)
+                                  for level, level_items in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        cumulative = np.cumsum(weights[order])
+        position = np.searchsorted(cumulative, q * cumulative[-1], side="left")
+        return float(items[order][min(position, len(items) - 1)])
+
+    def median(self):
+        """Trung vị (khi chính xác: giống Series.median(), trung bình hai giá trị giữa)"""
+        return self.quantile(0.5)
+
+
+class HeavyHitters:
+    """
+    Giá trị phổ biến (Misra-Gries) với tối đa `counters` bộ đếm.
+    Mỗi khối được đếm chính xác rồi gộp vào: cộng bộ đếm, vượt số bộ đếm thì trừ mọi bộ đếm
+    đi giá trị lớn thứ counters + 1 và bỏ các bộ đếm <= 0. Số lần xuất hiện bị đếm thiếu
+    tối đa n / (counters + 1); số giá trị khác nhau <= counters thì kết quả là chính xác.
+    """
+
+    def __init__(self, counters=64):
+        self.counters = counters
+        self.count = 0
+        self.counts = {}
+        self._error = 0  # Tổng các lượng đã trừ = mức đếm thiếu tối đa của mỗi giá trị
+
+    def update(self, values):
+        """Thêm các giá trị (bỏ qua ô trống, như Series.mode())"""
+        counts = pd.Series(values).value_counts(dropna=True)
+        self.count += int(counts.sum())
+        self._add(zip(counts.index.tolist(), counts.tolist()))
+
+    def merge(self, other):
+        self.count += other.count
+        self._error += other._error
+        self._add(other.counts.items())
+
+    def _add(self, items):
+        counts = self.counts
+        for value, count in items:
+            counts[value] = counts.get(value, 0) + count
+        if len(counts) > self.counters:
+            cut = sorted(counts.values(), reverse=True)[self.counters]
+            self._error += cut
+            self.counts = {value: count - cut for value, count in counts.items() if count > cut}
+
+    def count_error(self):
+        """Số lần xuất hiện có thể bị đếm thiếu tối đa (tỉ lệ trên tổng số giá trị)"""
+        return self._error / self.count if self.count else 0.0
+
+    def mode(self):
+        """
+        Giá trị phổ biến nhất, None nếu chưa có giá trị nào.
+        Nhiều giá trị bằng nhau -> lấy giá trị nhỏ nhất (như Series.mode().iloc[0])
+        """
+        if not self.counts:
+            return None
+        best = max(self.counts.values())
+        tied = [value for value, count in self.counts.items() if count == best]
+        try:
+            return sorted(tied)[0]
+        except TypeError:
+            return tied[0]
+
+
+class BloomFilter:
+    """
+    Tập các khóa đã gặp dạng mảng bit: kiểm tra "có thể đã gặp" / "chắc chắn chưa gặp".
+    Khóa được đưa vào dưới dạng mã băm 64 bit (VD: pd.util.hash_array) để người gọi chọn cách
+    băm nhanh nhất cho kiểu dữ liệu của mình. Kích thước theo số khóa dự kiến và tỉ lệ báo nhầm;
+    thêm nhiều khóa hơn dự kiến vẫn đúng, chỉ báo nhầm nhiều hơn.
+    """
+
+    def __init__(self, expected_items, fp_rate=0.001):
+        expected_items = max(1, int(expected_items))
+        self.bits = max(64, int(math.ceil(-expected_items * math.log(fp_rate) / math.log(2) ** 2)))
+        self.hashes = max(1, int(round(self.bits / expected_items * math.log(2))))
+        self.fp_rate = fp_rate
+        self._array = np.zeros((self.bits + 7) // 8, dtype=np.uint8)
+
+    @property
+    def nbytes(self):
+        return self._array.nbytes
+
+    @staticmethod
+    def _mix(hashes):
+        """Mã băm thứ hai suy ra từ mã thứ nhất (hàm trộn splitmix64), luôn lẻ"""
+        with np.errstate(over="ignore"):
+            z = hashes + np.uint64(0x9E3779B97F4A7C15)
+            z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+            z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return (z ^ (z >> np.uint64(31))) | np.uint64(1)
+
+    def _positions(self, hashes):
+        """Vị trí bit (số khóa x số hàm băm) theo kỹ thuật băm kép: h1 + i * h2"""
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        second = self._mix(hashes)
+        steps = np.arange(self.hashes, dtype=np.uint64)
+        # Phép nhân/cộng uint64 tràn số theo modulo 2^64
+        with np.errstate(over="ignore"):
+            combined = hashes[:, None] + steps[None, :] * second[:, None]
+        return combined % np.uint64(self.bits)
+
+    def contains(self, hashes):
+        """Mảng bool: khóa có thể đã được thêm (False là chắc chắn chưa)"""
+        positions = self._positions(hashes)
+        bytes_ = self._array[positions >> np.uint64(3)]
+        masks = np.uint8(1) << (positions & np.uint64(7)).astype(np.uint8)
+        return (bytes_ & masks).astype(bool).all(axis=1)
+
+    def add(self, hashes):
+        positions = self._positions(hashes).ravel()
+        np.bitwise_or.at(self._array, positions >> np.uint64(3),
+                         np.uint8(1) << (positions & np.uint64(7)).astype(np.uint8))
+
+    def merge(self, other):
+        """Hợp hai bộ lọc cùng kích thước"""
+        if other.bits != self.bits or other.hashes != self.hashes:
+            raise ValueError("Chỉ gộp được hai BloomFilter cùng kích thước")
+        self._array |= other._array
@@ -0,0 +1,223 @@
+"""
+Module Sorting - Thứ tự sắp xếp của bảng theo một hoặc nhiều cột
+Không sắp xếp lại DataFrame: chỉ tính thứ tự mã dòng (argsort/lexsort trên mã thứ hạng
+của từng cột) và lưu lại theo phiên bản dữ liệu của các cột, bảng hiển thị dòng theo thứ tự đó.
+Thêm/sửa/xóa từng dòng không sắp xếp lại từ đầu: các dòng vừa đổi được gỡ khỏi thứ tự đã lưu rồi
+chèn lại đúng chỗ bằng tìm kiếm nhị phân (chỉ sau thao tác hàng loạt như load, làm sạch mới tính lại).
+"""
+
+import numpy as np
+import pandas as pd
+
+
+# Số cột / bộ khóa được lưu tối đa (mỗi mục tốn 4-8 byte x số dòng)
+MAX_ENTRIES = 4
+
+# Số dòng thay đổi tối đa được vá vào thứ tự đã lưu; nhiều hơn thì sắp xếp lại từ đầu
+PATCH_MAX_ROWS = 256
+
+
+def _rank_key(value):
+    """Khóa so sánh cho cột trộn kiểu: số trước, chuỗi sau"""
+    if isinstance(value, str):
+        return (1, 0.0, value)
+    try:
+        return (0, float(value), "")
+    except (TypeError, ValueError):
+        return (1, 0.0, str(value))
+
+
+def rank_codes(series):
+    """
+    Mã thứ hạng của từng dòng: dòng có giá trị nhỏ hơn có mã nhỏ hơn, giá trị bằng nhau cùng mã,
+    ô rỗng nhận mã lớn nhất (luôn xếp cuối). Trả về: (mảng mã, số giá trị khác nhau)
+    """
+    try:
+        codes, uniques = pd.factorize(series, sort=True, use_na_sentinel=True)
+    except TypeError:
+        # Cột trộn số và chuỗi không so sánh trực tiếp được
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+        order = sorted(range(len(uniques)), key=lambda i: _rank_key(uniques[i]))
+        ranks = np.empty(len(uniques), dtype=np.int64)
+        ranks[order] = np.arange(len(uniques))
+        codes = np.where(codes >= 0, ranks[np.maximum(codes, 0)] if len(ranks) else 0, -1)
+    n_unique = len(uniques)
+    codes = np.asarray(codes, dtype=np.int64)
+    dtype = np.int32 if n_unique < np.iinfo(np.int32).max else np.int64
+    return np.where(codes >= 0, codes, n_unique).astype(dtype), n_unique
+
+
+class _Descending:
+    """Bọc giá trị để so sánh ngược chiều (khóa giảm dần)"""
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+    def __lt__(self, other):
+        return other.value < self.value
+
+
+def _value_key(series, ascending):
+    """
+    Hàm vị trí dòng -> khóa so sánh của một cột, cùng thứ tự với rank_codes:
+    category theo thứ tự danh mục, cột object theo _rank_key, ô rỗng luôn ở cuối
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+
+        def value(position):
+            code = codes[position]
+            return None if code < 0 else int(code)
+    elif pd.api.types.is_object_dtype(series.dtype):
+        def value(position):
+            item = series.iat[position]
+            return None if pd.isna(item) else _rank_key(item)
+    else:
+        def value(position):
+            item = series.iat[position]
+            return None if pd.isna(item) else item
+
+    def key(position):
+        item = value(position)
+        if item is None:
+            return (1,)
+        return (0, item if ascending else _Descending(item))
+    return key
+
+
+def patch_order(df, keys, order, row_ids):
+    """
+    Vá thứ tự mã dòng order (đúng với dữ liệu trước khi các dòng row_ids thay đổi):
+    gỡ các dòng đó rồi chèn lại những dòng còn tồn tại vào đúng chỗ theo giá trị hiện tại.
+    Chi phí O(số dòng) thao tác mảng + O(số dòng đổi x log(số dòng)) phép so sánh.
+    """
+    row_ids = np.asarray(row_ids, dtype=order.dtype)
+    remaining = order[~np.isin(order, row_ids)]
+    index_ids = df.index.to_numpy()
+    value_keys = [_value_key(df[column], ascending) for column, ascending in keys]
+
+    def row_key(row_id):
+        position = int(np.searchsorted(index_ids, row_id))
+        # Mã dòng tăng theo vị trí -> so mã dòng giữ thứ tự ổn định như argsort(kind="stable")
+        return tuple(key(position) for key in value_keys) + (row_id,)
+
+    inserts = []
+    positions = np.searchsorted(index_ids, row_ids)
+    for row_id, position in zip(row_ids.tolist(), positions.tolist()):
+        if position >= len(index_ids) or index_ids[position] != row_id:
+            continue  # Dòng đã bị xóa
+        target = row_key(row_id)
+        lo, hi = 0, len(remaining)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if row_key(int(remaining[mid])) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        inserts.append((lo, target, row_id))
+    if not inserts:
+        return remaining
+    # Các dòng chèn cùng một chỗ được xếp theo khóa của chính chúng
+    inserts.sort(key=lambda item: item[:2])
+    return np.insert(remaining, [item[0] for item in inserts], [item[2] for item in inserts])
+
+
+class SortCache:
+    """
+    Lưu mã thứ hạng theo từng cột và thứ tự mã dòng theo từng bộ khóa sắp xếp.
+    Khóa lưu là phiên bản dữ liệu của các cột (DataHandler.columns_version):
+    sửa một cột chỉ làm mất thứ tự của các bộ khóa có cột đó.
+    Các thay đổi từng dòng được ghi lại qua on_change (như ColumnIndexes) để vá thứ tự đã lưu
+    thay vì sắp xếp lại; thao tác hàng loạt không báo qua on_change nên thứ tự được tính lại.
+    """
+
+    def __init__(self):
+        self._codes = {}   # {cột: (phiên bản, mã thứ hạng, số giá trị khác nhau)}
+        self._orders = {}  # {bộ khóa: (phiên bản cột, phiên bản dữ liệu, thứ tự mã dòng)}
+        self._touched = {}         # {mã dòng: tập cột đã sửa, None: dòng được thêm/xóa}
+        self._touched_since = 0    # Phiên bản dữ liệu ngay trước thay đổi đầu tiên trong _touched
+        self._touched_version = 0  # Phiên bản dữ liệu sau thay đổi cuối cùng trong _touched
+
+    @staticmethod
+    def _store(entries, key, value):
+        """Lưu một mục, bỏ mục cũ nhất khi vượt MAX_ENTRIES"""
+        entries.pop(key, None)
+        entries[key] = value
+        while len(entries) > MAX_ENTRIES:
+            entries.pop(next(iter(entries)))
+
+    def _column_codes(self, data_handler, column):
+        version = data_handler.columns_version([column])
+        entry = self._codes.get(column)
+        if entry is None or entry[0] != version:
+            codes, n_unique = rank_codes(data_handler.df[column])
+            entry = (version, codes, n_unique)
+            self._store(self._codes, column, entry)
+        return entry[1], entry[2]
+
+    def on_change(self, version, row_id, columns=None):
+        """
+        Dòng row_id vừa được thêm/xóa (columns=None) hoặc sửa các cột columns,
+        version: phiên bản dữ liệu sau thay đổi (DataHandler.version)
+        """
+        if self._touched_version != version - 1 or len(self._touched) >= PATCH_MAX_ROWS:
+            # Có thay đổi không báo qua đây (thao tác hàng loạt) hoặc đã quá nhiều -> bắt đầu lại
+            self._touched = {}
+            self._touched_since = version - 1
+        if columns is None or self._touched.get(row_id, ()) is None:
+            self._touched[row_id] = None
+        else:
+            self._touched[row_id] = self._touched.get(row_id, set()) | set(columns)
+        self._touched_version = version
+
+    def _patchable(self, data_handler, entry):
+        """Thứ tự đã lưu vá được bằng các thay đổi trong _touched (ghi liền mạch tới hiện tại)"""
+        return (entry is not None and self._touched_since <= entry[1]
+                and self._touched_version == data_handler.version)
+
+    def order(self, data_handler, keys):
+        """
+        Mã dòng theo keys = [(cột, tăng dần?), ...] (khóa đầu tiên quan trọng nhất).
+        Sắp xếp ổn định: các dòng bằng nhau giữ thứ tự ban đầu. Ô rỗng luôn ở cuối.
+        Mảng trả về được lưu lại, không sửa trực tiếp.
+        """
+        keys = tuple(keys)
+        key_columns = {column for column, _ in keys}
+        version = data_handler.columns_version([column for column, _ in keys])
+        entry = self._orders.get(keys)
+        if entry is not None and entry[0] == version:
+            # Vẫn đúng ở phiên bản dữ liệu hiện tại -> các thay đổi sau chỉ cần vá từ đây
+            self._orders[keys] = (version, data_handler.version, entry[2])
+            return entry[2]
+        df = data_handler.df
+        if self._patchable(data_handler, entry):
+            row_ids = [row_id for row_id, columns in self._touched.items()
+                       if columns is None or columns & key_columns]
+            order = patch_order(df, keys, entry[2], row_ids)
+            self._store(self._orders, keys, (version, data_handler.version, order))
+            return order
+
+        sort_keys = []
+        for column, ascending in keys:
+            codes, n_unique = self._column_codes(data_handler, column)
+            if not ascending:
+                # Đảo thứ tự các giá trị nhưng ô rỗng (mã n_unique) vẫn ở cuối
+                codes = np.where(codes < n_unique, n_unique - 1 - codes, n_unique)
+            sort_keys.append(codes)
+
+        if len(sort_keys) == 1:
+            permutation = np.argsort(sort_keys[0], kind="stable")
+        else:
+            # lexsort coi khóa cuối cùng là khóa chính
+            permutation = np.lexsort(sort_keys[::-1])
+        order = df.index.to_numpy()[permutation]
+        self._store(self._orders, keys, (version, data_handler.version, order))
+        return order
+
+    def clear(self):
+        self._codes.clear()
+        self._orders.clear()
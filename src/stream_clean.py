@@ -0,0 +1,209 @@
+"""
+Module StreamClean - Làm sạch file CSV theo luồng, không nạp cả file vào bộ nhớ
+Cùng kế hoạch với cleaning.clean_frame nhưng đọc file hai lượt theo khối:
+    Lượt 1: trên các dòng đủ khóa, ước lượng trung vị (QuantileSketch) và giá trị phổ biến nhất
+            (HeavyHitters); tìm các PassengerId có thể bị trùng bằng BloomFilter; ghi nhận kiểu
+            của từng cột ở mọi khối
+    Lượt 2: đọc lại với kiểu cột thống nhất cho mọi khối (như khi đọc cả file), bỏ dòng thiếu khóa
+            và dòng trùng (so sánh chính xác, chỉ trên các mã nghi trùng), làm sạch từng cột bằng
+            transform_column rồi ghi nối vào file kết quả
+Bộ nhớ gồm một khối dữ liệu, các sketch (cố định), bộ lọc Bloom (~1.8 byte mỗi dòng với tỉ lệ báo
+nhầm 0.1%) và các mã nghi trùng. Kết quả giống clean_frame, trừ giá trị điền của Age/Fare (trung vị
+ước lượng) và Pclass/Embarked khi cột có quá nhiều giá trị khác nhau; sai số nằm trong
+CleaningReport.estimated.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from .atomic import atomic_write
+from .cleaning import (CleaningReport, MEDIAN_COLUMNS, MODE_COLUMNS,
+                       build_fill_values, missing_key_mask, transform_column)
+from .sketches import BloomFilter, HeavyHitters, QuantileSketch
+from .profiler import profiled
+
+
+# Số dòng mỗi khối
+CHUNK_ROWS = 50000
+
+# Độ chính xác mặc định: số mẫu của sketch trung vị, số bộ đếm giá trị phổ biến,
+# tỉ lệ báo nhầm của bộ lọc Bloom (chỉ ảnh hưởng số mã phải so sánh chính xác)
+QUANTILE_K = 512
+HEAVY_HITTERS = 64
+BLOOM_FP_RATE = 0.001
+
+# Kiểu cột thống nhất cho lượt đọc thứ hai (theo dtype.kind gộp từ mọi khối)
+_KIND_DTYPES = {"i": "int64", "u": "uint64", "f": "float64", "b": "bool", "O": "str"}
+
+
+def _merge_kind(a, b):
+    """Kiểu chung của một cột ở hai khối: số nguyên + số thực -> số thực, khác nữa -> chuỗi"""
+    if a is None or a == b:
+        return b
+    if {a, b} <= {"i", "u", "f"}:
+        return "f"
+    return "O"
+
+
+def _id_hashes(series):
+    """
+    Mã băm 64 bit của PassengerId không phụ thuộc kiểu cột của khối: 5, 5.0 và "5" cùng một mã
+    (khối có ô trống đọc thành số thực, khối có chữ đọc thành chuỗi). Số nguyên băm rất nhanh,
+    chỉ các mã khác mới phải băm dạng chuỗi.
+    """
+    numeric = pd.to_numeric(series, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+    integral = np.isfinite(numeric) & (numeric % 1 == 0)
+    hashes = np.empty(len(series), dtype=np.uint64)
+    hashes[integral] = pd.util.hash_array(numeric[integral].astype(np.int64))
+    other = ~integral
+    if other.any():
+        hashes[other] = pd.util.hash_array(series[other].astype(str).to_numpy(dtype=object))
+    return hashes
+
+
+def _id_key(value):
+    """Khóa so sánh chính xác của một PassengerId, cùng quy ước với _id_hashes"""
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return str(value)
+    return int(number) if number.is_integer() else str(value)
+
+
+class StreamCleaner:
+    """Làm sạch một file CSV theo khối, ghi kết quả ra file CSV khác"""
+
+    def __init__(self, chunksize=CHUNK_ROWS, quantile_k=QUANTILE_K,
+                 heavy_hitters=HEAVY_HITTERS, fp_rate=BLOOM_FP_RATE):
+        self.chunksize = chunksize
+        self.quantile_k = quantile_k
+        self.heavy_hitters = heavy_hitters
+        self.fp_rate = fp_rate
+
+        # Kết quả lượt 1 (giữ lại để xem sau khi chạy)
+        self.rows = 0
+        self.columns = []
+        self.kinds = {}           # {cột: dtype.kind chung của mọi khối}
+        self.quantiles = {}       # {cột: QuantileSketch}
+        self.modes = {}           # {cột: HeavyHitters}
+        self.bloom = None
+        self.suspects = np.empty(0, dtype=np.uint64)  # Mã băm các PassengerId có thể bị trùng
+        self.fill_values = {}
+
+    @profiled(rows=lambda self, *_: self.rows)
+    def clean(self, source, target, on_progress=None):
+        """
+        Làm sạch file source, ghi kết quả ra target (ghi nguyên tử qua file tạm, không bao giờ ghi dở).
+        on_progress(lượt 1/2, byte đã đọc, tổng byte).
+        Trả về: CleaningReport
+        """
+        if not source.lower().endswith('.csv'):
+            raise ValueError("Làm sạch theo luồng chỉ hỗ trợ file CSV")
+        self.rows = 0
+        self._scan(source, on_progress)
+        return self._write(source, target, on_progress)
+
+    def _chunks(self, source, dtype=None):
+        """(khối, byte đã đọc, tổng byte) của file"""
+        total_bytes = os.path.getsize(source)
+        with open(source, 'rb') as f:
+            for chunk in pd.read_csv(f, chunksize=self.chunksize, dtype=dtype):
+                yield chunk, f.tell(), total_bytes
+
+    def _scan(self, source, on_progress):
+        """Lượt 1: sketch trung vị / giá trị phổ biến, bộ lọc Bloom cho PassengerId, kiểu cột"""
+        self.columns = list(pd.read_csv(source, nrows=0).columns)
+        self.kinds = {}
+        self.quantiles = {col: QuantileSketch(self.quantile_k) for col in MEDIAN_COLUMNS if col in self.columns}
+        self.modes = {col: HeavyHitters(self.heavy_hitters) for col in MODE_COLUMNS if col in self.columns}
+        self.bloom = None
+        suspects = []
+
+        for chunk, bytes_read, total_bytes in self._chunks(source):
+            self.rows += len(chunk)
+            for col in self.columns:
+                self.kinds[col] = _merge_kind(self.kinds.get(col), chunk[col].dtype.kind)
+
+            keep = ~missing_key_mask(chunk)
+            for col, sketch in self.quantiles.items():
+                sketch.update(pd.to_numeric(chunk[col][keep], errors="coerce").to_numpy(
+                    dtype=np.float64, na_value=np.nan))
+            for col, counter in self.modes.items():
+                counter.update(chunk[col][keep])
+
+            if 'PassengerId' in self.columns:
+                hashes = _id_hashes(chunk['PassengerId'][keep])
+                if self.bloom is None:
+                    # Ước lượng số dòng của cả file theo số byte mỗi dòng của khối đầu
+                    bytes_per_row = max(1, bytes_read) / max(1, len(chunk))
+                    self.bloom = BloomFilter(1.1 * total_bytes / bytes_per_row + len(chunk), self.fp_rate)
+                # Nghi trùng: bộ lọc báo đã gặp ở khối trước, hoặc trùng trong chính khối này
+                seen = self.bloom.contains(hashes) | pd.Series(hashes).duplicated().to_numpy()
+                if seen.any():
+                    suspects.append(hashes[seen])
+                self.bloom.add(hashes)
+
+            if on_progress is not None:
+                on_progress(1, bytes_read, total_bytes)
+
+        self.suspects = np.unique(np.concatenate(suspects)) if suspects else np.empty(0, dtype=np.uint64)
+
+        def mode_of(col):
+            return self.modes[col].mode()
+
+        self.fill_values = build_fill_values(self.columns, lambda col: self.quantiles[col].median(), mode_of)
+
+    def _write(self, source, target, on_progress):
+        """Lượt 2: bỏ dòng thiếu khóa / trùng, làm sạch từng cột, ghi nối ra file tạm rồi đổi tên"""
+        report = CleaningReport(0)
+        for col, sketch in self.quantiles.items():
+            if not sketch.is_exact():
+                report.estimated[col] = sketch.rank_error()
+        for col, counter in self.modes.items():
+            if counter.count_error():
+                report.estimated[col] = counter.count_error()
+
+        dtype = {col: _KIND_DTYPES.get(kind, "str") for col, kind in self.kinds.items()}
+        seen = set()  # PassengerId (khóa chính xác) đã gặp trong số các mã nghi trùng
+
+        with atomic_write(target, suffix=".csv") as tmp_path:
+            with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+                header = True
+                for chunk, bytes_read, total_bytes in self._chunks(source, dtype):
+                    cleaned, chunk_report = self._clean_chunk(chunk, seen)
+                    report.merge(chunk_report)
+                    if len(cleaned) or header:
+                        cleaned.to_csv(f, header=header, index=False)
+                        header = False
+                    if on_progress is not None:
+                        on_progress(2, bytes_read, total_bytes)
+                if header:
+                    # File không có dòng dữ liệu nào
+                    pd.DataFrame(columns=self.columns).to_csv(f, index=False)
+        return report
+
+    def _clean_chunk(self, chunk, seen):
+        """Làm sạch một khối. Trả về: (khối đã làm sạch, CleaningReport của khối)"""
+        report = CleaningReport(len(chunk))
+        missing = missing_key_mask(chunk)
+        keep = ~missing
+        report.dropped_missing_key = int(missing.sum())
+
+        if 'PassengerId' in chunk.columns and len(self.suspects):
+            ids = chunk['PassengerId']
+            positions = np.flatnonzero(keep)
+            suspect = np.isin(_id_hashes(ids.iloc[positions]), self.suspects)
+            for position in positions[suspect]:
+                key = _id_key(ids.iat[position])
+                if key in seen:
+                    keep[position] = False
+                    report.dropped_duplicates += 1
+                else:
+                    seen.add(key)
+
+        columns = {col: transform_column(col, chunk[col][keep], self.fill_values, report)
+                   for col in chunk.columns}
+        report.rows_after = int(keep.sum())
+        return pd.DataFrame(columns, index=chunk.index[keep], copy=False), report
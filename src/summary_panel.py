@@ -0,0 +1,84 @@
+"""
+Module SummaryPanel
+Cửa sổ thống kê mô tả các cột số (số ô, ô trống, trung bình, độ lệch chuẩn, min, max).
+Số liệu lấy từ DataHandler.summary_stats() (cập nhật dần theo từng thao tác) nên bảng được
+làm mới sau mỗi lần Thêm/Sửa/Xóa mà không phải duyệt lại dữ liệu.
+"""
+
+import math
+import tkinter as tk
+from tkinter import ttk
+
+from .profiler import span
+
+
+# Cột của bảng: (khóa trong bảng thống kê, tiêu đề)
+SUMMARY_COLUMNS = [
+    ("count", "Số ô"),
+    ("missing", "Trống"),
+    ("mean", "Trung bình"),
+    ("std", "Độ lệch chuẩn"),
+    ("min", "Nhỏ nhất"),
+    ("max", "Lớn nhất"),
+]
+
+
+def _format(value):
+    """Hiển thị một số liệu (ô trống khi không tính được)"""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return ""
+    if float(value).is_integer() and abs(value) < 1e15:
+        return f"{int(value):,}"
+    return f"{value:,.4f}"
+
+
+class SummaryPanel:
+    """Popup bảng thống kê mô tả, chỉ tạo một lần và được làm mới khi dữ liệu đổi"""
+
+    def __init__(self, parent_window):
+        self.parent = parent_window
+        self.data_handler = None
+        self.popup = None
+        self.tree = None
+
+    def show(self, data_handler):
+        """Mở (hoặc đưa lên trên) cửa sổ thống kê"""
+        if data_handler.df.empty:
+            return
+        self.data_handler = data_handler
+        if self.popup is not None:
+            self.popup.lift()
+            self.refresh()
+            return
+
+        popup = tk.Toplevel(self.parent)
+        popup.title("Thống kê mô tả")
+        popup.geometry("760x300")
+        popup.protocol("WM_DELETE_WINDOW", self._close_popup)
+        self.popup = popup
+
+        columns = [key for key, _ in SUMMARY_COLUMNS]
+        self.tree = ttk.Treeview(popup, columns=columns, show="tree headings")
+        self.tree.heading("#0", text="Cột")
+        self.tree.column("#0", width=120, anchor="w")
+        for key, title in SUMMARY_COLUMNS:
+            self.tree.heading(key, text=title)
+            self.tree.column(key, width=100, anchor="e")
+        self.tree.pack(fill="both", expand=True, padx=10, pady=10)
+        self.refresh()
+
+    def _close_popup(self):
+        self.popup.destroy()
+        self.popup = None
+        self.tree = None
+
+    def refresh(self):
+        """Dữ liệu vừa thay đổi: làm mới bảng nếu cửa sổ đang mở"""
+        if self.tree is None or self.data_handler is None or self.data_handler.paged is not None:
+            return
+        stats = self.data_handler.summary_stats()
+        with span("summary:render", rows=len(stats)):
+            self.tree.delete(*self.tree.get_children())
+            for column, row in stats.iterrows():
+                self.tree.insert("", "end", text=str(column),
+                                 values=[_format(row[key]) for key, _ in SUMMARY_COLUMNS])
@@ -3,13 +3,37 @@ Module UI Components
 Chứa các thành phần giao diện người dùng
 """
 
-import pandas as pd
 import tkinter as tk
 from tkinter import ttk
 
+from .profiler import profiled
+
+
+def _is_missing(value):
+    """Ô rỗng (None, NaN, NaT, pd.NA) - không cần import pandas chỉ để gọi pd.isna"""
+    if value is None:
+        return True
+    try:
+        return bool(value != value)
+    except TypeError:
+        # pd.NA: phép so sánh trả về NA, không chuyển được sang bool
+        return True
+
+
+def _is_paged(source):
+    """Nguồn dòng đọc theo trang (PagedDataset: page(lo, hi), row(mã dòng)) thay vì DataFrame"""
+    return callable(getattr(type(source), "page", None))
+
+
 class UIComponents:
     """Lớp quản lý các thành phần UI"""
     
+    # Số dòng đệm render thêm phía trên/dưới vùng đang nhìn thấy
+    OVERSCAN_ROWS = 20
+    
+    # Số dòng cuộn mỗi lần lăn chuột
+    WHEEL_STEP = 3
+    
     def __init__(self, root):
         self.root = root
         self.entry_widgets = {}
@@ -17,6 +41,9 @@ class UIComponents:
         # KHUNG ĐIỀU KHIỂN TRÊN CÙNG
         self.top_frame = None
         self.lbl_status = None
+        self.lbl_perf = None
+        self.btn_cancel_load = None
+        self.cmb_sheet = None
         
         # KHUNG NHẬP LIỆU
         self.input_frame = None
@@ -24,11 +51,36 @@ class UIComponents:
         # KHUNG CHỨC NĂNG
         self.btn_frame = None
         
+        # THANH TÌM KIẾM / LỌC
+        self.filter_frame = None
+        self.cmb_filter_column = None
+        self.entry_filter = None
+        self.lbl_filter = None
+        
         # BẢNG DỮ LIỆU
         self.tree = None
+        self.scrolly = None
+        
+        # Trạng thái bảng ảo: chỉ các dòng trong cửa sổ [lo, hi) nằm trong TreeView
+        self._view_df = None
+        self._view_ids = None        # Mã dòng đang hiển thị theo thứ tự khi lọc/sắp xếp (None: mọi dòng)
+        self._first_row = 0          # Dòng đầu tiên đang hiển thị
+        self._visible_rows = 25      # Số dòng vừa khung nhìn
+        self._window = (0, 0)        # Khoảng dòng đã render vào TreeView
+        self._rerender_pending = False
+        self._selected_iid = None    # Giữ lựa chọn khi dòng bị cuộn ra khỏi cửa sổ
         
-    def create_top_frame(self, import_command):
-        """Tạo khung điều khiển trên cùng"""
+        # Sắp xếp theo tiêu đề cột: [(cột, tăng dần?), ...], khóa đầu tiên quan trọng nhất
+        self.sort_keys = []
+        self._sort_callback = None
+        
+    def create_top_frame(self, import_command, cancel_command=None, optimize_command=None,
+                         trace_command=None, sheet_command=None):
+        """
+        Tạo khung điều khiển trên cùng
+        trace_command: có khi bật đo hiệu năng -> thêm nút xuất trace và nhãn thời gian các thao tác
+        sheet_command(tên sheet): chọn sheet của file Excel nhiều sheet
+        """
         self.top_frame = tk.Frame(self.root, pady=10)
         self.top_frame.pack(fill="x")
         
@@ -43,10 +95,43 @@ class UIComponents:
         )
         btn_import.pack(side="left", padx=20)
         
+        # Nút hủy đọc file (chỉ bật khi đang đọc file)
+        if cancel_command is not None:
+            self.btn_cancel_load = tk.Button(
+                self.top_frame,
+                text="Hủy",
+                state="disabled",
+                command=cancel_command
+            )
+            self.btn_cancel_load.pack(side="left", padx=(0, 20))
+        
+        # Tùy chọn tối ưu bộ nhớ khi mở file (category, kiểu số nhỏ nhất)
+        if optimize_command is not None:
+            optimize_var = tk.BooleanVar(value=False)
+            tk.Checkbutton(
+                self.top_frame,
+                text="Tối ưu bộ nhớ",
+                variable=optimize_var,
+                command=lambda: optimize_command(optimize_var.get())
+            ).pack(side="left", padx=(0, 20))
+        
+        # Chọn sheet (chỉ bật khi file Excel đang mở có nhiều sheet)
+        if sheet_command is not None:
+            tk.Label(self.top_frame, text="Sheet:").pack(side="left")
+            self.cmb_sheet = ttk.Combobox(self.top_frame, state="disabled", width=15)
+            self.cmb_sheet.pack(side="left", padx=(5, 20))
+            self.cmb_sheet.bind("<<ComboboxSelected>>", lambda event: sheet_command(self.cmb_sheet.get()))
+        
         # Label trạng thái
         self.lbl_status = tk.Label(self.top_frame, text="Chưa có dữ liệu", fg="red")
         self.lbl_status.pack(side="left")
         
+        # Thời gian các thao tác gần nhất (chỉ khi bật đo hiệu năng)
+        if trace_command is not None:
+            tk.Button(self.top_frame, text="Xuất trace", command=trace_command).pack(side="right", padx=10)
+            self.lbl_perf = tk.Label(self.top_frame, text="", fg="gray")
+            self.lbl_perf.pack(side="right")
+        
         return self.top_frame
     
     def create_input_frame(self):
@@ -55,7 +140,8 @@ class UIComponents:
         self.input_frame.pack(fill="x", padx=10, pady=5)
         return self.input_frame
     
-    def create_button_frame(self, add_cmd, update_cmd, delete_cmd, clean_cmd, plot_cmd):
+    def create_button_frame(self, add_cmd, update_cmd, delete_cmd, clean_cmd, plot_cmd,
+                            undo_cmd=None, redo_cmd=None, stats_cmd=None):
         """Tạo khung chứa các nút chức năng"""
         self.btn_frame = tk.Frame(self.root)
         self.btn_frame.pack(fill="x", padx=10, pady=5)
@@ -84,6 +170,12 @@ class UIComponents:
             command=delete_cmd
         ).pack(side="left", padx=5)
         
+        # Hoàn tác / Làm lại (Ctrl+Z / Ctrl+Y)
+        if undo_cmd is not None:
+            tk.Button(self.btn_frame, text="↶ Hoàn tác", command=undo_cmd).pack(side="left", padx=(15, 5))
+        if redo_cmd is not None:
+            tk.Button(self.btn_frame, text="↷ Làm lại", command=redo_cmd).pack(side="left", padx=5)
+        
         tk.Button(
             self.btn_frame, 
             text="Làm sạch (Fill Null)", 
@@ -96,16 +188,63 @@ class UIComponents:
             command=plot_cmd
         ).pack(side="right", padx=5)
         
+        # Bảng thống kê mô tả các cột số
+        if stats_cmd is not None:
+            tk.Button(self.btn_frame, text="Thống kê", command=stats_cmd).pack(side="right", padx=5)
+        
         return self.btn_frame
     
-    def create_tree_view(self, select_callback):
-        """Tạo bảng dữ liệu (TreeView)"""
+    def create_filter_bar(self, filter_command, clear_command):
+        """
+        Tạo thanh tìm kiếm/lọc: chọn cột, nhập biểu thức rồi bấm Lọc (hoặc Enter)
+        filter_command(cột, biểu thức), clear_command()
+        """
+        self.filter_frame = tk.Frame(self.root)
+        self.filter_frame.pack(fill="x", padx=10)
+        
+        tk.Label(self.filter_frame, text="Lọc theo cột:").pack(side="left")
+        self.cmb_filter_column = ttk.Combobox(self.filter_frame, state="readonly", width=15)
+        self.cmb_filter_column.pack(side="left", padx=5)
+        
+        self.entry_filter = tk.Entry(self.filter_frame, width=25)
+        self.entry_filter.pack(side="left", padx=5)
+        
+        def apply_filter(event=None):
+            column = self.cmb_filter_column.get()
+            if column:
+                filter_command(column, self.entry_filter.get())
+        
+        self.entry_filter.bind("<Return>", apply_filter)
+        tk.Button(self.filter_frame, text="Lọc", command=apply_filter).pack(side="left", padx=5)
+        tk.Button(self.filter_frame, text="Bỏ lọc", command=clear_command).pack(side="left", padx=5)
+        
+        # Gợi ý cú pháp / kết quả lọc
+        self.lbl_filter = tk.Label(self.filter_frame, text="VD: 347082  |  20..30  |  >= 100", fg="gray")
+        self.lbl_filter.pack(side="left", padx=10)
+        
+        return self.filter_frame
+    
+    def set_filter_result(self, text):
+        """Hiển thị kết quả lọc (số dòng, thời gian)"""
+        if self.lbl_filter:
+            self.lbl_filter.config(text=text, fg="black")
+    
+    def clear_filter_input(self):
+        """Xóa ô nhập biểu thức lọc"""
+        if self.entry_filter:
+            self.entry_filter.delete(0, tk.END)
+    
+    def create_tree_view(self, select_callback, sort_callback=None):
+        """
+        Tạo bảng dữ liệu (TreeView) ở chế độ ảo
+        sort_callback(sort_keys): gọi khi bấm tiêu đề cột (Shift + bấm: thêm khóa sắp xếp phụ)
+        """
         tree_frame = tk.Frame(self.root)
         tree_frame.pack(fill="both", expand=True, padx=10, pady=10)
         
-        # Scrollbar dọc
-        scrolly = ttk.Scrollbar(tree_frame, orient="vertical")
-        scrolly.pack(side="right", fill="y")
+        # Scrollbar dọc: điều khiển theo số dòng của DataFrame, không theo số item trong TreeView
+        self.scrolly = ttk.Scrollbar(tree_frame, orient="vertical", command=self._on_scrollbar)
+        self.scrolly.pack(side="right", fill="y")
         
         # Scrollbar ngang
         scrollx = ttk.Scrollbar(tree_frame, orient="horizontal")
@@ -114,20 +253,90 @@ class UIComponents:
         # TreeView
         self.tree = ttk.Treeview(
             tree_frame, 
-            yscrollcommand=scrolly.set, 
+            yscrollcommand=self._on_tree_yview, 
             xscrollcommand=scrollx.set, 
             show="headings"
         )
         self.tree.pack(side="left", fill="both", expand=True)
         
-        scrolly.config(command=self.tree.yview)
         scrollx.config(command=self.tree.xview)
         
+        # Tính lại số dòng nhìn thấy khi đổi kích thước cửa sổ
+        self.tree.bind("<Configure>", self._on_tree_resize)
+        
+        # Lăn chuột (Windows/macOS dùng <MouseWheel>, Linux dùng Button-4/5)
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", lambda e: self._scroll_by(-self.WHEEL_STEP))
+        self.tree.bind("<Button-5>", lambda e: self._scroll_by(self.WHEEL_STEP))
+        
         # Sự kiện chọn dòng
-        self.tree.bind("<<TreeviewSelect>>", select_callback)
+        def on_select(event):
+            selected = self.tree.selection()
+            if not selected:
+                return
+            # Bỏ qua khi chỉ là khôi phục lựa chọn sau khi render lại cửa sổ
+            if selected[0] == self._selected_iid:
+                return
+            self._selected_iid = selected[0]
+            select_callback(event)
+        
+        self.tree.bind("<<TreeviewSelect>>", on_select)
+        
+        # Bấm tiêu đề cột để sắp xếp
+        self._sort_callback = sort_callback
+        if sort_callback is not None:
+            self.tree.bind("<Button-1>", lambda e: self._on_heading_click(e, multi=False))
+            self.tree.bind("<Shift-Button-1>", lambda e: self._on_heading_click(e, multi=True))
         
         return self.tree
     
+    def _on_heading_click(self, event, multi):
+        """Bấm tiêu đề cột: tăng dần -> giảm dần -> bỏ sắp xếp"""
+        if self.tree.identify_region(event.x, event.y) != "heading":
+            return
+        column_id = self.tree.identify_column(event.x)  # Dạng "#1", "#2"...
+        columns = list(self.tree["columns"])
+        position = int(column_id[1:]) - 1 if column_id else -1
+        if not 0 <= position < len(columns):
+            return
+        self.sort_keys = self._next_sort_keys(self.sort_keys, columns[position], multi)
+        self._update_headings()
+        self._sort_callback(list(self.sort_keys))
+    
+    @staticmethod
+    def _next_sort_keys(keys, column, multi):
+        """Bộ khóa sắp xếp mới sau khi bấm tiêu đề column"""
+        current = dict(keys).get(column)
+        if not multi:
+            # Bấm thường: chỉ sắp xếp theo cột này
+            if len(keys) == 1 and current is not None:
+                return [(column, False)] if current else []
+            return [(column, True)]
+        # Shift + bấm: thêm/đảo/bỏ khóa của cột này, giữ các khóa khác
+        if current is None:
+            return keys + [(column, True)]
+        if current:
+            return [(col, False if col == column else asc) for col, asc in keys]
+        return [(col, asc) for col, asc in keys if col != column]
+    
+    def _update_headings(self):
+        """Hiện mũi tên (và thứ tự khóa khi sắp xếp nhiều cột) trên tiêu đề"""
+        order = {col: (i, asc) for i, (col, asc) in enumerate(self.sort_keys)}
+        for col in self.tree["columns"]:
+            text = col
+            if col in order:
+                i, asc = order[col]
+                text += " ▲" if asc else " ▼"
+                if len(self.sort_keys) > 1:
+                    text += str(i + 1)
+            self.tree.heading(col, text=text)
+    
+    def clear_sort(self):
+        """Bỏ sắp xếp (VD: khi mở file mới)"""
+        self.sort_keys = []
+        if self.tree is not None:
+            self._update_headings()
+    
     def refresh_input_widgets(self, columns):
         """Tạo lại các ô nhập liệu dựa trên danh sách cột"""
         # Xóa widget cũ trong input_frame
@@ -154,16 +363,208 @@ class UIComponents:
         for col in columns:
             self.tree.heading(col, text=col)
             self.tree.column(col, width=100) # Độ rộng mặc định
+        
+        # Bỏ khóa sắp xếp của cột không còn tồn tại
+        self.sort_keys = [(col, asc) for col, asc in self.sort_keys if col in columns]
+        self._update_headings()
+        
+        # Cột của thanh lọc theo cột của bảng
+        if self.cmb_filter_column is not None:
+            self.cmb_filter_column["values"] = columns
+            if self.cmb_filter_column.get() not in columns:
+                self.cmb_filter_column.set(columns[0] if columns else "")
+    
+    @profiled(rows=lambda self, *_: self._row_count())
+    def populate_tree(self, df, row_ids=None, keep_selection=False):
+        """
+        Đổ dữ liệu vào TreeView (chế độ ảo)
+        Chỉ các dòng trong khung nhìn (cộng thêm vùng đệm) được tạo item,
+        các dòng còn lại được tạo khi người dùng cuộn tới.
+        df: DataFrame, hoặc nguồn dòng đọc theo trang ở chế độ phân trang (xem module paged)
+        row_ids: chỉ hiển thị các mã dòng này theo đúng thứ tự (kết quả lọc/sắp xếp), None: mọi dòng
+        keep_selection: giữ dòng đang chọn (VD: khi chỉ đổi thứ tự sắp xếp)
+        """
+        self._view_df = df
+        self._view_ids = row_ids
+        if not keep_selection:
+            self._selected_iid = None
+        self._window = (0, 0)
+        
+        # Giữ vị trí cuộn hiện tại nếu vẫn hợp lệ
+        self._first_row = self._clamp_first_row(self._first_row)
+        self._render_window()
+    
+    def apply_row_changes(self, df, changes, row_ids=None):
+        """
+        Cập nhật TreeView theo các dòng đã thay đổi (xem DataHandler.pop_changes)
+        Chỉ chạm vào các item trong cửa sổ đang render nên chi phí không phụ thuộc số dòng.
+        Giả định mã dòng tăng dần theo vị trí trong DataFrame.
+        row_ids: các dòng hiển thị tính lại sau thay đổi (khi đang lọc/sắp xếp)
+        """
+        self._view_df = df
+        if row_ids is not None or self._view_ids is not None:
+            # Đang lọc/sắp xếp: thứ tự dòng đã được tính lại -> chỉ render lại cửa sổ hiện tại
+            self._view_ids = row_ids
+            if self._selected_iid is not None and int(self._selected_iid) in changes["removed"]:
+                self._selected_iid = None
+            self._first_row = self._clamp_first_row(self._first_row)
+            self._render_window()
+            return
+        
+        lo, hi = self._window
+        children = self.tree.get_children()
+        first_id = int(children[0]) if children else None
+        needs_render = False
+        
+        # Dòng bị xóa: trong cửa sổ -> render lại; phía trên cửa sổ -> dịch cửa sổ lên
+        for row_id in changes["removed"]:
+            iid = str(row_id)
+            if iid == self._selected_iid:
+                self._selected_iid = None
+            if self.tree.exists(iid):
+                needs_render = True
+            elif first_id is not None and row_id < first_id:
+                lo, hi = lo - 1, hi - 1
+                self._first_row -= 1
+        self._window = (max(0, lo), max(0, hi))
+        
+        # Dòng bị sửa: chỉ cập nhật giá trị của item nếu đang được render
+        for row_id in changes["modified"]:
+            iid = str(row_id)
+            if not needs_render and self.tree.exists(iid):
+                row = df.row(row_id) if _is_paged(df) else df.loc[row_id]
+                self.tree.item(iid, values=self._format_values(row))
+        
+        # Dòng mới luôn nằm cuối bảng -> chỉ render lại nếu cửa sổ đang chạm cuối bảng
+        inserted = len(changes["inserted"])
+        if inserted and self._window[1] >= len(df) - inserted:
+            needs_render = True
+        
+        self._first_row = self._clamp_first_row(self._first_row)
+        if needs_render:
+            self._render_window()
+        else:
+            self._update_scrollbar()
+    
+    @staticmethod
+    def _format_values(row):
+        """Chuyển một dòng thành danh sách giá trị hiển thị (NaN -> chuỗi rỗng)"""
+        return ["" if _is_missing(val) else val for val in row.tolist()]
+    
+    def _row_count(self):
+        """Tổng số dòng đang hiển thị (của DataFrame, hoặc của kết quả lọc/sắp xếp)"""
+        if self._view_ids is not None:
+            return len(self._view_ids)
+        return 0 if self._view_df is None else len(self._view_df)
+    
+    def _clamp_first_row(self, first):
+        """Giới hạn dòng đầu tiên trong khoảng hợp lệ"""
+        max_first = max(0, self._row_count() - self._visible_rows)
+        return max(0, min(int(first), max_first))
     
-    def populate_tree(self, df):
-        """Đổ dữ liệu vào TreeView"""
-        # Xóa dữ liệu cũ
+    def _render_window(self):
+        """Tạo lại các item của TreeView cho cửa sổ quanh dòng đầu tiên"""
+        self._rerender_pending = False
+        total = self._row_count()
+        lo = max(0, self._first_row - self.OVERSCAN_ROWS)
+        hi = min(total, self._first_row + self._visible_rows + self.OVERSCAN_ROWS)
+        
+        # Xóa dữ liệu cũ (chỉ có vài chục item nên rất nhanh)
         self.tree.delete(*self.tree.get_children())
+        self._window = (lo, hi)
+        
+        if hi > lo:
+            # Chỉ thay NaN bằng chuỗi rỗng trên lát cắt cần hiển thị
+            if self._view_ids is not None:
+                chunk = self._view_df.loc[self._view_ids[lo:hi]].astype(object)
+            elif _is_paged(self._view_df):
+                chunk = self._view_df.page(lo, hi)
+            else:
+                chunk = self._view_df.iloc[lo:hi].astype(object)
+            display_df = chunk.where(chunk.notna(), "")
+            for index, values in zip(display_df.index, display_df.itertuples(index=False, name=None)):
+                self.tree.insert("", "end", iid=index, values=list(values))
+            
+            # Khôi phục lựa chọn nếu dòng đang chọn nằm trong cửa sổ mới
+            if self._selected_iid is not None and self.tree.exists(self._selected_iid):
+                self.tree.selection_set(self._selected_iid)
         
-        # Thay NaN bằng chuỗi rỗng để hiển thị đẹp
-        display_df = df.fillna("")
-        for index, row in display_df.iterrows():
-            self.tree.insert("", "end", iid=index, values=list(row))
+        self._sync_tree_position()
+    
+    def _sync_tree_position(self):
+        """Cuộn TreeView để dòng đầu tiên nằm trên cùng và cập nhật scrollbar"""
+        lo, hi = self._window
+        if hi > lo:
+            self.tree.yview_moveto((self._first_row - lo) / (hi - lo))
+        self._update_scrollbar()
+    
+    def _update_scrollbar(self):
+        """Đặt vị trí thanh cuộn theo tổng số dòng của DataFrame"""
+        total = self._row_count()
+        if total == 0:
+            self.scrolly.set(0, 1)
+            return
+        first = self._first_row / total
+        last = min(1.0, (self._first_row + self._visible_rows) / total)
+        self.scrolly.set(first, last)
+    
+    def _scroll_to(self, first):
+        """Cuộn tới dòng first, chỉ render lại khi ra khỏi cửa sổ đã tạo"""
+        self._first_row = self._clamp_first_row(first)
+        lo, hi = self._window
+        end = min(self._row_count(), self._first_row + self._visible_rows)
+        if lo <= self._first_row and end <= hi:
+            self._sync_tree_position()
+        else:
+            self._render_window()
+    
+    def _scroll_by(self, rows):
+        """Cuộn tương đối một số dòng"""
+        self._scroll_to(self._first_row + rows)
+        return "break"
+    
+    def _on_scrollbar(self, *args):
+        """Xử lý kéo/bấm thanh cuộn dọc"""
+        if args[0] == "moveto":
+            self._scroll_to(float(args[1]) * self._row_count())
+        elif args[0] == "scroll":
+            step = int(args[1])
+            if args[2] == "pages":
+                step *= self._visible_rows
+            self._scroll_by(step)
+    
+    def _on_mousewheel(self, event):
+        """Lăn chuột trên Windows/macOS"""
+        step = -self.WHEEL_STEP if event.delta > 0 else self.WHEEL_STEP
+        return self._scroll_by(step)
+    
+    def _on_tree_yview(self, first, last):
+        """
+        TreeView tự cuộn bên trong cửa sổ (VD: di chuyển bằng phím mũi tên)
+        -> đồng bộ lại dòng đầu tiên, render thêm khi gần chạm biên cửa sổ
+        """
+        lo, hi = self._window
+        if hi <= lo:
+            return
+        self._first_row = self._clamp_first_row(lo + round(float(first) * (hi - lo)))
+        self._update_scrollbar()
+        
+        near_top = lo > 0 and self._first_row < lo + self.OVERSCAN_ROWS // 2
+        near_bottom = hi < self._row_count() and \
+            self._first_row + self._visible_rows > hi - self.OVERSCAN_ROWS // 2
+        if (near_top or near_bottom) and not self._rerender_pending:
+            self._rerender_pending = True
+            self.tree.after_idle(self._render_window)
+    
+    def _on_tree_resize(self, event):
+        """Tính lại số dòng vừa khung nhìn theo chiều cao của TreeView"""
+        style = ttk.Style()
+        row_height = int(style.lookup("Treeview", "rowheight") or 20)
+        # Trừ phần tiêu đề cột
+        visible = max(1, (event.height - row_height) // row_height)
+        if visible != self._visible_rows:
+            self._visible_rows = visible
+            self._scroll_to(self._first_row)
     
     def get_entry_values(self):
         """Lấy giá trị từ các ô nhập liệu"""
@@ -174,6 +575,9 @@ class UIComponents:
         selected_item = self.tree.selection()
         if selected_item:
             return int(selected_item[0])
+        # Dòng đang chọn có thể đã bị cuộn ra khỏi cửa sổ render
+        if self._selected_iid is not None:
+            return int(self._selected_iid)
         return None
     
     def fill_entry_values(self, row_data):
@@ -182,11 +586,27 @@ class UIComponents:
             entry.delete(0, tk.END)
             if col in row_data.index:
                 val = row_data[col]
-                if pd.notna(val):
+                if not _is_missing(val):
                     entry.insert(0, str(val))
     
+    def set_loading(self, loading):
+        """Bật/tắt nút Hủy trong lúc đọc file"""
+        if self.btn_cancel_load:
+            self.btn_cancel_load.config(state="normal" if loading else "disabled")
+    
+    def set_sheets(self, names, current):
+        """Cập nhật danh sách sheet của file đang mở (ít hơn hai sheet -> tắt ô chọn)"""
+        if self.cmb_sheet:
+            self.cmb_sheet.config(values=names, state="readonly" if len(names) > 1 else "disabled")
+            self.cmb_sheet.set(current or "")
+    
     def update_status_label(self, text, color):
         """Cập nhật label trạng thái"""
         if self.lbl_status:
             self.lbl_status.config(text=text, fg=color)
+    
+    def update_perf_label(self, text):
+        """Cập nhật nhãn thời gian các thao tác"""
+        if self.lbl_perf:
+            self.lbl_perf.config(text=text)
 
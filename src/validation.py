@@ -0,0 +1,166 @@
+"""
+Module Validation - Kiểm tra ràng buộc dữ liệu
+Các luật được định nghĩa một lần và áp dụng dạng vector trên cả cột,
+dùng chung cho việc kiểm tra một dòng nhập liệu và kiểm tra toàn bộ file
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def _numeric_values(series, parse_strings=False):
+    """
+    Chuyển cột về mảng số thực, giá trị không phải số -> NaN.
+    Cột object chỉ xét trên các giá trị khác nhau (factorize) nên vẫn nhanh với cột lớn.
+    parse_strings=True: chấp nhận cả chuỗi số như "1".
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = _numeric_values(pd.Series(series.cat.categories, dtype=object), parse_strings)
+        codes = series.cat.codes.to_numpy()
+        return np.where(codes >= 0, categories[codes], np.nan)
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        return series.to_numpy(dtype="float64", na_value=np.nan)
+
+    codes, uniques = pd.factorize(series)
+    values = np.full(len(uniques) + 1, np.nan)
+    for i, val in enumerate(uniques):
+        if isinstance(val, (int, float, np.number)):
+            values[i] = float(val)
+        elif parse_strings and isinstance(val, str):
+            try:
+                values[i] = float(val.strip())
+            except ValueError:
+                pass
+    # Mã -1 (giá trị thiếu) trỏ vào phần tử NaN cuối cùng
+    return values[codes]
+
+
+def _normalized_strings(series):
+    """Chuẩn hóa chuỗi (chữ thường, bỏ khoảng trắng) trên các giá trị khác nhau"""
+    codes, uniques = pd.factorize(series)
+    normalized = np.array([str(val).lower().strip() for val in uniques] + [None], dtype=object)
+    return normalized[codes]
+
+
+class Rule:
+    """Một luật kiểm tra trên một cột"""
+
+    def __init__(self, name, column, message, check):
+        """check(series) -> mảng bool, True tại các dòng vi phạm"""
+        self.name = name
+        self.column = column
+        self.message = message
+        self.check = check
+
+
+def _allowed_numbers(allowed):
+    """Giá trị phải là một trong các số cho phép (chấp nhận cả chuỗi "0", "1"...)"""
+    allowed = np.array(sorted(allowed), dtype="float64")
+
+    def check(series):
+        return ~np.isin(_numeric_values(series, parse_strings=True), allowed)
+    return check
+
+
+def _allowed_strings(allowed):
+    """Giá trị (đã chuẩn hóa) phải là một trong các chuỗi cho phép"""
+    allowed = list(allowed)
+
+    def check(series):
+        return ~np.isin(_normalized_strings(series), allowed)
+    return check
+
+
+def _is_not_number(series):
+    return np.isnan(_numeric_values(series))
+
+
+def _age_out_of_range(series):
+    values = _numeric_values(series)
+    with np.errstate(invalid="ignore"):
+        return ~np.isnan(values) & ~((values > 0) & (values <= 146))
+
+
+def _is_negative(series):
+    values = _numeric_values(series)
+    with np.errstate(invalid="ignore"):
+        return values < 0
+
+
+# Danh sách luật theo thứ tự kiểm tra (luật đầu tiên vi phạm sẽ được báo khi nhập một dòng)
+RULES = [
+    # 1. Kiểm tra Survived (0 hoặc 1)
+    Rule("survived_value", "Survived", "Cột 'Survived' chỉ được nhập 0 hoặc 1.", _allowed_numbers({0, 1})),
+    # 2. Kiểm tra Pclass (1, 2, 3)
+    Rule("pclass_value", "Pclass", "Cột 'Pclass' chỉ được nhập 1, 2 hoặc 3.", _allowed_numbers({1, 2, 3})),
+    # 3. Kiểm tra Sex (male hoặc female)
+    Rule("sex_value", "Sex", "Cột 'Sex' chỉ được nhập 'male' hoặc 'female'.", _allowed_strings({"male", "female"})),
+    # 4. Kiểm tra Age (>0 và <=146)
+    Rule("age_number", "Age", "Cột 'Age' phải là số.", _is_not_number),
+    Rule("age_range", "Age", "Cột 'Age' phải lớn hơn 0 và nhỏ hơn hoặc bằng 146.", _age_out_of_range),
+]
+
+# 5. Các cột bắt buộc là số: SibSp, Parch, Fare
+for _col in ['SibSp', 'Parch', 'Fare']:
+    RULES.append(Rule(f"{_col.lower()}_number", _col, f"Cột '{_col}' bắt buộc phải nhập số.", _is_not_number))
+    RULES.append(Rule(f"{_col.lower()}_negative", _col, f"Cột '{_col}' không được là số âm.", _is_negative))
+
+
+class ValidationReport:
+    """Kết quả kiểm tra cả bảng: với mỗi luật, danh sách mã dòng vi phạm"""
+
+    def __init__(self, total_rows, violations):
+        self.total_rows = total_rows
+        # {tên luật: mảng mã dòng vi phạm}, chỉ chứa các luật có vi phạm
+        self.violations = violations
+
+    @property
+    def is_valid(self):
+        return not self.violations
+
+    def counts(self):
+        """Số dòng vi phạm theo từng luật"""
+        return {name: len(ids) for name, ids in self.violations.items()}
+
+    def row_ids(self):
+        """Mã các dòng vi phạm ít nhất một luật (đã sắp xếp)"""
+        if not self.violations:
+            return np.array([], dtype="int64")
+        return np.unique(np.concatenate(list(self.violations.values())))
+
+    def messages_for(self, row_id):
+        """Các thông báo lỗi của một dòng"""
+        rules = {rule.name: rule for rule in RULES}
+        return [rules[name].message for name, ids in self.violations.items() if row_id in ids]
+
+    def summary(self):
+        """Tóm tắt ngắn gọn để hiển thị trên thanh trạng thái"""
+        if self.is_valid:
+            return "Dữ liệu hợp lệ"
+        detail = ", ".join(f"{name}: {count}" for name, count in self.counts().items())
+        return f"{len(self.row_ids()):,} dòng vi phạm ({detail})"
+
+
+def validate_frame(df):
+    """Áp dụng tất cả luật lên các cột có trong DataFrame, trả về ValidationReport"""
+    violations = {}
+    index = df.index.to_numpy()
+    for rule in RULES:
+        if rule.column not in df.columns:
+            continue
+        mask = rule.check(df[rule.column])
+        if mask.any():
+            violations[rule.name] = index[mask]
+    return ValidationReport(len(df), violations)
+
+
+def validate_row(row_data):
+    """
+    Kiểm tra một dòng (dict cột -> giá trị) bằng cùng bộ luật.
+    Trả về: (True, "") nếu hợp lệ, (False, "Lỗi...") nếu không hợp lệ.
+    """
+    for rule in RULES:
+        if rule.column in row_data:
+            if rule.check(pd.Series([row_data[rule.column]], dtype=object))[0]:
+                return False, rule.message
+    return True, ""
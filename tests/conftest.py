@@ -0,0 +1,40 @@
+"""
+Cấu hình chung cho bộ kiểm thử: chạy từ thư mục gốc bằng `python -m pytest`
+"""
+
+import os
+import shutil
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.data_handler import DataHandler  # noqa: E402
+
+TITANIC_CSV = os.path.join(ROOT, "original_data", "titanic.csv")
+
+
+@pytest.fixture
+def titanic_csv(tmp_path):
+    """Bản sao của file Titanic mẫu (nhật ký và file lưu nằm trong tmp_path)"""
+    path = tmp_path / "titanic.csv"
+    shutil.copy(TITANIC_CSV, path)
+    return str(path)
+
+
+@pytest.fixture
+def make_handler(tmp_path):
+    """Tạo DataHandler với thư mục data riêng, không dùng bộ đệm"""
+    def make():
+        return DataHandler(data_dir=str(tmp_path / "data"), use_cache=False)
+    return make
+
+
+@pytest.fixture
+def handler(make_handler, titanic_csv):
+    """DataHandler đã load file Titanic mẫu"""
+    h = make_handler()
+    h.load_file(titanic_csv)
+    return h
@@ -0,0 +1,55 @@
+"""
+Kiểm thử số liệu biểu đồ: KDE xấp xỉ so với KDE chính xác, mô-men cập nhật dần so với pandas
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.aggregates import FAST_KDE_MIN_ROWS, compute_age, exact_kde, kde_grid, scott_bandwidth
+from src.density import binned_kde
+
+
+def test_binned_kde_close_to_exact():
+    values = np.random.default_rng(0).normal(30, 10, 20000)
+    bandwidth = scott_bandwidth(values)
+    grid = kde_grid(values, bandwidth)
+    np.testing.assert_allclose(binned_kde(values, grid, bandwidth), exact_kde(values, grid, bandwidth),
+                               atol=1e-4)
+
+
+@pytest.mark.parametrize("rows", [100, FAST_KDE_MIN_ROWS + 10])
+def test_age_density_when_all_ages_equal(rows):
+    with np.errstate(all="raise"):
+        result = compute_age(pd.DataFrame({"Age": np.full(rows, 30.0)}))
+    assert np.isfinite(result["kde_y"]).all()
+    assert (result["kde_y"] > 0).all()
+
+
+def test_age_density_same_for_both_paths():
+    """Cùng một dữ liệu hằng số: đường xấp xỉ (nhiều dòng) khớp công thức chính xác"""
+    rows = FAST_KDE_MIN_ROWS + 10
+    ages = np.full(rows, 30.0)
+    result = compute_age(pd.DataFrame({"Age": ages}))
+    bandwidth = scott_bandwidth(ages)
+    expected = exact_kde(ages, result["kde_x"], bandwidth) * rows * (result["edges"][1] - result["edges"][0])
+    np.testing.assert_allclose(result["kde_y"], expected, rtol=1e-3)
+
+
+def test_running_moments_match_pandas(handler):
+    numeric = handler.df.select_dtypes("number")
+    pd.testing.assert_frame_equal(handler.moments.correlation(handler.df), numeric.corr(), atol=1e-9)
+
+    handler.add_row({"PassengerId": 1000, "Survived": 1, "Age": 40.0, "Fare": 3.0, "Pclass": 2})
+    handler.update_row(0, {"Age": None, "Fare": 1000.0})
+    handler.delete_row(1)
+    numeric = handler.df.select_dtypes("number")
+    pd.testing.assert_frame_equal(handler.moments.correlation(handler.df), numeric.corr(),
+                                  atol=1e-9, check_dtype=False)
+
+    stats = handler.summary_stats()
+    np.testing.assert_allclose(stats["mean"], numeric.mean(), rtol=1e-9)
+    np.testing.assert_allclose(stats["std"], numeric.std(), rtol=1e-9)
+    np.testing.assert_array_equal(stats["count"], numeric.count())
+    np.testing.assert_allclose(stats["min"], numeric.min())
+    np.testing.assert_allclose(stats["max"], numeric.max())
@@ -0,0 +1,204 @@
+"""
+Kiểm thử module excel_io: ghi rồi đọc lại, đọc file do openpyxl ghi và file XML viết tay
+(chuỗi dùng chung nhiều đoạn, thực thể XML, ngày hệ 1904, ô đúng/sai, ô thưa, cột sau Z)
+"""
+
+import datetime
+import io
+import zipfile
+
+import numpy as np
+import openpyxl
+import pandas as pd
+import pytest
+
+from src import excel_io
+
+
+MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+
+def openpyxl_frame(path, sheet=None):
+    """Đọc sheet bằng nhánh openpyxl của module (làm mốc so sánh cho bộ đọc nhanh)"""
+    frames = [frame for frame, _ in excel_io._iter_sheet_openpyxl(path, sheet, chunksize=1 << 30)]
+    df = pd.concat(frames, ignore_index=True).infer_objects()
+    # openpyxl cho datetime64[us], bộ đọc nhanh cho datetime64[ns]
+    for col in df.columns[df.dtypes.map(lambda dtype: dtype.kind == "M")]:
+        df[col] = df[col].astype("datetime64[ns]")
+    # Ô trống của cột object: openpyxl cho None, bộ đọc nhanh cho NaN
+    for col in df.columns[df.dtypes == object]:
+        df[col] = df[col].where(df[col].notna(), np.nan)
+    return df
+
+
+def build_xlsx(path, rows, shared=(), date1904=False):
+    """
+    Dựng file .xlsx tối giản từ XML viết tay
+    rows: [(số dòng Excel, XML các ô)], shared: nội dung các <si> của bảng chuỗi dùng chung
+    Kiểu ô s="1": ngày (mã có sẵn 14), s="2": ngày giờ (mã tự định nghĩa)
+    """
+    workbook_pr = '<workbookPr date1904="1"/>' if date1904 else ""
+    sheet_data = "".join(f'<row r="{number}">{cells}</row>' for number, cells in rows)
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("xl/workbook.xml", (
+            f'<workbook xmlns="{MAIN_NS}" xmlns:r="{REL_NS}">{workbook_pr}'
+            '<sheets><sheet name="Data" sheetId="1" r:id="rId1"/></sheets></workbook>'))
+        zf.writestr("xl/_rels/workbook.xml.rels", (
+            f'<Relationships xmlns="{PKG_REL_NS}">'
+            f'<Relationship Id="rId1" Type="{REL_NS}/worksheet" Target="worksheets/sheet1.xml"/>'
+            f'<Relationship Id="rId2" Type="{REL_NS}/sharedStrings" Target="sharedStrings.xml"/>'
+            f'<Relationship Id="rId3" Type="{REL_NS}/styles" Target="styles.xml"/>'
+            '</Relationships>'))
+        zf.writestr("xl/styles.xml", (
+            f'<styleSheet xmlns="{MAIN_NS}">'
+            '<numFmts count="1"><numFmt numFmtId="164" formatCode="dd/mm/yyyy hh:mm"/></numFmts>'
+            '<cellXfs count="3"><xf numFmtId="0"/><xf numFmtId="14"/><xf numFmtId="164"/></cellXfs>'
+            '</styleSheet>'))
+        zf.writestr("xl/sharedStrings.xml",
+                    f'<sst xmlns="{MAIN_NS}">' + "".join(f"<si>{item}</si>" for item in shared) + "</sst>")
+        zf.writestr("xl/worksheets/sheet1.xml",
+                    f'<worksheet xmlns="{MAIN_NS}"><sheetData>{sheet_data}</sheetData></worksheet>')
+    return str(path)
+
+
+def sample_frame():
+    wide = {f"c{i}": np.arange(3) + i for i in range(30)}
+    return pd.DataFrame({
+        "int": [1, 2, 3],
+        "float": [1.5, np.nan, -2.25],
+        "text": ["a & b", "<tag>", "\"q\" 'x'"],
+        "viet": ["Tiếng Việt", None, "ü"],
+        "flag": [True, False, True],
+        "when": pd.to_datetime(["2020-01-01", "1999-12-31 12:30:00.250", None], format="mixed"),
+        "empty": [np.nan] * 3,
+        **wide,
+    })
+
+
+@pytest.mark.parametrize("index", [0, 25, 26, 27, 51, 52, 701, 702, 16383])
+def test_column_letters_round_trip(index):
+    assert excel_io.column_index(excel_io.column_letter(index)) == index
+
+
+def test_column_letters():
+    assert [excel_io.column_letter(i) for i in (0, 25, 26, 27, 701, 702)] == ["A", "Z", "AA", "AB", "ZZ", "AAA"]
+
+
+def test_write_then_read_round_trip(tmp_path):
+    df = sample_frame()
+    path = str(tmp_path / "out.xlsx")
+    excel_io.write_workbook(path, {"S": df, "Khác": df.head(1)})
+
+    assert excel_io.sheet_names(path) == ["S", "Khác"]
+    result = excel_io.read_sheet(path)
+    expected = df.assign(when=df["when"].astype("datetime64[ns]"))
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+    assert result["flag"].dtype == bool
+    assert list(result.columns[-2:]) == ["c28", "c29"]
+
+    sheets = excel_io.read_sheets(path)
+    assert list(sheets) == ["S", "Khác"]
+    pd.testing.assert_frame_equal(sheets["Khác"], result.head(1), check_dtype=False)
+
+
+def test_write_in_chunks_matches_single_block(tmp_path):
+    df = pd.DataFrame({"id": np.arange(1000), "name": [f"n{i} &" for i in range(1000)]})
+    path = str(tmp_path / "chunks.xlsx")
+    excel_io.write_workbook(path, {"S": df}, chunksize=64)
+    pd.testing.assert_frame_equal(excel_io.read_sheet(path), df, check_dtype=False)
+    chunks = [chunk for chunk, _ in excel_io.iter_sheet(path, chunksize=100)]
+    assert sum(len(chunk) for chunk in chunks) == len(df)
+
+
+def test_matches_openpyxl_on_openpyxl_file(tmp_path):
+    """File do openpyxl ghi (chuỗi dùng chung, ngày giờ, đúng/sai, ô thưa, cột sau Z)"""
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(["id", "name", "born", "ok"] + [f"x{i}" for i in range(26)])
+    ws.append([1, "An & Bình <b>", datetime.datetime(1990, 5, 17, 8, 30), True] + list(range(26)))
+    ws.append([2, None, None, False])
+    ws.append([3, "An & Bình <b>", datetime.datetime(2024, 12, 31, 23, 59, 59, 999000), None]
+              + [None] * 25 + [99.5])
+    path = str(tmp_path / "openpyxl.xlsx")
+    wb.save(path)
+
+    result = excel_io.read_sheet(path)
+    expected = openpyxl_frame(path)
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+    assert result.loc[0, "born"] == pd.Timestamp("1990-05-17 08:30")
+    assert result["x25"].tolist()[::2] == [25.0, 99.5]
+
+
+def test_hand_written_workbook(tmp_path):
+    shared = [
+        "<t>Name</t>",
+        "<t>When</t>",
+        # Chuỗi nhiều đoạn định dạng
+        '<r><rPr><b/></rPr><t>Bold</t></r><r><t xml:space="preserve"> tail</t></r>',
+        "<t>A &amp; B &lt;C&gt;</t>",
+        # Phần phiên âm (rPh) không thuộc giá trị ô
+        '<t>漢字</t><rPh sb="0" eb="2"><t>かんじ</t></rPh>',
+        "<t>N/A</t>",
+    ]
+    rows = [
+        (1, '<c r="A1" t="s"><v>0</v></c><c r="B1" t="s"><v>1</v></c>'
+            '<c r="C1" t="inlineStr"><is><t>Flag</t></is></c><c r="AB1" t="str"><v>Far</v></c>'),
+        (2, '<c r="A2" t="s"><v>2</v></c><c r="B2" s="1"><v>0</v></c>'
+            '<c r="C2" t="b"><v>1</v></c><c r="AB2"><v>7</v></c>'),
+        (3, '<c r="A3" t="s"><v>3</v></c><c r="B3" s="2"><v>1.5</v></c><c r="C3" t="b"><v>0</v></c>'),
+        # Dòng 4 trống hoàn toàn
+        (5, '<c r="A5" t="s"><v>4</v></c><c r="C5" t="e"><v>#DIV/0!</v></c>'
+            '<c r="AB5" t="str"><f>1+1</f><v>2.5</v></c>'),
+        (6, '<c r="A6" t="inlineStr"><is><r><t>in</t></r><r><t>line &amp;</t></r></is></c>'
+            '<c r="B6" s="1"><v>366</v></c>'),
+        (7, '<c r="A7" t="s"><v>5</v></c>'),
+    ]
+    path = build_xlsx(tmp_path / "hand.xlsx", rows, shared, date1904=True)
+    result = excel_io.read_sheet(path)
+
+    assert list(result.columns[:3]) == ["Name", "When", "Flag"]
+    assert result.columns[27] == "Far" and len(result.columns) == 28
+    assert result.columns[3] == "Unnamed: 3"
+    assert len(result) == 6
+
+    names = result["Name"].tolist()
+    assert names[:2] == ["Bold tail", "A & B <C>"]
+    assert pd.isna(names[2]) and names[3] == "漢字" and names[4] == "inline &"
+    assert pd.isna(names[5])  # "N/A" là ô trống như pandas
+
+    # Hệ 1904: ngày 0 là 1904-01-01
+    when = result["When"]
+    assert when.dtype.kind == "M"
+    assert when[0] == pd.Timestamp("1904-01-01")
+    assert when[1] == pd.Timestamp("1904-01-02 12:00")
+    assert pd.isna(when[2]) and pd.isna(when[3])
+    assert when[4] == pd.Timestamp("1905-01-01")
+
+    flags = result["Flag"].tolist()
+    assert flags[:2] == [True, False]
+    assert all(pd.isna(value) for value in flags[2:])  # Dòng trống, ô lỗi, ô không có
+
+    far = result["Far"].tolist()
+    assert far[0] == 7 and far[3] == "2.5"
+    assert all(pd.isna(far[i]) for i in (1, 2, 4, 5))
+
+
+def test_date1900_epoch(tmp_path):
+    rows = [(1, '<c r="A1" t="inlineStr"><is><t>d</t></is></c>'),
+            (2, '<c r="A2" s="1"><v>43831</v></c>'),
+            (3, '<c r="A3" s="2"><v>43831.75</v></c>')]
+    path = build_xlsx(tmp_path / "d.xlsx", rows)
+    assert excel_io.read_sheet(path)["d"].tolist() == [pd.Timestamp("2020-01-01"), pd.Timestamp("2020-01-01 18:00")]
+
+
+@pytest.mark.parametrize("header", ["a,a,a.1", "a,a.1,a", "a,a,a,a.1,a.2", "x,x,x.1,x.1", "a,b,a,b,a"])
+def test_duplicate_headers_like_read_csv(tmp_path, header):
+    names = header.split(",")
+    cells = "".join(f'<c r="{excel_io.column_letter(i)}1" t="inlineStr"><is><t>{name}</t></is></c>'
+                    for i, name in enumerate(names))
+    values = "".join(f'<c r="{excel_io.column_letter(i)}2"><v>{i}</v></c>' for i in range(len(names)))
+    path = build_xlsx(tmp_path / "dup.xlsx", [(1, cells), (2, values)])
+    expected = pd.read_csv(io.StringIO(header + "\n" + ",".join(map(str, range(len(names))))))
+    assert list(excel_io.read_sheet(path).columns) == list(expected.columns)
@@ -0,0 +1,110 @@
+"""
+Kiểm thử Hoàn tác / Làm lại: hoàn tác hết phải về đúng dữ liệu ban đầu, làm lại hết phải về
+đúng dữ liệu sau các thao tác; mô tả trên thanh trạng thái là thao tác thuận
+"""
+
+import pandas as pd
+import pytest
+
+from src.history import EditHistory
+
+
+@pytest.fixture
+def small_handler(make_handler, titanic_csv, tmp_path):
+    """DataHandler với 5 dòng đầu của file mẫu (thao tác trên mọi dòng)"""
+    path = tmp_path / "small.csv"
+    pd.read_csv(titanic_csv).head(5).to_csv(path, index=False)
+    h = make_handler()
+    h.load_file(str(path))
+    return h
+
+
+def edit_sequence(h):
+    """Một chuỗi thao tác đủ loại, trả về mô tả (thao tác thuận) theo thứ tự thực hiện"""
+    new_id = h.add_row({"PassengerId": 1000, "Survived": 1, "Name": "Mới", "Age": 5.0})
+    h.update_row(3, {"Age": None, "Embarked": "Q"})
+    h.delete_row(7)
+    h.update_row(new_id, {"Fare": 9.5})
+    h.clean_data(persist=False)
+    h.delete_row(0)
+    return [f"thêm dòng {new_id}", "sửa dòng 3 (Age, Embarked)", "xóa dòng 7",
+            f"sửa dòng {new_id} (Fare)", "làm sạch dữ liệu", "xóa dòng 0"]
+
+
+def test_undo_all_then_redo_all(handler):
+    original = handler.df.copy()
+    labels = edit_sequence(handler)
+    edited = handler.df.copy()
+
+    undone = [handler.undo() for _ in labels]
+    assert undone == labels[::-1]
+    assert handler.undo() is None
+    # Cột đã được nới kiểu khi thêm dòng (VD: int64 -> Int64) giữ kiểu mới, giá trị phải như cũ
+    pd.testing.assert_frame_equal(handler.df, original, check_dtype=False)
+
+    redone = [handler.redo() for _ in labels]
+    assert redone == labels
+    assert handler.redo() is None
+    pd.testing.assert_frame_equal(handler.df, edited)
+
+
+def test_redo_describes_forward_action(handler):
+    handler.delete_row(4)
+    assert handler.undo() == "xóa dòng 4"
+    assert handler.redo() == "xóa dòng 4"
+    handler.clean_data(persist=False)
+    assert handler.undo() == "làm sạch dữ liệu"
+    assert handler.redo() == "làm sạch dữ liệu"
+
+
+def test_new_edit_clears_redo(handler):
+    handler.update_row(1, {"Age": 1.0})
+    handler.undo()
+    handler.update_row(2, {"Age": 2.0})
+    assert handler.redo() is None
+
+
+def test_undo_after_deleting_last_row(small_handler):
+    h = small_handler
+    original = h.df.copy()
+    for row_id in list(h.df.index):
+        h.delete_row(row_id)
+    assert h.df.empty
+    assert h.undo() == f"xóa dòng {original.index[-1]}"
+    assert len(h.df) == 1
+    while h.undo() is not None:
+        pass
+    pd.testing.assert_frame_equal(h.df, original)
+
+
+def test_undo_clean_that_drops_every_row(small_handler):
+    h = small_handler
+    for row_id in h.df.index:
+        h.update_row(row_id, {"Survived": None})
+    before = h.df.copy()
+    h.clean_data(persist=False)
+    assert h.df.empty
+    assert h.undo() == "làm sạch dữ liệu"
+    pd.testing.assert_frame_equal(h.df, before)
+    assert h.redo() == "làm sạch dữ liệu"
+    assert h.df.empty
+
+
+def test_undo_keeps_row_position(handler):
+    before = list(handler.df.index)
+    handler.delete_row(100)
+    handler.undo()
+    assert list(handler.df.index) == before
+
+
+@pytest.mark.parametrize("budget", [0, 200])
+def test_history_budget_evicts_oldest(budget):
+    history = EditHistory(max_bytes=budget)
+    for i in range(5):
+        history.push({"op": "update", "id": i, "old": {"Age": 1.0}, "new": {"Age": 2.0}})
+    assert history.total_bytes <= budget
+    kept = []
+    while (delta := history.pop_undo()) is not None:
+        kept.append(delta["id"])
+    assert kept == sorted(kept, reverse=True)
+    assert not kept or kept[0] == 4
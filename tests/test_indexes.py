@@ -0,0 +1,75 @@
+"""
+Kiểm thử chỉ mục theo cột: kết quả lọc qua chỉ mục (kể cả sau khi chỉ mục được cập nhật dần
+theo các thao tác) phải trùng với duyệt toàn bộ cột bằng scan_filter
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from src.indexes import parse_filter, scan_filter
+
+
+QUERIES = {
+    "PassengerId": ["1", "= 891", "500", "1000", "abc", "10..20", ">= 880"],
+    "Ticket": ["347082", "CA. 2343", "PC 17599", "không có"],
+    "Age": ["22", "0.42..1", "> 60", "<= 5", ">= 80", "30..30", "..10"],
+    "Fare": ["0", "7.25", "> 500", "< 5", "10..20", "512.3292"],
+}
+
+
+def assert_matches_scan(h):
+    for column, texts in QUERIES.items():
+        for text in texts:
+            expected = scan_filter(h.df[column], parse_filter(text))
+            np.testing.assert_array_equal(h.filter_rows(column, text), expected, err_msg=f"{column} {text}")
+
+
+def test_parse_filter():
+    assert parse_filter(" abc ") == ("eq", "abc")
+    assert parse_filter("= 5") == ("eq", "5")
+    assert parse_filter("1..2") == ("range", 1.0, 2.0, True, True)
+    assert parse_filter("..2") == ("range", None, 2.0, True, True)
+    assert parse_filter("> 3") == ("range", 3.0, None, False, True)
+    assert parse_filter("<= 3") == ("range", None, 3.0, True, True)
+    with pytest.raises(ValueError):
+        parse_filter("> abc")
+
+
+def test_indexed_filters_match_scan(handler):
+    assert_matches_scan(handler)
+
+
+def test_indexes_follow_row_edits(handler):
+    assert_matches_scan(handler)  # Dựng chỉ mục trước, sau đó chỉ cập nhật dần
+    rng = random.Random(7)
+    for step in range(300):
+        ids = handler.df.index
+        action = rng.random()
+        if action < 0.3:
+            handler.add_row({"PassengerId": rng.choice([1, 500, 2000]), "Survived": 1,
+                             "Ticket": rng.choice(["347082", "NEW"]),
+                             "Age": rng.choice([None, 22.0, 70.5]), "Fare": rng.choice([None, 0.0, 7.25, 600.0])})
+        elif action < 0.5:
+            handler.delete_row(ids[rng.randrange(len(ids))])
+        else:
+            handler.update_row(ids[rng.randrange(len(ids))], {
+                "Age": rng.choice([None, 1.0, 22.0, 30.0, 80.0]),
+                "Fare": rng.choice([None, 7.25, 15.0]),
+                "Ticket": rng.choice(["PC 17599", "347082"]),
+            })
+        if step % 50 == 0:
+            assert_matches_scan(handler)
+    assert_matches_scan(handler)
+
+
+def test_indexes_follow_undo_and_clean(handler):
+    assert_matches_scan(handler)
+    handler.update_row(0, {"Age": 61.0})
+    handler.clean_data(persist=False)
+    assert_matches_scan(handler)
+    handler.undo()
+    assert_matches_scan(handler)
+    handler.undo()
+    assert_matches_scan(handler)
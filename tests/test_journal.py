@@ -0,0 +1,102 @@
+"""
+Kiểm thử nhật ký ghi trước: mở lại file phải phát lại nhật ký ra đúng DataFrame đang có trong bộ nhớ
+"""
+
+import os
+
+import pandas as pd
+
+
+def reopen(make_handler, path):
+    h = make_handler()
+    h.load_file(path)
+    return h
+
+
+def assert_same_frame(left, right):
+    pd.testing.assert_frame_equal(left.df, right.df)
+
+
+def test_row_edits_replay(handler, make_handler, titanic_csv):
+    new_id = handler.add_row({"PassengerId": 1000, "Survived": 1, "Name": "X & <y>", "Age": None})
+    handler.add_rows([{"PassengerId": 1001, "Survived": 0, "Fare": 3.5},
+                      {"PassengerId": 1002, "Survived": 1, "Embarked": "Q"}])
+    handler.update_row(3, {"Age": 99, "Cabin": "Z"})
+    handler.update_row(new_id, {"Age": 12.5, "Name": None})
+    handler.delete_row(5)
+    handler.delete_row(new_id + 1)
+
+    replayed = reopen(make_handler, titanic_csv)
+    assert replayed.replayed_count == 7
+    assert_same_frame(replayed, handler)
+    # Mã dòng tiếp theo không dùng lại mã đã cấp
+    row = {"PassengerId": 2000, "Survived": 0}
+    assert replayed.add_row(row) == handler.add_row(row)
+
+
+def test_undo_redo_replay(handler, make_handler, titanic_csv):
+    handler.delete_row(10)
+    handler.update_row(11, {"Fare": 1.0})
+    handler.undo()
+    handler.undo()  # Dòng 10 được khôi phục đúng chỗ
+    handler.redo()
+
+    replayed = reopen(make_handler, titanic_csv)
+    assert_same_frame(replayed, handler)
+
+
+def test_clean_replay(handler, make_handler, titanic_csv):
+    handler.update_row(0, {"Age": None})
+    handler.clean_data(persist=False)
+    handler.update_row(1, {"Sex": "female"})
+
+    replayed = reopen(make_handler, titanic_csv)
+    assert_same_frame(replayed, handler)
+
+
+def test_undone_clean_replays_to_frame_before_clean(handler, make_handler, titanic_csv):
+    handler.add_row({"PassengerId": 1, "Survived": 1})  # Trùng mã -> bị xóa khi làm sạch
+    before = handler.df.copy()
+    handler.clean_data(persist=False)
+    handler.undo()
+    assert handler.needs_compaction()
+    handler.update_row(2, {"Age": 7.0})
+
+    replayed = reopen(make_handler, titanic_csv)
+    assert_same_frame(replayed, handler)
+    pd.testing.assert_frame_equal(replayed.df.drop(index=2), before.drop(index=2))
+
+
+def test_background_save_truncates_journal(handler, make_handler):
+    handler.update_row(0, {"Age": 1.0})
+    frames, path, mark = handler.snapshot_for_save()
+    handler.update_row(1, {"Age": 2.0})  # Phát sinh trong lúc lưu nền -> giữ lại trong nhật ký
+    handler.write_frame(frames, path)
+    handler.finish_save(path, mark)
+
+    replayed = reopen(make_handler, path)
+    assert replayed.replayed_count == 1
+    assert_same_frame(replayed, handler)
+
+
+def test_changed_source_discards_journal(handler, make_handler, titanic_csv):
+    handler.update_row(0, {"Age": 1.0})
+    journal_path = handler.journal.path
+    with open(titanic_csv, "a", encoding="utf-8") as f:
+        f.write("1000,1,1,Extra,male,30,0,0,T,1.0,,S\n")
+
+    replayed = reopen(make_handler, titanic_csv)
+    assert replayed.replayed_count == 0
+    assert len(replayed.df) == 892
+    assert not os.path.exists(journal_path) and os.path.exists(journal_path + ".bak")
+
+
+def test_torn_last_entry_is_ignored(handler, make_handler, titanic_csv):
+    handler.update_row(0, {"Age": 1.0})
+    expected = handler.df.copy()
+    with open(handler.journal.path, "a", encoding="utf-8") as f:
+        f.write('{"op": "update", "id": 1, "row": {"Age"')
+
+    replayed = reopen(make_handler, titanic_csv)
+    assert replayed.replayed_count == 1
+    pd.testing.assert_frame_equal(replayed.df, expected)
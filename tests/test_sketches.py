@@ -0,0 +1,108 @@
+"""
+Kiểm thử thống kê xấp xỉ trên luồng (sketches) và làm sạch theo luồng (StreamCleaner)
+"""
+
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.cleaning import clean_frame
+from src.sketches import BloomFilter, HeavyHitters, QuantileSketch
+from src.stream_clean import StreamCleaner
+
+
+def test_quantile_exact_before_compaction():
+    values = np.array([5.0, np.nan, 1.0, 3.0, 2.0, 4.0])
+    sketch = QuantileSketch(k=256)
+    sketch.update(values)
+    assert sketch.is_exact()
+    assert sketch.count == 5
+    assert sketch.median() == 3.0
+
+
+def test_quantile_rank_error_within_bound():
+    values = np.random.default_rng(1).lognormal(3, 1, 200000)
+    sketch = QuantileSketch(k=256)
+    for block in np.array_split(values, 37):
+        sketch.update(block)
+    assert not sketch.is_exact()
+    ordered = np.sort(values)
+    for q in (0.1, 0.5, 0.9):
+        rank = np.searchsorted(ordered, sketch.quantile(q)) / len(values)
+        assert abs(rank - q) <= sketch.rank_error() + 1e-9
+    assert sketch.rank_error() < 0.05
+
+
+def test_quantile_merge_equals_single_stream_bound():
+    values = np.random.default_rng(2).normal(0, 1, 50000)
+    left, right = QuantileSketch(k=128, seed=1), QuantileSketch(k=128, seed=2)
+    left.update(values[:20000])
+    right.update(values[20000:])
+    left.merge(right)
+    assert left.count == len(values)
+    rank = np.searchsorted(np.sort(values), left.median()) / len(values)
+    assert abs(rank - 0.5) <= left.rank_error() + 1e-9
+
+
+def test_heavy_hitters_exact_with_few_values():
+    sketch = HeavyHitters(counters=8)
+    sketch.update(pd.Series(["S", "C", None, "S", "Q"]))
+    sketch.update(["C", "C"])
+    assert sketch.count == 6 and sketch.count_error() == 0
+    assert sketch.mode() == "C"
+
+
+def test_heavy_hitters_tie_takes_smallest_like_pandas():
+    values = pd.Series([3, 1, 3, 1, 2])
+    sketch = HeavyHitters()
+    sketch.update(values)
+    assert sketch.mode() == values.mode().iloc[0]
+
+
+def test_heavy_hitters_bounded_error():
+    rng = np.random.default_rng(3)
+    values = np.concatenate([np.full(5000, 7), rng.integers(100, 10000, 20000)])
+    rng.shuffle(values)
+    sketch = HeavyHitters(counters=32)
+    for block in np.array_split(values, 50):
+        sketch.update(block)
+    assert sketch.mode() == 7
+    assert sketch.count_error() <= 1 / 33
+
+
+def test_bloom_filter_no_false_negatives():
+    keys = pd.util.hash_array(np.arange(10000))
+    others = pd.util.hash_array(np.arange(10000, 60000))
+    bloom = BloomFilter(10000, fp_rate=0.01)
+    bloom.add(keys)
+    assert bloom.contains(keys).all()
+    assert bloom.contains(others).mean() < 0.03
+
+
+def test_bloom_filter_merge():
+    a, b = BloomFilter(1000), BloomFilter(1000)
+    a.add(pd.util.hash_array(np.arange(500)))
+    b.add(pd.util.hash_array(np.arange(500, 1000)))
+    a.merge(b)
+    assert a.contains(pd.util.hash_array(np.arange(1000))).all()
+    with pytest.raises(ValueError):
+        a.merge(BloomFilter(10))
+
+
+@pytest.mark.parametrize("chunksize", [100, 1_000_000])
+def test_stream_clean_matches_in_memory_clean(tmp_path, titanic_csv, chunksize):
+    df = pd.read_csv(titanic_csv)
+    # Thêm dòng trùng PassengerId và dòng thiếu khóa
+    df = pd.concat([df, df.head(20), df.head(3).assign(Survived=np.nan)], ignore_index=True)
+    source = str(tmp_path / "in.csv")
+    df.to_csv(source, index=False)
+
+    target = str(tmp_path / "out.csv")
+    report = StreamCleaner(chunksize=chunksize).clean(source, target)
+
+    expected, expected_report = clean_frame(pd.read_csv(source))
+    expected = pd.read_csv(io.StringIO(expected.to_csv(index=False)))
+    pd.testing.assert_frame_equal(pd.read_csv(target), expected)
+    assert report.rows_after == expected_report.rows_after
@@ -0,0 +1,82 @@
+"""
+Kiểm thử thứ tự sắp xếp: thứ tự được vá sau từng thao tác phải trùng với sắp xếp lại từ đầu
+"""
+
+import random
+
+import numpy as np
+import pytest
+
+from src.sorting import SortCache
+
+
+KEYS = [
+    [("Age", True)],
+    [("Fare", False)],
+    [("Sex", True), ("Age", False)],
+    [("Embarked", False), ("Name", True)],
+]
+
+
+def fresh_order(h, keys):
+    return SortCache().order(h, keys)
+
+
+def test_sort_order_matches_pandas(handler):
+    order = handler.sort_order([("Age", True), ("Fare", False)])
+    expected = handler.df.sort_values(["Age", "Fare"], ascending=[True, False], kind="stable",
+                                      na_position="last").index.to_numpy()
+    # Ô rỗng của cả hai khóa luôn ở cuối; các dòng còn lại đúng như sort_values
+    assert sorted(order) == sorted(expected)
+    complete = handler.df[["Age", "Fare"]].notna().all(axis=1)
+    np.testing.assert_array_equal(order[:complete.sum()], expected[:complete.sum()])
+
+
+def test_filtered_sort_keeps_order(handler):
+    order = handler.sort_order([("Fare", True)])
+    subset = handler.df.index[::3].to_numpy()
+    np.testing.assert_array_equal(handler.sort_order([("Fare", True)], subset), order[np.isin(order, subset)])
+
+
+@pytest.mark.parametrize("keys", KEYS)
+def test_patched_order_matches_full_sort(handler, keys):
+    handler.df["Sex"] = handler.df["Sex"].astype("category")
+    handler.sort_order(keys)
+    rng = random.Random(3)
+    for step in range(200):
+        ids = handler.df.index
+        action = rng.random()
+        if action < 0.3:
+            handler.add_row({"PassengerId": 5000 + step, "Survived": 0, "Sex": rng.choice(["male", "female"]),
+                             "Age": rng.choice([None, 3.0, 30.0]), "Fare": rng.choice([None, 8.05]),
+                             "Embarked": rng.choice(["S", "C", None]), "Name": rng.choice(["A", "Zz", None])})
+        elif action < 0.5:
+            handler.delete_row(ids[rng.randrange(len(ids))])
+        else:
+            handler.update_row(ids[rng.randrange(len(ids))], {
+                "Age": rng.choice([None, 7.0, 30.0]), "Fare": rng.choice([None, 0.0, 512.0]),
+                "Embarked": rng.choice(["Q", None]), "Name": rng.choice(["B", None]),
+            })
+        if step % 10 == 0:
+            np.testing.assert_array_equal(handler.sort_order(keys), fresh_order(handler, keys))
+    np.testing.assert_array_equal(handler.sort_order(keys), fresh_order(handler, keys))
+
+
+def test_order_rebuilt_after_bulk_change(handler):
+    keys = [("Age", True)]
+    handler.sort_order(keys)
+    handler.update_row(0, {"Age": None})
+    handler.clean_data(persist=False)
+    np.testing.assert_array_equal(handler.sort_order(keys), fresh_order(handler, keys))
+    handler.undo()
+    np.testing.assert_array_equal(handler.sort_order(keys), fresh_order(handler, keys))
+
+
+def test_mixed_type_column(handler):
+    handler.df["Ticket"] = handler.df["Ticket"].astype(object)
+    handler.sort_order([("Ticket", True)])
+    handler.update_row(0, {"Ticket": 12345})
+    handler.update_row(1, {"Ticket": "AAA"})
+    order = handler.sort_order([("Ticket", True)])
+    np.testing.assert_array_equal(order, fresh_order(handler, [("Ticket", True)]))
+    assert order[0] == 0  # Số xếp trước chuỗi